@@ -1,5 +1,11 @@
 import os
 import sys
+import time
+from datetime import datetime
+
+#launch reference for the startup timing report
+LAUNCH_TIME = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox
 
@@ -8,28 +14,50 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src.startup import StartupTimer
+from src.lazy_db import DeferredDatabase
+from src.db_writer import StatUpdate, StatWriter, StatWriterError
+from src.profiling import ProfileCapture
 from src.game.board import Difficulty
 from src.game.game_state import GameState, GameStatus
-from src.gui.styles import BG_MAIN, BG_PANEL, FG_TEXT, style
+from src.game.puzzle_pack import PuzzlePack
+from src.gui.styles import BG_MAIN, BG_PANEL, FG_TEXT, TILE_IMAGE_SIZE, style
 from src.gui.menu_frame import MainMenuFrame
 from src.gui.game_frame import GameFrame
 from src.gui.stats_frame import StatsFrame
-from src.db import SessionLocal, init_db, User, UserDifficultyStat
+from src.gui.leaderboard_frame import LeaderboardFrame
+from src.gui.assets import TileAtlas
+from src.gui.board_canvas import TILE_IMAGE_SIZE as CANVAS_TILE_IMAGE_SIZE
 from src.gui.styles import BG_MAIN, BG_PANEL, FG_TEXT, style
 
-#initialize db
-init_db()
+#how often the in-game timer label is refreshed
+TIMER_INTERVAL_MS = 200
 
 class MinesweeperApp(tk.Tk):
     def __init__(self):
-        super().__init__()
-        self.title("Minesweeper")
-        self.resizable(False, False)
-        self.styles = style(self)
-
-        #create the session, create current_user var
-        self.db = SessionLocal()
-        self.current_user: User | None = None
+        self.startup = StartupTimer(origin=LAUNCH_TIME)
+        self.startup.mark("gui modules imported")
+
+        #SQLAlchemy import and schema check run while the window is built
+        self.database = DeferredDatabase(self.startup)
+        self.database.start()
+        self._db = None
+        self.stat_writer = StatWriter(self.database)
+        self.stat_writer.start()
+
+        #set before the login dialog, which can destroy the app
+        self._timer_id: str | None = None
+        self.profiler = ProfileCapture()
+        self.puzzle_pack: PuzzlePack | None = None
+
+        with self.startup.phase("tk init"):
+            super().__init__()
+            self.title("Minesweeper")
+            self.resizable(False, False)
+            self.styles = style(self)
+
+        #current_user is a src.db.User once logged in
+        self.current_user = None
 
         # set window icon
         try:
@@ -40,8 +68,13 @@ class MinesweeperApp(tk.Tk):
         except Exception as e:
             print(f"Could not load icon: {e}")
 
+        # load tile graphics once, scaled for button tiles and canvas tiles
+        with self.startup.phase("tile images"):
+            self.tile_atlas = TileAtlas(self, sizes=(TILE_IMAGE_SIZE, CANVAS_TILE_IMAGE_SIZE))
+
         #prompt user to log in
         self._show_login_dialog()
+        self.startup.print_report()
 
         container = tk.Frame(self, bg=BG_MAIN)
         container.pack(side="top", fill="both", expand=True, padx=10, pady=10)
@@ -74,12 +107,26 @@ class MinesweeperApp(tk.Tk):
         self.frames["stats"] = StatsFrame(parent=container, controller=self)
         self.frames["stats"].grid(row=0, column=0, sticky="nsew")
 
+        self.frames["leaderboard"] = LeaderboardFrame(parent=container, controller=self)
+        self.frames["leaderboard"].grid(row=0, column=0, sticky="nsew")
+
         # dynamic game frame
         self.frames["game"] = None
 
+        #debug hotkeys
+        self.bind("<F3>", self._toggle_latency_overlay)
+        self.bind("<F9>", self._toggle_profiling)
+
         #open with menu frame
         self.show_frame("menu")
     
+    # ORM session, created on first use (waits for the background db setup)
+    @property
+    def db(self):
+        if self._db is None:
+            self._db = self.database.session()
+        return self._db
+
     # raises a frame to the top
     def show_frame(self, name: str):
         target = self.frames.get(name)
@@ -110,29 +157,129 @@ class MinesweeperApp(tk.Tk):
     # helper function to show stats frame
     def show_stats(self):
         stats_frame: StatsFrame = self.frames["stats"]
+        # show the latest game, even if its write is still queued
+        if not self._flush_stats():
+            return
         stats_frame.refresh()
         self.show_frame("stats")
 
+    # helper function to show the cross-user leaderboard
+    def show_leaderboard(self):
+        leaderboard_frame: LeaderboardFrame = self.frames["leaderboard"]
+        if not self._flush_stats():
+            return
+        leaderboard_frame.refresh()
+        self.show_frame("leaderboard")
+
+    # waits for queued stat writes; False (after telling the user) if the writer died
+    def _flush_stats(self) -> bool:
+        try:
+            self.stat_writer.flush()
+        except StatWriterError as e:
+            messagebox.showerror("Stats", f"Stats can't be saved or shown:\n\n{e.__cause__ or e}")
+            return False
+        return True
+
     # start game
     def start_new_game(self, difficulty: dict):
         from src.gui.game_frame import GameFrame 
 
         #initialize gameboard with difficulty
-        self.current_game = GameState(difficulty)
+        #puzzle games reload their layout, so Restart replays the same puzzle
+        puzzle_number = difficulty.get("puzzle")
+        puzzle = None
+        if puzzle_number is not None and self.puzzle_pack is not None:
+            #a damaged pack can open fine and still have bad records
+            try:
+                puzzle = self.puzzle_pack[puzzle_number]
+                self.current_game = puzzle.new_game()
+            except (IndexError, ValueError) as e:
+                messagebox.showerror("Puzzle pack", f"Could not load puzzle {puzzle_number + 1}:\n\n{e}")
+                return
+        else:
+            self.current_game = GameState(difficulty)
+        self.cancel_timer()
 
-        #destroy all old game frames
+        #reuse the old game frame if the board has the same size
         old = self.frames.get("game")
-        if old is not None:
-            old.destroy()
+        if old is not None and old.fits(self.current_game):
+            old.reset(self.current_game)
+        else:
+            if old is not None:
+                old.destroy()
 
-        #create game_frame, add to dict and grid
-        game_frame = GameFrame(parent=self.container, controller=self, game_state=self.current_game)
-        self.frames["game"] = game_frame
-        game_frame.grid(row=0, column=0, sticky="nsew")
+            #create game_frame, add to dict and grid
+            game_frame = GameFrame(parent=self.container, controller=self, game_state=self.current_game)
+            self.frames["game"] = game_frame
+            game_frame.grid(row=0, column=0, sticky="nsew")
 
         #display game frame
         self.show_frame("game")
 
+        #puzzles open on their recommended first click, once the board is on
+        #screen so the clock starts when the player can see it
+        if puzzle is not None:
+            self.current_game.click_cell(*puzzle.first_click)
+            if self.current_game.status in (GameStatus.WON, GameStatus.LOST):
+                self.frames["game"].schedule_redraw(full=True)
+                self.on_game_finished()
+                return
+            self.frames["game"].schedule_redraw()
+        self.start_timer()
+
+    # keeps one pack mapped at a time; raises OSError/ValueError for bad files
+    def open_puzzle_pack(self, path: str) -> PuzzlePack:
+        if self.puzzle_pack is not None:
+            if self.puzzle_pack.path == path:
+                return self.puzzle_pack
+            self.puzzle_pack.close()
+            self.puzzle_pack = None
+        self.puzzle_pack = PuzzlePack(path)
+        return self.puzzle_pack
+
+    # timer callbacks are owned here so restarts never leave stale ones running
+    def start_timer(self):
+        self.cancel_timer()
+        self._timer_id = self.after(TIMER_INTERVAL_MS, self._tick_timer)
+
+    def cancel_timer(self):
+        if self._timer_id is not None:
+            self.after_cancel(self._timer_id)
+            self._timer_id = None
+
+    def _tick_timer(self):
+        self._timer_id = None
+        game_frame = self.frames.get("game")
+        if game_frame is None or self.current_game is None:
+            return
+        game_frame.schedule_redraw()
+        if self.current_game.status in (GameStatus.NOT_STARTED, GameStatus.PLAYING):
+            self._timer_id = self.after(TIMER_INTERVAL_MS, self._tick_timer)
+
+    def _toggle_latency_overlay(self, event=None):
+        game_frame = self.frames.get("game")
+        if game_frame is not None:
+            game_frame.toggle_latency_overlay()
+
+    # F9 starts/stops a profile capture of the running game
+    def _toggle_profiling(self, event=None):
+        paths = self.profiler.toggle()
+        if paths is None:
+            self.title("Minesweeper [profiling - F9 to stop]")
+            return
+        self.title("Minesweeper")
+        messagebox.showinfo("Profile saved", "Profile written to:\n\n" + "\n".join(paths))
+
+    def destroy(self):
+        self.cancel_timer()
+        if self.profiler.active:
+            self.profiler.stop()
+        # write out any stats still queued
+        self.stat_writer.close()
+        if self.puzzle_pack is not None:
+            self.puzzle_pack.close()
+        super().destroy()
+
     def on_game_finished(self):
         if self.current_game is None:
             return
@@ -141,20 +288,33 @@ class MinesweeperApp(tk.Tk):
         diff_name = gs.difficulty["name"]
         won = gs.status == GameStatus.WON
 
+        # stop the timer on the final time
+        self.cancel_timer()
+        game_frame = self.frames.get("game")
+        if game_frame is not None:
+            game_frame.update_timer()
+
         # --- update in-memory session stats ---
+        # puzzle games aren't one of the presets, so their entry starts here
+        diff_stats = self.stats["per_difficulty"].setdefault(diff_name, {
+            "played": 0,
+            "won": 0,
+            "best_time": None,
+            "best_score": None,
+        })
         self.stats["games_played"] += 1
-        self.stats["per_difficulty"][diff_name]["played"] += 1
+        diff_stats["played"] += 1
         if won:
             self.stats["games_won"] += 1
-            self.stats["per_difficulty"][diff_name]["won"] += 1
+            diff_stats["won"] += 1
 
-            best_time = self.stats["per_difficulty"][diff_name]["best_time"]
+            best_time = diff_stats["best_time"]
             if best_time is None or gs.elapsed_time < best_time:
-                self.stats["per_difficulty"][diff_name]["best_time"] = gs.elapsed_time
+                diff_stats["best_time"] = gs.elapsed_time
 
-            best_score = self.stats["per_difficulty"][diff_name]["best_score"]
+            best_score = diff_stats["best_score"]
             if best_score is None or gs.score > best_score:
-                self.stats["per_difficulty"][diff_name]["best_score"] = gs.score
+                diff_stats["best_score"] = gs.score
 
         self.stats["last_game"] = {
             "difficulty": diff_name,
@@ -165,29 +325,18 @@ class MinesweeperApp(tk.Tk):
         }
 
         # --- update persistent "overall" stats in DB ---
-        if self.current_user is not None and won:
-            # find/create per-difficulty row
-            stat = (
-                self.db.query(UserDifficultyStat)
-                .filter_by(user_id=self.current_user.id, difficulty=diff_name)
-                .first()
-            )
-            if stat is None:
-                stat = UserDifficultyStat(
-                    user_id=self.current_user.id,
-                    difficulty=diff_name,
-                    best_time=gs.elapsed_time,
-                    best_score=gs.score,
-                )
-                self.db.add(stat)
-            else:
-                # update if this run is better
-                if stat.best_time is None or gs.elapsed_time < stat.best_time:
-                    stat.best_time = gs.elapsed_time
-                if stat.best_score is None or gs.score > stat.best_score:
-                    stat.best_score = gs.score
-
-            self.db.commit()
+        # queued for the writer thread so the popup never waits on the disk
+        if self.current_user is not None:
+            self.stat_writer.submit(StatUpdate(
+                user_id=self.current_user.id,
+                difficulty=diff_name,
+                time=gs.elapsed_time,
+                score=gs.score,
+                won=won,
+                hints_used=gs.hints_used,
+                seed=gs.board.seed,
+                finished_at=datetime.now(),
+            ))
 
         # win/lose message
         if won:
@@ -297,6 +446,8 @@ class MinesweeperApp(tk.Tk):
                 error_label.config(text="PIN should be at least 4 digits.")
                 return
 
+            User = self.database.module().User
+
             # look up existing users
             user = self.db.query(User).filter_by(normalized_name=normal).first()
             #if this user exists
@@ -310,8 +461,7 @@ class MinesweeperApp(tk.Tk):
             #if the user doesn't exist, create a new user, and continue as the new user
             else:
                 user = User(name=name, normalized_name=normal, pin=pin)
-                self.db.add(user)
-                self.db.commit()
+                self.database.module().run_with_retry(self.db, lambda s: s.add(user))
                 self.db.refresh(user)
                 self.current_user = user
 
@@ -348,6 +498,7 @@ class MinesweeperApp(tk.Tk):
         dialog.geometry(f"+{x}+{y}")
 
         name_entry.focus_set()
+        self.startup.mark("login dialog shown")
         dialog.wait_window()
 
         # in case somehow no user is logged in after waiting for dialog to destroy
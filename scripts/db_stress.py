@@ -0,0 +1,116 @@
+"""
+Local SQLite contention test: several processes committing stat updates to
+the same database file at once, the way several copies of the app would.
+
+    python scripts/db_stress.py --processes 8 --commits 200
+    python scripts/db_stress.py --processes 8 --commits 200 --untuned
+
+--untuned uses a plain create_engine() with no pragmas and no retry, which is
+how src/db.py used to connect.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def _worker(path, tuned, commits, worker_id, results):
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import sessionmaker
+    from src import db
+
+    engine = db.create_configured_engine(path, db.SQLITE_PRAGMAS if tuned else None)
+    session = sessionmaker(bind=engine, autoflush=False)()
+
+    name = f"stress-{worker_id}"
+    user = db.User(name=name, normalized_name=name, pin="0000")
+
+    def add_user(s):
+        s.add(user)
+
+    def record(s, i):
+        # read-then-write, like the stats update after a game
+        stat = s.query(db.UserDifficultyStat).filter_by(user_id=user.id, difficulty="Beginner").first()
+        if stat is None:
+            s.add(db.UserDifficultyStat(user_id=user.id, difficulty="Beginner", best_time=1000.0 - i, best_score=i))
+        else:
+            stat.best_time = min(stat.best_time, 1000.0 - i)
+            stat.best_score = max(stat.best_score, i)
+
+    ok = failed = 0
+    try:
+        if tuned:
+            db.run_with_retry(session, add_user)
+        else:
+            add_user(session)
+            session.commit()
+    except OperationalError:
+        results.put((0, commits))
+        return
+
+    for i in range(commits):
+        try:
+            if tuned:
+                db.run_with_retry(session, lambda s: record(s, i))
+            else:
+                record(session, i)
+                session.commit()
+            ok += 1
+        except OperationalError:
+            session.rollback()
+            failed += 1
+    session.close()
+    results.put((ok, failed))
+
+
+def run(processes: int, commits: int, tuned: bool) -> dict:
+    from src import db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stress.db")
+        engine = db.create_configured_engine(path, db.SQLITE_PRAGMAS if tuned else None)
+        db.Base.metadata.create_all(engine)
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_worker, args=(path, tuned, commits, i, results))
+            for i in range(processes)
+        ]
+        start = time.perf_counter()
+        for w in workers:
+            w.start()
+        totals = [results.get() for _ in workers]
+        for w in workers:
+            w.join()
+        elapsed = time.perf_counter() - start
+
+    ok = sum(t[0] for t in totals)
+    failed = sum(t[1] for t in totals)
+    return {"ok": ok, "failed": failed, "seconds": elapsed, "commits_per_sec": ok / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--commits", type=int, default=200, help="commits per process")
+    parser.add_argument("--untuned", action="store_true", help="default engine, no pragmas or retry")
+    args = parser.parse_args()
+
+    result = run(args.processes, args.commits, tuned=not args.untuned)
+    label = "untuned" if args.untuned else "tuned"
+    print(
+        f"{label}: {args.processes} processes, {result['ok']} commits ok, "
+        f"{result['failed']} failed, {result['seconds']:.2f} s, "
+        f"{result['commits_per_sec']:.0f} commits/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,174 @@
-import os
-from sqlalchemy import (
-    create_engine,
-    Column,
-    Integer,
-    String,
-    Float,
-    ForeignKey,
-    UniqueConstraint,
-)
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
-
-# path up dir to get to main project root
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(PROJECT_ROOT, "minesweeper.db")
-
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
-
-Base = declarative_base()
-
-#User Table
-class User(Base):
-    __tablename__ = "users"
-
-    id = Column(Integer, primary_key=True)
-    name = Column(String, nullable=False)
-    normalized_name = Column(String, nullable=False, unique=True)
-    pin = Column(String, nullable=False)
-
-    stats = relationship(
-        'UserDifficultyStat',
-        back_populates='user',
-        cascade='all, delete-orphan',
-    )
-#Stats Table
-class UserDifficultyStat(Base):
-    __tablename__ = 'user_difficulty_stats'
-
-    id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
-    difficulty = Column(String, nullable=False)
-    best_time = Column(Float, nullable=True)
-    best_score = Column(Integer, nullable=True)
-
-    user = relationship('User', back_populates='stats')
-
-    #only allow each combination of user id and diff to exist once
-    __table_args__ = (
-        UniqueConstraint('user_id', 'difficulty', name='uix_user_diff'),
-    )
-
-def init_db():
-    Base.metadata.create_all(engine)
+import os
+import random
+import time
+from sqlalchemy import (
+    create_engine,
+    event,
+    inspect,
+    text,
+    Boolean,
+    Column,
+    DateTime,
+    Integer,
+    Index,
+    String,
+    Float,
+    ForeignKey,
+    UniqueConstraint,
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+
+# path up dir to get to main project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.join(PROJECT_ROOT, "minesweeper.db")
+
+#SQLite settings so several copies of the app can share minesweeper.db
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",   #readers don't block the writer
+    "busy_timeout": 5000,    #ms to wait for a lock before failing
+    "synchronous": "NORMAL", #safe with WAL, fsync only at checkpoints
+    "cache_size": -8000,     #negative = KiB, 8 MB page cache
+}
+
+def create_configured_engine(path: str, pragmas: dict | None = SQLITE_PRAGMAS):
+    engine = create_engine(f"sqlite:///{path}", echo=False, future=True)
+    if pragmas:
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+    return engine
+
+engine = create_configured_engine(DB_PATH)
+SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+Base = declarative_base()
+
+#User Table
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    normalized_name = Column(String, nullable=False, unique=True)
+    pin = Column(String, nullable=False)
+
+    stats = relationship(
+        'UserDifficultyStat',
+        back_populates='user',
+        cascade='all, delete-orphan',
+    )
+    games = relationship(
+        'GameRecord',
+        back_populates='user',
+        cascade='all, delete-orphan',
+        lazy='dynamic', #can be very large, query it instead of loading it
+    )
+#Stats Table
+#one aggregate row per (user, difficulty), updated in the same transaction
+#as each game_history insert so the stats screen never scans the history
+class UserDifficultyStat(Base):
+    __tablename__ = 'user_difficulty_stats'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    difficulty = Column(String, nullable=False)
+    best_time = Column(Float, nullable=True)
+    best_score = Column(Integer, nullable=True)
+    games_played = Column(Integer, nullable=False, default=0)
+    games_won = Column(Integer, nullable=False, default=0)
+    total_time = Column(Float, nullable=False, default=0.0) #sum of all game times
+
+    user = relationship('User', back_populates='stats')
+
+    #only allow each combination of user id and diff to exist once
+    #the two leaderboard indexes cover the ranking queries (no table lookups)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'difficulty', name='uix_user_diff'),
+        Index('ix_uds_leader_time', 'difficulty', 'best_time', 'user_id', 'best_score'),
+        Index('ix_uds_leader_score', 'difficulty', 'best_score', 'user_id', 'best_time'),
+    )
+
+#History Table, one row per finished game
+class GameRecord(Base):
+    __tablename__ = 'game_history'
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    difficulty = Column(String, nullable=False)
+    finished_at = Column(DateTime, nullable=False)
+    time = Column(Float, nullable=False)
+    score = Column(Integer, nullable=False)
+    hints_used = Column(Integer, nullable=False)
+    won = Column(Boolean, nullable=False)
+    seed = Column(Integer, nullable=True) #Board seed, replays the layout with the first click
+
+    user = relationship('User', back_populates='games')
+
+    __table_args__ = (
+        Index('ix_game_history_user_diff_time', 'user_id', 'difficulty', 'finished_at'),
+    )
+
+#columns added after the first release, created in place on older databases
+ADDED_COLUMNS = {
+    'user_difficulty_stats': {
+        'games_played': 'INTEGER NOT NULL DEFAULT 0',
+        'games_won': 'INTEGER NOT NULL DEFAULT 0',
+        'total_time': 'FLOAT NOT NULL DEFAULT 0',
+    },
+}
+
+#fills in the added columns for rows that existed before them: a best time
+#means at least one won game, so those rows start from one win at that time
+#(counts before the migration are otherwise lost)
+BACKFILLS = {
+    'user_difficulty_stats': 'UPDATE user_difficulty_stats '
+                             'SET games_played = 1, games_won = 1, total_time = best_time '
+                             'WHERE best_time IS NOT NULL',
+}
+
+#bind is the app's engine unless given (tests pass a scratch one)
+def init_db(bind=None):
+    bind = bind if bind is not None else engine
+    Base.metadata.create_all(bind)
+    _add_missing_columns(bind)
+    _create_missing_indexes(bind)
+
+def _add_missing_columns(bind):
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            missing = [name for name in columns if name not in existing]
+            for name in missing:
+                conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {columns[name]}'))
+            if missing and table in BACKFILLS:
+                conn.execute(text(BACKFILLS[table]))
+
+#create_all skips tables that already exist, including indexes added to them later
+def _create_missing_indexes(bind):
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
+
+def is_locked_error(error: Exception) -> bool:
+    message = str(getattr(error, "orig", error)).lower()
+    return isinstance(error, OperationalError) and ("locked" in message or "busy" in message)
+
+#Runs work(session) and commits, retrying with exponential backoff and jitter
+#while another process holds the write lock
+#work must be safe to repeat, since a failed commit rolls everything back
+def run_with_retry(session, work, attempts: int = 6, backoff: float = 0.05):
+    for attempt in range(attempts):
+        try:
+            result = work(session)
+            session.commit()
+            return result
+        except OperationalError as e:
+            session.rollback()
+            if not is_locked_error(e) or attempt == attempts - 1:
+                raise
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random()))
@@ -0,0 +1,173 @@
+"""Background writer that keeps database commits off the Tk thread."""
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from src import leaderboard, metrics
+from src.lazy_db import DeferredDatabase
+
+
+class StatUpdate(NamedTuple):
+    """A finished game: one history row plus its effect on the aggregates."""
+    user_id: int
+    difficulty: str
+    time: float
+    score: int
+    won: bool
+    hints_used: int
+    seed: Optional[int]
+    finished_at: datetime
+
+
+# queue item that tells the writer thread to finish
+_STOP = object()
+
+
+class StatWriterError(RuntimeError):
+    """The writer thread stopped, so queued updates will never be saved."""
+
+
+class StatWriter:
+    """
+    Owns a dedicated thread and ORM session. submit() never blocks; queued
+    updates are applied in batches with one commit per batch.
+    """
+
+    def __init__(self, database: DeferredDatabase, batch_size: int = 64):
+        self.database = database
+        self.batch_size = batch_size
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # set if the thread couldn't open the database
+        self.error: Optional[BaseException] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, update: StatUpdate):
+        """Queues an update and returns immediately."""
+        self.start()
+        self._queue.put(update)
+
+    def flush(self, timeout: Optional[float] = None):
+        """
+        Blocks until every queued update has been processed. Raises
+        StatWriterError if the writer thread is dead, and TimeoutError if
+        timeout seconds pass first.
+        """
+        if self._thread is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks:
+                if self.error is not None or not self._thread.is_alive():
+                    raise StatWriterError("Stats writer stopped") from self.error
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError("Stats writer flush timed out")
+                # wake up now and then to notice a thread that died
+                done.wait(0.1)
+
+    def close(self, timeout: Optional[float] = None):
+        """Flushes pending updates and stops the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        try:
+            db = self.database.module()
+            session = db.SessionLocal()
+        except Exception as e:
+            self.error = e
+            print(f"Could not open the stats database: {e}")
+            return
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                updates = [item for item in batch if item is not _STOP]
+                try:
+                    if updates:
+                        with metrics.timer("db.stats_commit"):
+                            db.run_with_retry(session, lambda s: self._apply(s, db, updates))
+                        metrics.incr("db.games_saved", len(updates))
+                        for difficulty in {u.difficulty for u in updates}:
+                            leaderboard.cache.invalidate(difficulty)
+                except Exception as e:
+                    session.rollback()
+                    print(f"Could not save stats: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+                if len(updates) != len(batch):
+                    return
+        finally:
+            session.close()
+
+    def _apply(self, session, db, updates):
+        session.add_all(
+            db.GameRecord(
+                user_id=u.user_id,
+                difficulty=u.difficulty,
+                finished_at=u.finished_at,
+                time=u.time,
+                score=u.score,
+                hints_used=u.hints_used,
+                won=u.won,
+                seed=u.seed,
+            )
+            for u in updates
+        )
+
+        # merge the batch per (user, difficulty) first; the session doesn't
+        # autoflush, so a second query wouldn't see a row added earlier
+        totals = {}
+        for u in updates:
+            t = totals.setdefault((u.user_id, u.difficulty), {
+                "played": 0, "won": 0, "time": 0.0, "best_time": None, "best_score": None,
+            })
+            t["played"] += 1
+            t["time"] += u.time
+            if u.won:
+                t["won"] += 1
+                if t["best_time"] is None or u.time < t["best_time"]:
+                    t["best_time"] = u.time
+                if t["best_score"] is None or u.score > t["best_score"]:
+                    t["best_score"] = u.score
+
+        for (user_id, difficulty), t in totals.items():
+            stat = (
+                session.query(db.UserDifficultyStat)
+                .filter_by(user_id=user_id, difficulty=difficulty)
+                .first()
+            )
+            if stat is None:
+                stat = db.UserDifficultyStat(
+                    user_id=user_id,
+                    difficulty=difficulty,
+                    games_played=0,
+                    games_won=0,
+                    total_time=0.0,
+                )
+                session.add(stat)
+            stat.games_played += t["played"]
+            stat.games_won += t["won"]
+            stat.total_time += t["time"]
+            # update if this run is better
+            if t["best_time"] is not None and (stat.best_time is None or t["best_time"] < stat.best_time):
+                stat.best_time = t["best_time"]
+            if t["best_score"] is not None and (stat.best_score is None or t["best_score"] > stat.best_score):
+                stat.best_score = t["best_score"]
@@ -0,0 +1,124 @@
+"""
+Adjacent-mine counts for a whole board, serial or split across processes.
+
+Boards hand over their mines as one byte per cell (row-major, 1 = mine) and
+get back one byte per cell with the adjacent count (0 on mines, as Board
+leaves them). The kernel treats the mine bytes as one big int of 8-bit lanes
+and adds the eight shifted copies; a lane never exceeds 8, so lanes can't
+carry into each other.
+
+Boards of PARALLEL_MIN_CELLS or more are cut into row stripes. Each worker
+process reads its stripe plus one halo row above and below from a shared
+memory block and writes its rows of counts into a second one. The counts
+only depend on the 3x3 neighbourhood, so the result is byte-for-byte the
+serial one.
+
+Board counts boards of board.LAZY_ADJACENCY_MIN_CELLS or more lazily by
+default, so it only takes the parallel path when created with
+lazy_adjacency=False, which the server's new op does for
+"adjacency": "eager" (full counts up front, e.g. for analysis or export).
+"""
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterable, Optional
+
+PARALLEL_MIN_CELLS = 2_000_000
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+
+
+def count_adjacent(mines: bytes, rows: int, cols: int) -> bytes:
+    """Adjacent counts for one block of rows, one byte per cell."""
+    cells = rows * cols
+    lanes = int.from_bytes(mines, "little")
+    # mines that have a neighbour to their right / left in the same row
+    to_right = lanes & int.from_bytes((b"\x01" * (cols - 1) + b"\x00") * rows, "little")
+    to_left = lanes & int.from_bytes((b"\x00" + b"\x01" * (cols - 1)) * rows, "little")
+
+    row = 8 * cols
+    total = (
+        (to_right << 8) + (to_left >> 8)
+        + (lanes << row) + (lanes >> row)
+        + (to_right << (row + 8)) + (to_left << (row - 8))
+        + (to_right >> (row - 8)) + (to_left >> (row + 8))
+    )
+    total &= (1 << (8 * cells)) - 1
+    total &= ~(lanes * 0xFF)
+    return total.to_bytes(cells, "little")
+
+
+def _count_stripe(mines_name: str, counts_name: str, rows: int, cols: int, first: int, last: int):
+    """Worker: counts rows [first, last) using one halo row on each side."""
+    mines_block = shared_memory.SharedMemory(name=mines_name)
+    counts_block = shared_memory.SharedMemory(name=counts_name)
+    try:
+        top = max(0, first - 1)
+        bottom = min(rows, last + 1)
+        counts = count_adjacent(bytes(mines_block.buf[top * cols:bottom * cols]), bottom - top, cols)
+        offset = (first - top) * cols
+        counts_block.buf[first * cols:last * cols] = counts[offset:offset + (last - first) * cols]
+    finally:
+        mines_block.close()
+        counts_block.close()
+
+
+def _pool(workers: int) -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown()
+        # spawn, not fork: the GUI and the db writer run threads
+        _executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        _executor_workers = workers
+    return _executor
+
+
+@atexit.register
+def _shutdown_pool():
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+
+
+def stripe_adjacency(mine_indices: Iterable[int], rows: int, cols: int, workers: int) -> bytes:
+    """Counts across a process pool, one stripe of rows per worker."""
+    cells = rows * cols
+    mines_block = shared_memory.SharedMemory(create=True, size=cells)
+    counts_block = shared_memory.SharedMemory(create=True, size=cells)
+    try:
+        mines = mines_block.buf
+        mines[:cells] = bytes(cells)  # blocks can be rounded up and reused
+        for index in mine_indices:
+            mines[index] = 1
+
+        stripes = min(workers, rows)
+        bounds = [rows * i // stripes for i in range(stripes + 1)]
+        pool = _pool(workers)
+        futures = [
+            pool.submit(_count_stripe, mines_block.name, counts_block.name, rows, cols, first, last)
+            for first, last in zip(bounds, bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+        return bytes(counts_block.buf[:cells])
+    finally:
+        del mines
+        mines_block.close()
+        mines_block.unlink()
+        counts_block.close()
+        counts_block.unlink()
+
+
+def adjacent_counts(mine_indices: Iterable[int], rows: int, cols: int,
+                    workers: Optional[int] = None) -> bytes:
+    """Counts for a board, using the process pool when it's big enough to pay off."""
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and rows * cols >= PARALLEL_MIN_CELLS:
+        return stripe_adjacency(mine_indices, rows, cols, workers)
+    mines = bytearray(rows * cols)
+    for index in mine_indices:
+        mines[index] = 1
+    return count_adjacent(bytes(mines), rows, cols)
@@ -0,0 +1,145 @@
+"""
+Deductions from a board's visible state, cached by its Zobrist hash.
+
+The solver only looks at what the player can see (revealed counts and
+flags), so two boards with the same state_hash get the same answer. Undo,
+replay seeking and repeated openings then hit the cache instead of
+re-running the analysis.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
+
+from src import metrics
+
+Cell = Tuple[int, int]
+
+
+class Deductions(NamedTuple):
+    safe: FrozenSet[Cell]
+    mines: FrozenSet[Cell]
+
+
+class AnalysisCache:
+    """Small LRU of deductions keyed by a board's state hash."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Deductions]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int) -> Optional[Deductions]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: int, result: Deductions):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# shared by all of the server's sessions (its analyze op), since positions
+# repeat across games; the GUI's hints don't go through it
+cache = AnalysisCache()
+
+
+def _constraints(board) -> List[Tuple[FrozenSet[Cell], int]]:
+    """(hidden unflagged neighbors, mines left among them) for each revealed number."""
+    constraints = []
+    grid = board.grid
+    for row in range(board.rows):
+        for col in range(board.cols):
+            cell = grid[row][col]
+            if not cell.is_revealed() or cell.is_mine:
+                continue
+            count = board.adjacent_count(row, col)
+            if count == 0:
+                continue
+            hidden = []
+            flagged = 0
+            for r, c in board._get_neighbors(row, col):
+                neighbor = grid[r][c]
+                if neighbor.is_flagged():
+                    flagged += 1
+                elif not neighbor.is_revealed():
+                    hidden.append((r, c))
+            if hidden:
+                constraints.append((frozenset(hidden), count - flagged))
+    return constraints
+
+
+def deduce(board) -> Deductions:
+    """
+    Cells that are certainly safe or certainly mines, from the single-number
+    rule and the subset rule between overlapping numbers. Flags are taken
+    at face value.
+    """
+    safe, mines = set(), set()
+    constraints = _constraints(board)
+    changed = True
+    while changed:
+        changed = False
+        reduced = []
+        for cells, left in constraints:
+            left -= len(cells & mines)
+            cells = cells - safe - mines
+            if not cells:
+                continue
+            if left == 0:
+                safe |= cells
+                changed = True
+            elif left == len(cells):
+                mines |= cells
+                changed = True
+            else:
+                reduced.append((cells, left))
+        constraints = reduced
+        if changed:
+            continue
+
+        # subset rule: if A's cells lie inside B's, B minus A holds the difference
+        for i, (small, small_left) in enumerate(constraints):
+            for j, (big, big_left) in enumerate(constraints):
+                if i == j or len(small) >= len(big) or not small <= big:
+                    continue
+                rest, rest_left = big - small, big_left - small_left
+                if rest_left == 0:
+                    safe |= rest
+                    changed = True
+                elif rest_left == len(rest):
+                    mines |= rest
+                    changed = True
+    return Deductions(frozenset(safe), frozenset(mines))
+
+
+def analyze(board, use_cache: bool = True) -> Deductions:
+    """deduce(), reusing the result for a visible state seen before."""
+    key = board.state_hash
+    if use_cache:
+        result = cache.get(key)
+        if result is not None:
+            if metrics.ENABLED:
+                metrics.incr("analysis.cache_hit")
+            return result
+    result = deduce(board)
+    if use_cache:
+        cache.put(key, result)
+    return result
@@ -0,0 +1,181 @@
+"""
+Gym-style environment that steps a batch of Minesweeper games at once.
+
+Same rules as Board: mines are placed on the first reveal (never on the
+clicked cell), revealing a zero floods outward, flagged cells are never
+revealed by a flood, and a game is won when every safe cell is revealed or
+every mine (and nothing else) is flagged. All games in the batch share the
+board size; their state lives in (B, rows, cols) NumPy arrays.
+
+Actions are flat cell indices, one per game: index < rows * cols reveals that
+cell, rows * cols + index toggles its flag.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .board import Difficulty
+
+REWARD_WIN = 1.0
+REWARD_LOSS = -1.0
+REWARD_PROGRESS = 0.1  # reveal that uncovered at least one cell
+REWARD_NO_OP = -0.05  # reveal of a revealed/flagged cell
+
+
+class BatchMinesweeperEnv:
+    """Steps B independent games of one board size with vectorized rules."""
+
+    def __init__(self, batch_size: int, difficulty: dict = Difficulty.INTERMEDIATE,
+                 seed: Optional[int] = None):
+        self.batch_size = batch_size
+        self.rows = difficulty["rows"]
+        self.cols = difficulty["cols"]
+        self.num_mines = difficulty["mines"]
+        self.area = self.rows * self.cols
+        self.num_actions = 2 * self.area
+        if not 0 < self.num_mines < self.area:
+            raise ValueError("Mines must be between 1 and the number of cells - 1")
+        self.rng = np.random.default_rng(seed)
+
+        shape = (batch_size, self.rows, self.cols)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.counts = np.zeros(shape, dtype=np.int8)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flagged = np.zeros(shape, dtype=bool)
+        self.placed = np.zeros(batch_size, dtype=bool)  # first reveal done
+        self.done = np.zeros(batch_size, dtype=bool)
+        self.won = np.zeros(batch_size, dtype=bool)
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Starts new games for the masked envs (all of them by default)."""
+        if mask is None:
+            mask = np.ones(self.batch_size, dtype=bool)
+        for array in (self.mines, self.counts, self.revealed, self.flagged):
+            array[mask] = 0
+        self.placed[mask] = False
+        self.done[mask] = False
+        self.won[mask] = False
+        return self.observe()
+
+    def observe(self) -> Dict[str, np.ndarray]:
+        """
+        numbers: adjacent-mine counts of revealed cells (0 elsewhere, -1 on a
+        revealed mine); hidden and flagged: boolean masks.
+        """
+        numbers = np.where(self.revealed, self.counts, 0).astype(np.int8)
+        numbers[self.revealed & self.mines] = -1
+        return {"numbers": numbers, "hidden": ~self.revealed, "flagged": self.flagged.copy()}
+
+    def step(self, actions) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, dict]:
+        """
+        Applies one action per game. Finished games ignore their action until
+        reset(). Returns (observation, rewards, dones, {"won": won}).
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.batch_size,):
+            raise ValueError(f"Expected {self.batch_size} actions, got shape {actions.shape}")
+        if ((actions < 0) | (actions >= self.num_actions)).any():
+            raise ValueError("Action out of range")
+
+        rewards = np.zeros(self.batch_size, dtype=np.float32)
+        live = ~self.done
+        is_flag = actions >= self.area
+        cells = np.where(is_flag, actions - self.area, actions)
+        rows, cols = np.divmod(cells, self.cols)
+
+        flag_envs = np.flatnonzero(live & is_flag)
+        if flag_envs.size:
+            self._toggle_flags(flag_envs, rows[flag_envs], cols[flag_envs])
+
+        reveal_envs = np.flatnonzero(live & ~is_flag)
+        if reveal_envs.size:
+            self._reveal(reveal_envs, rows[reveal_envs], cols[reveal_envs], rewards)
+
+        # mirror Board.check_win on every game that is still going
+        going = np.flatnonzero(~self.done & self.placed)
+        if going.size:
+            safe_left = (~self.mines[going] & ~self.revealed[going]).any(axis=(1, 2))
+            flags_exact = (self.mines[going] == self.flagged[going]).all(axis=(1, 2))
+            winners = going[~safe_left | flags_exact]
+            self.done[winners] = True
+            self.won[winners] = True
+            rewards[winners] = REWARD_WIN
+
+        return self.observe(), rewards, self.done.copy(), {"won": self.won.copy()}
+
+    def _toggle_flags(self, envs, rows, cols):
+        hidden = ~self.revealed[envs, rows, cols]
+        envs, rows, cols = envs[hidden], rows[hidden], cols[hidden]
+        self.flagged[envs, rows, cols] ^= True
+
+    def _reveal(self, envs, rows, cols, rewards):
+        # revealed or flagged targets do nothing, like Board.reveal_cell
+        blocked = self.revealed[envs, rows, cols] | self.flagged[envs, rows, cols]
+        rewards[envs[blocked]] = REWARD_NO_OP
+        envs, rows, cols = envs[~blocked], rows[~blocked], cols[~blocked]
+        if not envs.size:
+            return
+
+        first = ~self.placed[envs]
+        if first.any():
+            self._place_mines(envs[first], rows[first], cols[first])
+
+        hit = self.mines[envs, rows, cols]
+        losers = envs[hit]
+        self.done[losers] = True
+        rewards[losers] = REWARD_LOSS
+        # game over shows every mine, as Board.reveal_all_mines does
+        self.revealed[losers] |= self.mines[losers]
+
+        envs, rows, cols = envs[~hit], rows[~hit], cols[~hit]
+        rewards[envs] = REWARD_PROGRESS
+        seeds = np.zeros((envs.size, self.rows, self.cols), dtype=bool)
+        seeds[np.arange(envs.size), rows, cols] = True
+        self.revealed[envs] |= self._flood(envs, seeds)
+
+    def _place_mines(self, envs, rows, cols):
+        """Uniform mine layouts avoiding each clicked cell."""
+        n = envs.size
+        # num_mines smallest of random keys = uniform subset; the clicked cell
+        # gets a key above every other one so it's never picked
+        keys = self.rng.random((n, self.area))
+        keys[np.arange(n), rows * self.cols + cols] = 2.0
+        picks = np.argpartition(keys, self.num_mines - 1, axis=1)[:, :self.num_mines]
+        mines = np.zeros((n, self.area), dtype=bool)
+        np.put_along_axis(mines, picks, True, axis=1)
+        mines = mines.reshape(n, self.rows, self.cols)
+
+        padded = np.zeros((n, self.rows + 2, self.cols + 2), dtype=np.int8)
+        padded[:, 1:-1, 1:-1] = mines
+        counts = np.zeros((n, self.rows, self.cols), dtype=np.int8)
+        for dr in range(3):
+            for dc in range(3):
+                if dr != 1 or dc != 1:
+                    counts += padded[:, dr:dr + self.rows, dc:dc + self.cols]
+
+        self.mines[envs] = mines
+        self.counts[envs] = counts
+        self.placed[envs] = True
+
+    def _flood(self, envs, region):
+        """
+        Grows each seed cell the way Board.reveal_cell's flood fill does, by
+        repeated 3x3 dilation of the zero cells in the region. Only games
+        whose region still grew are processed on the next pass.
+        """
+        open_cells = ~self.revealed[envs] & ~self.flagged[envs]
+        zeros = self.counts[envs] == 0
+        active = np.arange(envs.size)
+        while active.size:
+            grow = region[active] & zeros[active]
+            spread = grow.copy()
+            spread[:, 1:, :] |= grow[:, :-1, :]
+            spread[:, :-1, :] |= grow[:, 1:, :]
+            wide = spread.copy()
+            wide[:, :, 1:] |= spread[:, :, :-1]
+            wide[:, :, :-1] |= spread[:, :, 1:]
+            new = wide & open_cells[active] & ~region[active]
+            grew = new.any(axis=(1, 2))
+            active = active[grew]
+            region[active] |= new[grew]
+        return region
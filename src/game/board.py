@@ -1,6 +1,15 @@
 import random
-from typing import List, Tuple, Set
+from typing import List, Optional, Tuple, Set
 from .cell import Cell, CellState
+from . import adjacency, zobrist
+from src import metrics
+
+# boards this large count adjacent mines lazily by default; since that is
+# below adjacency.PARALLEL_MIN_CELLS, the process-pool counts only run for
+# boards created with lazy_adjacency=False (the server's "adjacency": "eager")
+LAZY_ADJACENCY_MIN_CELLS = 250_000
+# lazy count cache value for "not computed yet"
+UNKNOWN_COUNT = 255
 
 class Difficulty:
     """Difficulty configurations."""
@@ -16,46 +25,104 @@ class Difficulty:
 class Board:
     """Manages the game board logic."""
     
-    def __init__(self, difficulty: dict):
+    def __init__(self, difficulty: dict, seed: Optional[int] = None,
+                 lazy_adjacency: Optional[bool] = None):
+        self._init_common(difficulty, seed)
+        
+        self.grid: List[List[Cell]] = []
+        self.mines_positions: Set[Tuple[int, int]] = set()
+        # lazy mode fills in a cell's adjacent_mines when it is revealed (or
+        # asked for through adjacent_count) instead of all at placement
+        if lazy_adjacency is None:
+            lazy_adjacency = self.rows * self.cols >= LAZY_ADJACENCY_MIN_CELLS
+        self.lazy_adjacency = lazy_adjacency
+        self._adjacent: Optional[bytearray] = None  # one count per cell, UNKNOWN_COUNT until needed
+        self._mine_map: Optional[bytearray] = None  # 1 per mine, with a one-cell empty border
+        # flagged neighbors of each cell, kept current by toggle_flag so a
+        # chord only compares two numbers
+        self.flagged_neighbors = bytearray(self.rows * self.cols)
+        
+        self._initialize_grid()
+    
+    def _init_common(self, difficulty: dict, seed: Optional[int]):
+        """Settings, rng and play state shared with PackedBoard, whatever the cell storage."""
         self.rows = difficulty["rows"]
         self.cols = difficulty["cols"]
         self.num_mines = difficulty["mines"]
         self.difficulty_name = difficulty["name"]
+        # seed + first click reproduce the mine layout
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
         
-        self.grid: List[List[Cell]] = []
-        self.mines_positions: Set[Tuple[int, int]] = set()
         self.first_click = True
         self.flags_placed = 0
-        
-        self._initialize_grid()
+        # cells whose visible state changed since the GUI last redrew them
+        self.dirty_cells: Set[Tuple[int, int]] = set()
+        # Zobrist hash of what the player can see, updated with every change
+        self.state_hash = zobrist.initial_hash(self.rows, self.cols)
     
     def _initialize_grid(self):
         """Creates an empty grid."""
         self.grid = [[Cell(r, c) for c in range(self.cols)] 
                      for r in range(self.rows)]
     
+    @metrics.timed("board.place_mines")
     def place_mines(self, safe_row: int, safe_col: int):
         """Places mines after first click to ensure first click is safe."""
-        available_positions = [(r, c) for r in range(self.rows) 
-                               for c in range(self.cols)
-                               if (r, c) != (safe_row, safe_col)]
-        
-        self.mines_positions = set(random.sample(available_positions, self.num_mines))
+        # sample indices over the cells minus the safe one; random.sample
+        # draws the same picks from a range as from a list of that length,
+        # so layouts per seed are unchanged without building the list
+        safe = safe_row * self.cols + safe_col
+        picks = self.rng.sample(range(self.rows * self.cols - 1), self.num_mines)
+        self.set_mines({divmod(pick if pick < safe else pick + 1, self.cols) for pick in picks})
+    
+    def set_mines(self, positions: Set[Tuple[int, int]]):
+        """Uses a fixed mine layout (e.g. from a puzzle pack) instead of drawing one."""
+        self.mines_positions = set(positions)
+        self.num_mines = len(self.mines_positions)
         
         for row, col in self.mines_positions:
             self.grid[row][col].is_mine = True
         
-        self._calculate_adjacent_mines()
+        if self.lazy_adjacency:
+            self._adjacent = bytearray([UNKNOWN_COUNT]) * (self.rows * self.cols)
+            stride = self.cols + 2
+            self._mine_map = bytearray((self.rows + 2) * stride)
+            for row, col in self.mines_positions:
+                self._mine_map[(row + 1) * stride + col + 1] = 1
+        else:
+            self._calculate_adjacent_mines()
         self.first_click = False
     
     def _calculate_adjacent_mines(self):
         """Calculates adjacent mine counts for all cells."""
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if not self.grid[row][col].is_mine:
-                    count = sum(1 for r, c in self._get_neighbors(row, col)
-                               if self.grid[r][c].is_mine)
-                    self.grid[row][col].adjacent_mines = count
+        counts = adjacency.adjacent_counts(
+            (row * self.cols + col for row, col in self.mines_positions), self.rows, self.cols
+        )
+        for row, cells in enumerate(self.grid):
+            base = row * self.cols
+            for col, cell in enumerate(cells):
+                cell.adjacent_mines = counts[base + col]
+    
+    def adjacent_count(self, row: int, col: int) -> int:
+        """Adjacent mines of a cell (0 for mines), computed on first use in lazy mode."""
+        cell = self.grid[row][col]
+        if self._adjacent is None:
+            return cell.adjacent_mines
+        index = row * self.cols + col
+        count = self._adjacent[index]
+        if count == UNKNOWN_COUNT:
+            count = 0
+            if not cell.is_mine:
+                # the cell itself is safe, so the whole 3x3 block can be summed;
+                # the border keeps every block inside the map
+                mines, stride = self._mine_map, self.cols + 2
+                top = row * stride + col
+                count = (sum(mines[top:top + 3]) + sum(mines[top + stride:top + stride + 3])
+                         + sum(mines[top + 2 * stride:top + 2 * stride + 3]))
+            self._adjacent[index] = count
+            cell.adjacent_mines = count
+        return count
     
     def _get_neighbors(self, row: int, col: int) -> List[Tuple[int, int]]:
         """Returns valid neighbor coordinates."""
@@ -69,9 +136,10 @@ class Board:
                     neighbors.append((nr, nc))
         return neighbors
     
+    @metrics.timed("board.reveal_cell")
     def reveal_cell(self, row: int, col: int) -> bool:
         """
-        Reveals a cell and recursively reveals empty neighbors.
+        Reveals a cell and flood-fills empty neighbors.
         Returns True if a mine was hit.
         """
         if not (0 <= row < self.rows and 0 <= col < self.cols):
@@ -88,15 +156,42 @@ class Board:
         
         # Reveal the cell
         is_mine = cell.reveal()
+        self.dirty_cells.add((row, col))
         
         if is_mine:
+            self.state_hash ^= zobrist.cell_key(row * self.cols + col, zobrist.VISIBLE_MINE)
             return True
         
-        # Recursive reveal for empty cells (DFS)
-        if cell.adjacent_mines == 0:
-            neighbors = self._get_neighbors(row, col)
-            for neighbor_row, neighbor_col in neighbors:
-                self.reveal_cell(neighbor_row, neighbor_col)
+        lazy = self._adjacent is not None
+        if lazy:
+            self.adjacent_count(row, col)
+        state_hash = self.state_hash ^ zobrist.cell_key(row * self.cols + col, cell.adjacent_mines)
+        
+        # Flood fill empty cells (iterative DFS, since a recursive one
+        # overflows the recursion limit on large boards)
+        stack = [(row, col)] if cell.adjacent_mines == 0 else []
+        flooded = 1
+        grid, dirty, hidden, cell_key = self.grid, self.dirty_cells, CellState.HIDDEN, zobrist.cell_key
+        while stack:
+            r, c = stack.pop()
+            first_col, last_col = max(c - 1, 0), min(c + 2, self.cols)
+            for neighbor_row in range(max(r - 1, 0), min(r + 2, self.rows)):
+                line = grid[neighbor_row]
+                for neighbor_col in range(first_col, last_col):
+                    neighbor = line[neighbor_col]
+                    # skips revealed and flagged cells (and the center)
+                    if neighbor.state is not hidden:
+                        continue
+                    neighbor.state = CellState.REVEALED
+                    dirty.add((neighbor_row, neighbor_col))
+                    flooded += 1
+                    count = self.adjacent_count(neighbor_row, neighbor_col) if lazy else neighbor.adjacent_mines
+                    state_hash ^= cell_key(neighbor_row * self.cols + neighbor_col, count)
+                    if count == 0:
+                        stack.append((neighbor_row, neighbor_col))
+        self.state_hash = state_hash
+        if metrics.ENABLED:
+            metrics.observe("board.reveal_cell.flooded", flooded)
         return False
     
     def toggle_flag(self, row: int, col: int) -> bool:
@@ -107,6 +202,12 @@ class Board:
         cell = self.grid[row][col]
         was_flagged = cell.is_flagged()
         flagged = cell.toggle_flag()
+        if flagged != was_flagged:
+            self.dirty_cells.add((row, col))
+            self.state_hash ^= zobrist.cell_key(row * self.cols + col, zobrist.VISIBLE_FLAGGED)
+            step = 1 if flagged else -1
+            for r, c in self._get_neighbors(row, col):
+                self.flagged_neighbors[r * self.cols + c] += step
         
         if flagged and not was_flagged:
             self.flags_placed += 1
@@ -115,6 +216,49 @@ class Board:
         
         return flagged
     
+    def flagged_neighbor_count(self, row: int, col: int) -> int:
+        return self.flagged_neighbors[row * self.cols + col]
+    
+    def recount_flagged_neighbors(self):
+        """Rebuilds flagged_neighbors after cell states were set directly."""
+        self.flagged_neighbors = bytearray(self.rows * self.cols)
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if self.grid[row][col].is_flagged():
+                    for r, c in self._get_neighbors(row, col):
+                        self.flagged_neighbors[r * self.cols + c] += 1
+    
+    def recompute_hash(self):
+        """Rebuilds state_hash after cell states were set directly."""
+        state_hash = zobrist.initial_hash(self.rows, self.cols)
+        for row in range(self.rows):
+            for col in range(self.cols):
+                code = zobrist.visible_code(self.grid[row][col], self.adjacent_count(row, col))
+                state_hash ^= zobrist.cell_key(row * self.cols + col, code)
+        self.state_hash = state_hash
+    
+    def chord_cell(self, row: int, col: int) -> bool:
+        """
+        Reveals the unflagged neighbors of a revealed number once its
+        neighbors carry that many flags. Returns True if a mine was hit
+        (a flag was misplaced).
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        
+        cell = self.grid[row][col]
+        if not cell.is_revealed() or cell.is_mine:
+            return False
+        count = self.adjacent_count(row, col)
+        if count == 0 or self.flagged_neighbor_count(row, col) != count:
+            return False
+        
+        hit_mine = False
+        for r, c in self._get_neighbors(row, col):
+            if self.reveal_cell(r, c):
+                hit_mine = True
+        return hit_mine
+    
     def get_safe_unrevealed_cells(self) -> List[Tuple[int, int]]:
         """Returns list of safe, unrevealed cells for hints."""
         safe_cells = []
@@ -125,6 +269,7 @@ class Board:
                     safe_cells.append((row, col))
         return safe_cells
     
+    @metrics.timed("board.check_win")
     def check_win(self) -> bool:
         """
         Checks if the player has won.
@@ -151,6 +296,10 @@ class Board:
                 # Check for incorrect flags (flagged but not a mine)
                 if cell.is_flagged() and not cell.is_mine:
                     no_incorrect_flags = False
+                
+                # Both conditions already failed, the rest can't change that
+                if not all_safe_revealed and not (all_mines_flagged and no_incorrect_flags):
+                    return False
 
         # Win if either: all safe cells revealed, OR all mines correctly flagged
         return all_safe_revealed or (all_mines_flagged and no_incorrect_flags)
@@ -158,7 +307,19 @@ class Board:
     def reveal_all_mines(self):
         """Reveals all mines (for game over)."""
         for row, col in self.mines_positions:
-            self.grid[row][col].state = CellState.REVEALED
+            cell = self.grid[row][col]
+            if not cell.is_revealed():
+                index = row * self.cols + col
+                shown = zobrist.VISIBLE_FLAGGED if cell.is_flagged() else zobrist.VISIBLE_HIDDEN
+                self.state_hash ^= zobrist.cell_key(index, shown) ^ zobrist.cell_key(index, zobrist.VISIBLE_MINE)
+            cell.state = CellState.REVEALED
+        self.dirty_cells.update(self.mines_positions)
+    
+    def pop_dirty_cells(self) -> Set[Tuple[int, int]]:
+        """Returns the cells changed since the last call and clears the set."""
+        dirty = self.dirty_cells
+        self.dirty_cells = set()
+        return dirty
     
     def print_board(self, reveal_all=False):
         """
@@ -189,24 +350,25 @@ class Board:
             print(f"{row:2} ", end="")
             for col in range(self.cols):
                 cell = self.grid[row][col]
+                count = self.adjacent_count(row, col)
                 
                 if reveal_all:
                     # Show everything (debug mode)
                     if cell.is_mine:
                         print("*", end=" ")
-                    elif cell.adjacent_mines == 0:
+                    elif count == 0:
                         print("_", end=" ")
                     else:
-                        print(cell.adjacent_mines, end=" ")
+                        print(count, end=" ")
                 else:
                     # Show only what player can see
                     if cell.is_revealed():
                         if cell.is_mine:
                             print("*", end=" ")
-                        elif cell.adjacent_mines == 0:
+                        elif count == 0:
                             print("_", end=" ")
                         else:
-                            print(cell.adjacent_mines, end=" ")
+                            print(count, end=" ")
                     elif cell.is_flagged():
                         print("F", end=" ")
                     else:
@@ -266,26 +428,27 @@ class Board:
             print(f"{GRAY}{row:2}{RESET} ", end="")
             for col in range(self.cols):
                 cell = self.grid[row][col]
+                count = self.adjacent_count(row, col)
                 
                 if reveal_all:
                     # Show everything (debug mode)
                     if cell.is_mine:
                         print(f"{RED}*{RESET}", end=" ")
-                    elif cell.adjacent_mines == 0:
+                    elif count == 0:
                         print(f"{GRAY}_{RESET}", end=" ")
                     else:
-                        color = number_colors.get(cell.adjacent_mines, RESET)
-                        print(f"{color}{cell.adjacent_mines}{RESET}", end=" ")
+                        color = number_colors.get(count, RESET)
+                        print(f"{color}{count}{RESET}", end=" ")
                 else:
                     # Show only what player can see
                     if cell.is_revealed():
                         if cell.is_mine:
                             print(f"{RED}{BOLD}*{RESET}", end=" ")
-                        elif cell.adjacent_mines == 0:
+                        elif count == 0:
                             print(f"{GRAY}_{RESET}", end=" ")
                         else:
-                            color = number_colors.get(cell.adjacent_mines, RESET)
-                            print(f"{color}{cell.adjacent_mines}{RESET}", end=" ")
+                            color = number_colors.get(count, RESET)
+                            print(f"{color}{count}{RESET}", end=" ")
                     elif cell.is_flagged():
                         print(f"{YELLOW}F{RESET}", end=" ")
                     else:
@@ -1,5 +1,6 @@
 from enum import Enum
 import time
+from typing import Iterable, NamedTuple, Optional, Set, Tuple, Type
 from .board import Board, Difficulty
 
 class GameStatus(Enum):
@@ -8,11 +9,26 @@ class GameStatus(Enum):
     WON = 2
     LOST = 3
 
+# action kinds for apply_actions; NumPy drivers pass these codes
+ACTION_REVEAL = 0
+ACTION_FLAG = 1
+ACTION_CHORD = 2
+ACTION_KINDS = {"reveal": ACTION_REVEAL, "flag": ACTION_FLAG, "chord": ACTION_CHORD,
+                ACTION_REVEAL: ACTION_REVEAL, ACTION_FLAG: ACTION_FLAG, ACTION_CHORD: ACTION_CHORD}
+
+class ActionResult(NamedTuple):
+    applied: int  # actions processed, including no-ops
+    hit_mine: bool
+    status: GameStatus
+    changed: Set[Tuple[int, int]]  # cells whose visible state changed
+
 class GameState:
     """Manages overall game state."""
     
-    def __init__(self, difficulty: dict):
-        self.board = Board(difficulty)
+    def __init__(self, difficulty: dict, seed: Optional[int] = None,
+                 board_class: Type[Board] = Board):
+        # board_class=PackedBoard keeps huge boards in bitmaps
+        self.board = board_class(difficulty, seed)
         self.status = GameStatus.NOT_STARTED
         self.start_time = None
         self.end_time = None
@@ -67,11 +83,83 @@ class GameState:
         elif self.board.check_win():
             self.end_game(won=True)
     
+    def apply_actions(self, actions: Iterable) -> ActionResult:
+        """
+        Applies (kind, row, col) actions in order, where kind is "reveal",
+        "flag", "chord" or an ACTION_* code; an (N, 3) integer NumPy array
+        works too. Same rules and outcome as one click_cell/flag_cell/
+        chord_cell call per action, but the batch stops once the game ends.
+        Raises ValueError, before anything is applied, if any action has an
+        unknown kind or a cell off the board.
+        """
+        if hasattr(actions, "tolist"):
+            actions = actions.tolist()
+
+        board = self.board
+        checked = []
+        for kind, row, col in actions:
+            # bools are ints too, and True would find the code 1
+            known = isinstance(kind, (str, int)) and not isinstance(kind, bool)
+            code = ACTION_KINDS.get(kind) if known else None
+            if code is None:
+                raise ValueError(f"Unknown action kind: {kind!r}")
+            if isinstance(row, bool) or isinstance(col, bool) or row != int(row) or col != int(col):
+                raise ValueError(f"Cell must be integers: {row!r}, {col!r}")
+            row, col = int(row), int(col)
+            if not (0 <= row < board.rows and 0 <= col < board.cols):
+                raise ValueError(f"Cell off the board: {row}, {col}")
+            checked.append((code, row, col))
+
+        # collect this batch's changes apart from what the GUI hasn't drawn yet
+        pending = board.dirty_cells
+        board.dirty_cells = set()
+        applied = 0
+        hit_mine = False
+        # the win check only reruns once the visible state changed
+        checked_hash = None
+        try:
+            for kind, row, col in checked:
+                if self.status not in (GameStatus.NOT_STARTED, GameStatus.PLAYING):
+                    break
+                applied += 1
+                if kind == ACTION_REVEAL:
+                    if self.status == GameStatus.NOT_STARTED:
+                        self.start_game()
+                    hit_mine = board.reveal_cell(row, col)
+                elif self.status != GameStatus.PLAYING:
+                    continue
+                elif kind == ACTION_FLAG:
+                    board.toggle_flag(row, col)
+                    continue
+                else:
+                    hit_mine = board.chord_cell(row, col)
+
+                if hit_mine:
+                    self.end_game(won=False)
+                elif board.state_hash != checked_hash:
+                    checked_hash = board.state_hash
+                    if board.check_win():
+                        self.end_game(won=True)
+        finally:
+            changed = board.dirty_cells
+            board.dirty_cells = pending | changed
+        return ActionResult(applied, hit_mine, self.status, changed)
+    
     def flag_cell(self, row: int, col: int):
         """Handles right click (flag) on a cell."""
         if self.status == GameStatus.PLAYING:
             self.board.toggle_flag(row, col)
     
+    def chord_cell(self, row: int, col: int):
+        """Handles a chord (double click) on a revealed number."""
+        if self.status != GameStatus.PLAYING:
+            return
+        
+        if self.board.chord_cell(row, col):
+            self.end_game(won=False)
+        elif self.board.check_win():
+            self.end_game(won=True)
+    
     def end_game(self, won: bool):
         """Ends the game."""
         self.status = GameStatus.WON if won else GameStatus.LOST
@@ -101,4 +189,4 @@ class GameState:
     
     def reset(self):
         """Resets the game with same difficulty."""
-        self.__init__(self.difficulty)
\ No newline at end of file
+        self.__init__(self.difficulty, board_class=type(self.board))
\ No newline at end of file
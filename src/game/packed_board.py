@@ -0,0 +1,385 @@
+"""
+Bit-packed board: the same rules and API as Board, with state in bitmaps.
+
+Each plane (mines, revealed, flagged, adjacency bits) is a bytearray with
+one bit per cell. Cells are laid out row-major in a (rows + 2) x (cols + 1)
+frame (plus one trailing bit): a guard row above and below the board and a
+guard column in front of each row. Guard bits are pre-marked as revealed, so
+a flood fill needs no bounds checks, and every cross-row wrap of a shift
+lands in a guard bit.
+
+Bulk work converts planes to Python ints: adjacency counts are eight shifted
+copies of the mine plane summed by a bit-sliced adder tree into four count
+planes, and the win check compares popcounts. A 1000x1000 board takes about
+1 MB instead of a million Cell objects.
+"""
+from typing import Iterator, List, Optional, Set, Tuple
+
+from . import zobrist
+from .board import Board
+from .cell import CellState
+from src import metrics
+
+
+def _full_adder(a: int, b: int, c: int) -> Tuple[int, int]:
+    """Bitwise a + b + c as (sum, carry) planes."""
+    partial = a ^ b
+    return partial ^ c, (a & b) | (c & partial)
+
+
+def sum_planes(planes: List[int]) -> List[int]:
+    """Adds eight 1-bit planes into four count-bit planes (least significant first)."""
+    x1, x2, x3, x4, x5, x6, x7, x8 = planes
+    s1, c1 = _full_adder(x1, x2, x3)
+    s2, c2 = _full_adder(x4, x5, x6)
+    s3, c3 = x7 ^ x8, x7 & x8
+    bit0, c4 = _full_adder(s1, s2, s3)
+    t1, d1 = _full_adder(c1, c2, c3)
+    bit1, d2 = t1 ^ c4, t1 & c4
+    return [bit0, bit1, d1 ^ d2, d1 & d2]
+
+
+class PackedCell:
+    """Cell-compatible view of one position in a PackedBoard."""
+
+    __slots__ = ("board", "row", "col", "index")
+
+    def __init__(self, board: "PackedBoard", row: int, col: int):
+        self.board = board
+        self.row = row
+        self.col = col
+        self.index = board.bit_index(row, col)
+
+    @property
+    def is_mine(self) -> bool:
+        return self.board._test(self.board._mines, self.index)
+
+    @is_mine.setter
+    def is_mine(self, value: bool):
+        self.board._assign(self.board._mines, self.index, value)
+
+    @property
+    def adjacent_mines(self) -> int:
+        return self.board._count_at(self.index)
+
+    @adjacent_mines.setter
+    def adjacent_mines(self, value: int):
+        board = self.board
+        for bit, plane in enumerate(board._counts):
+            board._assign(plane, self.index, value >> bit & 1)
+        board._assign(board._zero, self.index, value == 0 and not self.is_mine)
+
+    @property
+    def state(self) -> CellState:
+        if self.board._test(self.board._revealed, self.index):
+            return CellState.REVEALED
+        if self.board._test(self.board._flagged, self.index):
+            return CellState.FLAGGED
+        return CellState.HIDDEN
+
+    @state.setter
+    def state(self, value: CellState):
+        self.board._assign(self.board._revealed, self.index, value == CellState.REVEALED)
+        self.board._assign(self.board._flagged, self.index, value == CellState.FLAGGED)
+
+    def reveal(self) -> bool:
+        """Reveals the cell. Returns True if it was a mine."""
+        if self.is_flagged():
+            return False
+        self.state = CellState.REVEALED
+        return self.is_mine
+
+    def toggle_flag(self) -> bool:
+        """Toggles flag state. Returns True if flagged."""
+        state = self.state
+        if state == CellState.REVEALED:
+            return False
+        self.state = CellState.FLAGGED if state == CellState.HIDDEN else CellState.HIDDEN
+        return state == CellState.HIDDEN
+
+    def is_revealed(self) -> bool:
+        return self.board._test(self.board._revealed, self.index)
+
+    def is_flagged(self) -> bool:
+        return self.board._test(self.board._flagged, self.index)
+
+    def __repr__(self):
+        return f"Cell({self.row},{self.col},mine={self.is_mine},adj={self.adjacent_mines})"
+
+
+class _PackedRow:
+    __slots__ = ("board", "row")
+
+    def __init__(self, board: "PackedBoard", row: int):
+        self.board = board
+        self.row = row
+
+    def __getitem__(self, col: int) -> PackedCell:
+        if not 0 <= col < self.board.cols:
+            raise IndexError("column out of range")
+        return PackedCell(self.board, self.row, col)
+
+    def __len__(self) -> int:
+        return self.board.cols
+
+    def __iter__(self) -> Iterator[PackedCell]:
+        return (PackedCell(self.board, self.row, col) for col in range(self.board.cols))
+
+
+class PackedGrid:
+    """board.grid[row][col] for a PackedBoard; cells are views made on access."""
+
+    __slots__ = ("board",)
+
+    def __init__(self, board: "PackedBoard"):
+        self.board = board
+
+    def __getitem__(self, row: int) -> _PackedRow:
+        if not 0 <= row < self.board.rows:
+            raise IndexError("row out of range")
+        return _PackedRow(self.board, row)
+
+    def __len__(self) -> int:
+        return self.board.rows
+
+    def __iter__(self) -> Iterator[_PackedRow]:
+        return (_PackedRow(self.board, row) for row in range(self.board.rows))
+
+
+class PackedBoard(Board):
+    """Board with bitmap planes; the same seed gives the same mine layout."""
+
+    def __init__(self, difficulty: dict, seed: Optional[int] = None):
+        # same seed, rng and hash setup as Board, so the mine draws match;
+        # the Cell grid and per-cell arrays are replaced by the planes below
+        self._init_common(difficulty, seed)
+        # the count planes are cheap enough to build in full
+        self.lazy_adjacency = False
+
+        self.stride = self.cols + 1
+        # the trailing bit is the bottom-right neighbor of the last cell
+        self.num_bits = (self.rows + 2) * self.stride + 1
+        self.plane_bytes = (self.num_bits + 7) // 8
+        self.grid = PackedGrid(self)
+        self._initialize_grid()
+
+    def _initialize_grid(self):
+        """Allocates empty planes and marks the guard frame revealed."""
+        self._mines = bytearray(self.plane_bytes)
+        self._flagged = bytearray(self.plane_bytes)
+        self._zero = bytearray(self.plane_bytes)  # safe cells with no adjacent mines
+        self._counts = [bytearray(self.plane_bytes) for _ in range(4)]
+        self._valid = self._valid_mask()
+        guard = ((1 << self.num_bits) - 1) & ~self._valid
+        self._revealed = bytearray(guard.to_bytes(self.plane_bytes, "little"))
+
+    def _valid_mask(self) -> int:
+        # one row of cols ones, repeated every stride bits (a geometric
+        # series), shifted past the top guard row and the first guard column
+        stride = self.stride
+        repeat = ((1 << (self.rows * stride)) - 1) // ((1 << stride) - 1)
+        return repeat * ((1 << self.cols) - 1) << (stride + 1)
+
+    def bit_index(self, row: int, col: int) -> int:
+        return (row + 1) * self.stride + col + 1
+
+    def cell_at(self, index: int) -> Tuple[int, int]:
+        row, col = divmod(index, self.stride)
+        return row - 1, col - 1
+
+    @staticmethod
+    def _test(plane: bytearray, index: int) -> bool:
+        return bool(plane[index >> 3] >> (index & 7) & 1)
+
+    @staticmethod
+    def _assign(plane: bytearray, index: int, value: bool):
+        if value:
+            plane[index >> 3] |= 1 << (index & 7)
+        else:
+            plane[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def _count_at(self, index: int) -> int:
+        byte, shift = index >> 3, index & 7
+        c0, c1, c2, c3 = self._counts
+        return ((c0[byte] >> shift & 1) | (c1[byte] >> shift & 1) << 1
+                | (c2[byte] >> shift & 1) << 2 | (c3[byte] >> shift & 1) << 3)
+
+    def _to_int(self, plane: bytearray) -> int:
+        return int.from_bytes(plane, "little")
+
+    def _to_plane(self, value: int) -> bytearray:
+        return bytearray(value.to_bytes(self.plane_bytes, "little"))
+
+    def _iter_bits(self, value: int) -> Iterator[int]:
+        """Set bit indices of a plane-sized int, in row-major order."""
+        data = value.to_bytes(self.plane_bytes, "little")
+        start = 0
+        for byte_index, byte in enumerate(data):
+            if byte:
+                start = byte_index << 3
+                while byte:
+                    low = byte & -byte
+                    yield start + low.bit_length() - 1
+                    byte ^= low
+
+    @property
+    def mines_positions(self) -> Set[Tuple[int, int]]:
+        return {self.cell_at(i) for i in self._iter_bits(self._to_int(self._mines))}
+
+    @mines_positions.setter
+    def mines_positions(self, positions):
+        self._mines = bytearray(self.plane_bytes)
+        for row, col in positions:
+            self._assign(self._mines, self.bit_index(row, col), True)
+
+    def set_mines(self, positions: Set[Tuple[int, int]]):
+        """Uses a fixed mine layout (e.g. from a puzzle pack) instead of drawing one."""
+        self._mines = bytearray(self.plane_bytes)
+        for row, col in positions:
+            self._assign(self._mines, self.bit_index(row, col), True)
+        self.num_mines = len(positions)
+
+        self._calculate_adjacent_mines()
+        self.first_click = False
+
+    def _calculate_adjacent_mines(self):
+        """Adjacency counts of every safe cell from shifted mine planes."""
+        mines = self._to_int(self._mines)
+        stride = self.stride
+        neighbors = [
+            mines << 1, mines >> 1,
+            mines << stride, mines >> stride,
+            mines << (stride - 1), mines >> (stride - 1),
+            mines << (stride + 1), mines >> (stride + 1),
+        ]
+        # Board leaves a mine's own count at 0
+        safe = self._valid & ~mines
+        counts = [plane & safe for plane in sum_planes(neighbors)]
+        self._counts = [self._to_plane(plane) for plane in counts]
+        self._zero = self._to_plane(safe & ~(counts[0] | counts[1] | counts[2] | counts[3]))
+
+    def adjacent_count(self, row: int, col: int) -> int:
+        return self._count_at(self.bit_index(row, col))
+
+    @metrics.timed("board.reveal_cell")
+    def reveal_cell(self, row: int, col: int) -> bool:
+        """
+        Reveals a cell and flood-fills empty neighbors.
+        Returns True if a mine was hit.
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+
+        index = self.bit_index(row, col)
+        revealed, flagged = self._revealed, self._flagged
+        if self._test(revealed, index) or self._test(flagged, index):
+            return False
+
+        # First click safety
+        if self.first_click:
+            self.place_mines(row, col)
+
+        self._assign(revealed, index, True)
+        self.dirty_cells.add((row, col))
+        cols, cell_key = self.cols, zobrist.cell_key
+        if self._test(self._mines, index):
+            self.state_hash ^= cell_key(row * cols + col, zobrist.VISIBLE_MINE)
+            return True
+        state_hash = self.state_hash ^ cell_key(row * cols + col, self._count_at(index))
+
+        # Flood fill; the guard frame is "revealed", so no bounds checks
+        zero, dirty, stride = self._zero, self.dirty_cells, self.stride
+        offsets = (-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1)
+        stack = [index] if self._test(zero, index) else []
+        flooded = 1
+        while stack:
+            current = stack.pop()
+            for offset in offsets:
+                neighbor = current + offset
+                byte, bit = neighbor >> 3, 1 << (neighbor & 7)
+                if (revealed[byte] | flagged[byte]) & bit:
+                    continue
+                revealed[byte] |= bit
+                r, c = divmod(neighbor, stride)
+                dirty.add((r - 1, c - 1))
+                flooded += 1
+                if zero[byte] & bit:
+                    stack.append(neighbor)
+                    state_hash ^= cell_key((r - 1) * cols + c - 1, 0)
+                else:
+                    state_hash ^= cell_key((r - 1) * cols + c - 1, self._count_at(neighbor))
+        self.state_hash = state_hash
+        if metrics.ENABLED:
+            metrics.observe("board.reveal_cell.flooded", flooded)
+        return False
+
+    def toggle_flag(self, row: int, col: int) -> bool:
+        """Toggles flag on a cell. Returns True if flagged."""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+
+        index = self.bit_index(row, col)
+        if self._test(self._revealed, index):
+            return False
+        flagged = not self._test(self._flagged, index)
+        self._assign(self._flagged, index, flagged)
+        self.flags_placed += 1 if flagged else -1
+        self.dirty_cells.add((row, col))
+        self.state_hash ^= zobrist.cell_key(row * self.cols + col, zobrist.VISIBLE_FLAGGED)
+        return flagged
+
+    def flagged_neighbor_count(self, row: int, col: int) -> int:
+        # eight bit tests on the flag plane: O(1) without a per-cell count array
+        flagged, index, stride = self._flagged, self.bit_index(row, col), self.stride
+        return sum(
+            flagged[neighbor >> 3] >> (neighbor & 7) & 1
+            for neighbor in (index - stride - 1, index - stride, index - stride + 1, index - 1,
+                             index + 1, index + stride - 1, index + stride, index + stride + 1)
+        )
+
+    def recount_flagged_neighbors(self):
+        """Nothing to rebuild: counts are read from the flag plane."""
+
+    def get_safe_unrevealed_cells(self) -> List[Tuple[int, int]]:
+        """Returns list of safe, unrevealed cells for hints."""
+        mines = self._to_int(self._mines)
+        revealed = self._to_int(self._revealed)
+        flagged = self._to_int(self._flagged)
+        return [self.cell_at(i) for i in self._iter_bits(self._valid & ~(mines | revealed | flagged))]
+
+    @metrics.timed("board.check_win")
+    def check_win(self) -> bool:
+        """
+        Checks if the player has won: every safe cell revealed (by popcount),
+        or the flags sitting exactly on the mines.
+        """
+        mines = self._to_int(self._mines)
+        revealed = self._to_int(self._revealed)
+        safe_cells = self.rows * self.cols - mines.bit_count()
+        if (revealed & self._valid & ~mines).bit_count() == safe_cells:
+            return True
+        return self._flagged == self._mines
+
+    def reveal_all_mines(self):
+        """Reveals all mines (for game over)."""
+        mines = self._to_int(self._mines)
+        revealed = self._to_int(self._revealed)
+        for index in self._iter_bits(mines & ~revealed):
+            row, col = self.cell_at(index)
+            shown = zobrist.VISIBLE_FLAGGED if self._test(self._flagged, index) else zobrist.VISIBLE_HIDDEN
+            cell = row * self.cols + col
+            self.state_hash ^= zobrist.cell_key(cell, shown) ^ zobrist.cell_key(cell, zobrist.VISIBLE_MINE)
+        self._revealed = self._to_plane(revealed | mines)
+        self.dirty_cells.update(self.mines_positions)
+
+    def dump_planes(self) -> bytes:
+        """Raw planes for serialization (see load_planes)."""
+        return b"".join([self._mines, self._revealed, self._flagged, self._zero, *self._counts])
+
+    def load_planes(self, data: bytes):
+        size = self.plane_bytes
+        if len(data) != 8 * size:
+            raise ValueError("Plane data doesn't match the board size")
+        planes = [bytearray(data[i * size:(i + 1) * size]) for i in range(8)]
+        self._mines, self._revealed, self._flagged, self._zero = planes[:4]
+        self._counts = planes[4:]
@@ -0,0 +1,232 @@
+"""
+Puzzle packs: many fixed board layouts in one memory-mapped file.
+
+Layout (all little-endian):
+
+    header   magic b"MSPK", version, reserved, puzzle count, index offset
+    records  one per puzzle, back to back:
+             kind, rows, cols, mines, first click row/col, seed
+             + for KIND_LAYOUT, the mine bitmap (bit i = cell i in row-major order)
+    index    one uint64 record offset per puzzle
+
+A pack is opened with mmap, and puzzle #N is read through the index without
+touching the other records, so access cost doesn't grow with pack size.
+Seed puzzles replay Board's own draw for that seed and first click; layout
+puzzles store the mines outright.
+
+    python -m src.game.puzzle_pack build puzzles.mspk --count 10000 --difficulty Intermediate
+"""
+import argparse
+import mmap
+import random
+import struct
+import sys
+from array import array
+from typing import BinaryIO, Iterable, List, NamedTuple, Optional, Set, Tuple, Type
+
+from .board import Board, Difficulty
+from .game_state import GameState
+
+MAGIC = b"MSPK"
+FORMAT_VERSION = 1
+
+# menu entry for puzzle games; each board size is recorded under its own
+# difficulty name, e.g. "Puzzle pack 16x16", so stats of different sizes
+# don't mix
+PUZZLE_DIFFICULTY_NAME = "Puzzle pack"
+
+KIND_SEED = 0
+KIND_LAYOUT = 1
+
+# magic, version, reserved, puzzle count, index offset
+_HEADER = struct.Struct("<4sHHQQ")
+# kind, rows, cols, mines, first click row, first click col, seed
+_RECORD = struct.Struct("<BHHIHHQ")
+_OFFSET = struct.Struct("<Q")
+
+
+class Puzzle(NamedTuple):
+    number: int
+    rows: int
+    cols: int
+    mines: int
+    first_click: Tuple[int, int]
+    seed: int
+    layout: Optional[bytes]  # mine bitmap, None for seed puzzles
+
+    @property
+    def difficulty(self) -> dict:
+        # "puzzle" lets a restart reload the same layout
+        return {"rows": self.rows, "cols": self.cols, "mines": self.mines,
+                "name": f"{PUZZLE_DIFFICULTY_NAME} {self.rows}x{self.cols}", "puzzle": self.number}
+
+    def mine_positions(self) -> Set[Tuple[int, int]]:
+        """Mine cells of a layout puzzle."""
+        bits = int.from_bytes(self.layout, "little")
+        positions = set()
+        while bits:
+            low = bits & -bits
+            positions.add(divmod(low.bit_length() - 1, self.cols))
+            bits ^= low
+        return positions
+
+    def new_game(self, board_class: Type[Board] = Board) -> GameState:
+        """A game on this puzzle's layout, mines already placed."""
+        game = GameState(self.difficulty, self.seed, board_class)
+        if self.layout is None:
+            game.board.place_mines(*self.first_click)
+        else:
+            game.board.set_mines(self.mine_positions())
+        return game
+
+
+def _layout_bytes(positions: Iterable[Tuple[int, int]], cols: int, area: int) -> bytes:
+    bits = 0
+    for row, col in positions:
+        bits |= 1 << (row * cols + col)
+    return bits.to_bytes((area + 7) // 8, "little")
+
+
+class PuzzleWriter:
+    """Appends puzzles to a new pack; the index is written on close()."""
+
+    def __init__(self, path: str):
+        self._file: BinaryIO = open(path, "wb")
+        self._offsets = array("Q")
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0, 0))
+
+    def add_seed(self, difficulty: dict, seed: int, first_click: Tuple[int, int]) -> int:
+        """Adds the layout Board draws for this seed and first click; returns its number."""
+        rows, cols = difficulty["rows"], difficulty["cols"]
+        if not 0 < difficulty["mines"] < rows * cols:
+            raise ValueError("Mines must be between 1 and the number of cells - 1")
+        return self._add(KIND_SEED, rows, cols, difficulty["mines"], first_click, seed, b"")
+
+    def add_layout(self, rows: int, cols: int, positions: Iterable[Tuple[int, int]],
+                   first_click: Tuple[int, int]) -> int:
+        """Adds a fixed set of mine cells; returns its number."""
+        positions = set(positions)
+        if first_click in positions:
+            raise ValueError("The recommended first click can't be a mine")
+        layout = _layout_bytes(positions, cols, rows * cols)
+        return self._add(KIND_LAYOUT, rows, cols, len(positions), first_click, 0, layout)
+
+    def _add(self, kind, rows, cols, mines, first_click, seed, layout) -> int:
+        row, col = first_click
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError("First click is off the board")
+        self._offsets.append(self._file.tell())
+        self._file.write(_RECORD.pack(kind, rows, cols, mines, row, col, seed))
+        self._file.write(layout)
+        return len(self._offsets) - 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        offsets = self._offsets
+        if sys.byteorder == "big":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        offsets.tofile(self._file)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(self._offsets), index_offset))
+        self._file.close()
+
+    def __enter__(self) -> "PuzzleWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PuzzlePack:
+    """Read-only, memory-mapped puzzle pack; pack[n] loads puzzle #n."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError("Not a puzzle pack")
+        magic, version, _, count, index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError("Not a puzzle pack")
+        if version != FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"Unsupported puzzle pack version {version}")
+        if index_offset + count * _OFFSET.size > len(self._map):
+            self._map.close()
+            raise ValueError("Corrupt puzzle pack")
+        self._count = count
+        self._index_offset = index_offset
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, number: int) -> Puzzle:
+        if number < 0:
+            number += self._count
+        if not 0 <= number < self._count:
+            raise IndexError("Puzzle number out of range")
+        # the index itself was bounds-checked on open; records are checked here
+        (offset,) = _OFFSET.unpack_from(self._map, self._index_offset + number * _OFFSET.size)
+        if not _HEADER.size <= offset <= self._index_offset - _RECORD.size:
+            raise ValueError("Corrupt puzzle pack")
+        kind, rows, cols, mines, row, col, seed = _RECORD.unpack_from(self._map, offset)
+        if not (0 <= row < rows and 0 <= col < cols and mines < rows * cols):
+            raise ValueError("Corrupt puzzle pack")
+        layout = None
+        if kind == KIND_LAYOUT:
+            start = offset + _RECORD.size
+            end = start + (rows * cols + 7) // 8
+            if end > self._index_offset:
+                raise ValueError("Corrupt puzzle pack")
+            layout = self._map[start:end]
+        elif kind != KIND_SEED:
+            raise ValueError("Corrupt puzzle pack")
+        return Puzzle(number, rows, cols, mines, (row, col), seed, layout)
+
+    def random(self, rng: Optional[random.Random] = None) -> Puzzle:
+        return self[(rng or random).randrange(self._count)]
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> "PuzzlePack":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_pack(path: str, count: int, difficulty: dict, seed: Optional[int] = None) -> int:
+    """Writes count seed puzzles with random first clicks; returns the count."""
+    rng = random.Random(seed)
+    with PuzzleWriter(path) as writer:
+        for _ in range(count):
+            first_click = (rng.randrange(difficulty["rows"]), rng.randrange(difficulty["cols"]))
+            writer.add_seed(difficulty, rng.randrange(2 ** 32), first_click)
+    return count
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m src.game.puzzle_pack", description="Puzzle pack tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="generate a pack of seed puzzles")
+    build.add_argument("path")
+    build.add_argument("--count", type=int, default=1000)
+    build.add_argument("--difficulty", default=Difficulty.INTERMEDIATE["name"],
+                       choices=[d["name"] for d in Difficulty.get_all()])
+    build.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    difficulty = next(d for d in Difficulty.get_all() if d["name"] == args.difficulty)
+    build_pack(args.path, args.count, difficulty, args.seed)
+    print(f"Wrote {args.count} puzzles to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
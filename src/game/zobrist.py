@@ -0,0 +1,42 @@
+"""
+64-bit Zobrist hashing of a board's visible state.
+
+Every cell shows one visible code: a revealed count (0-8), hidden, flagged or
+a revealed mine. A board's hash XORs one key per (cell, code), so a change
+updates it with two XORs. Keys come from splitmix64 of the cell index and
+code rather than a stored table, so huge boards cost nothing up front.
+Hidden cells use key 0, which makes a fresh board's hash just the size salt.
+"""
+
+VISIBLE_HIDDEN = 9
+VISIBLE_FLAGGED = 10
+VISIBLE_MINE = 11
+
+_MASK = (1 << 64) - 1
+_SIZE_SALT = 0x5EED_B0A2_D000_0000
+
+
+def splitmix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def cell_key(index: int, code: int) -> int:
+    """Key of a cell (row-major index) showing a visible code."""
+    if code == VISIBLE_HIDDEN:
+        return 0
+    return splitmix64(index << 4 | code)
+
+
+def initial_hash(rows: int, cols: int) -> int:
+    """Hash of an all-hidden board; boards of different sizes differ."""
+    return splitmix64(_SIZE_SALT ^ (rows << 32 | cols))
+
+
+def visible_code(cell, count: int) -> int:
+    """Visible code of a cell, given its adjacent count."""
+    if cell.is_revealed():
+        return VISIBLE_MINE if cell.is_mine else count
+    return VISIBLE_FLAGGED if cell.is_flagged() else VISIBLE_HIDDEN
@@ -0,0 +1,58 @@
+import math
+import os
+import tkinter as tk
+
+#Pillow is optional: it decodes JPEG and scales smoothly
+#without it only PNG/GIF tiles load and they are shrunk by integer steps
+try:
+    from PIL import Image, ImageTk
+except ImportError:
+    Image = None
+    ImageTk = None
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+IMAGE_DIR = os.path.join(PROJECT_ROOT, "image")
+
+#tile graphic name -> file in image/
+TILE_IMAGE_FILES = {
+    "mine": "bomb.jpeg",
+    "flag": "flag.png",
+}
+
+#Loads every tile graphic once at startup and pre-scales it for each tile size
+#All cells share the same PhotoImage objects
+class TileAtlas:
+    def __init__(self, root: tk.Misc, sizes: tuple[int, ...]):
+        self.root = root
+        self._images: dict[tuple[str, int], tk.PhotoImage] = {}
+
+        for name, filename in TILE_IMAGE_FILES.items():
+            path = os.path.join(IMAGE_DIR, filename)
+            for size in sizes:
+                try:
+                    image = self._load(path, size)
+                except (OSError, tk.TclError) as e:
+                    print(f"Could not load tile image {filename}: {e}")
+                    break
+                if image is not None:
+                    self._images[(name, size)] = image
+
+    #Shared image for a tile, or None if it couldn't be loaded (callers fall back to text)
+    def get(self, name: str, size: int) -> tk.PhotoImage | None:
+        return self._images.get((name, size))
+
+    def _load(self, path: str, size: int) -> tk.PhotoImage | None:
+        if Image is not None:
+            with Image.open(path) as source:
+                image = source.convert("RGBA")
+            image.thumbnail((size, size), Image.LANCZOS)
+            return ImageTk.PhotoImage(image, master=self.root)
+
+        #Tk can't decode JPEG on its own
+        if not path.lower().endswith((".png", ".gif")):
+            return None
+        image = tk.PhotoImage(master=self.root, file=path)
+        factor = math.ceil(max(image.width(), image.height()) / size)
+        if factor > 1:
+            image = image.subsample(factor)
+        return image
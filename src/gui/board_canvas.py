@@ -0,0 +1,175 @@
+import tkinter as tk
+from tkinter import ttk
+
+from src.gui.styles import BG_MAIN, BTN_BG, FG_TEXT, NUMBER_COLORS, TILE_FONT
+
+TILE_SIZE = 28 #pixels per cell
+TILE_IMAGE_SIZE = TILE_SIZE - 8 #flag/mine graphics
+
+#largest viewport before the board starts scrolling
+MAX_VIEW_WIDTH = 900
+MAX_VIEW_HEIGHT = 600
+
+#Scrollable board for boards too large for a grid of buttons
+#Only the cells inside the viewport own canvas items, and items that scroll
+#out of view are recycled for the cells that scroll in
+class BoardCanvas(tk.Frame):
+    def __init__(self, parent, board, tile_atlas, on_left_click, on_right_click, on_chord):
+        super().__init__(parent, bg=BG_MAIN)
+        self.board = board
+        self.tile_atlas = tile_atlas
+        self.on_left_click = on_left_click
+        self.on_right_click = on_right_click
+        self.on_chord = on_chord
+
+        #(row, col) -> (rect id, text id, image id) for the cells on screen
+        self._visible: dict[tuple[int, int], tuple[int, int, int]] = {}
+        #items that scrolled out of view, waiting to be reused
+        self._free: list[tuple[int, int, int]] = []
+
+        self.canvas = tk.Canvas(
+            self,
+            width=min(board.cols * TILE_SIZE, MAX_VIEW_WIDTH),
+            height=min(board.rows * TILE_SIZE, MAX_VIEW_HEIGHT),
+            bg=BG_MAIN,
+            highlightthickness=0,
+            xscrollincrement=TILE_SIZE,
+            yscrollincrement=TILE_SIZE,
+        )
+        x_scroll = ttk.Scrollbar(self, orient="horizontal", command=self._xview)
+        y_scroll = ttk.Scrollbar(self, orient="vertical", command=self._yview)
+        self.canvas.configure(
+            xscrollcommand=x_scroll.set,
+            yscrollcommand=y_scroll.set,
+            scrollregion=(0, 0, board.cols * TILE_SIZE, board.rows * TILE_SIZE),
+        )
+
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+
+        self.canvas.bind("<Button-1>", lambda e: self._on_click(e, self.on_left_click))
+        self.canvas.bind("<Button-3>", lambda e: self._on_click(e, self.on_right_click))
+        #MacOS registers right click as Button-2 on trackpad
+        self.canvas.bind("<Button-2>", lambda e: self._on_click(e, self.on_right_click))
+        self.canvas.bind("<Double-Button-1>", lambda e: self._on_click(e, self.on_chord))
+
+        #Mouse wheel (Windows/MacOS send MouseWheel, X11 sends Button-4/5)
+        self.canvas.bind("<MouseWheel>", lambda e: self._yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self._xview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self._yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self._yview("scroll", 1, "units"))
+        self.canvas.bind("<Configure>", lambda e: self._sync_viewport())
+
+        self._sync_viewport()
+
+    #Point the view at a new board with the same dimensions
+    #(the caller repaints with refresh())
+    def reset(self, board):
+        self.board = board
+
+    #Repaint the given cells if they are on screen, or every visible cell
+    def refresh(self, cells=None):
+        if cells is None:
+            for cell, items in self._visible.items():
+                self._paint(cell, items)
+            return
+        for cell in cells:
+            items = self._visible.get(cell)
+            if items is not None:
+                self._paint(cell, items)
+
+    def _xview(self, *args):
+        self.canvas.xview(*args)
+        self._sync_viewport()
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._sync_viewport()
+
+    def _on_click(self, event, callback):
+        col = int(self.canvas.canvasx(event.x) // TILE_SIZE)
+        row = int(self.canvas.canvasy(event.y) // TILE_SIZE)
+        if 0 <= row < self.board.rows and 0 <= col < self.board.cols:
+            callback(row, col, event)
+
+    #Work out which cells are in view, recycle the items that left it
+    #and place recycled (or new) items on the cells that entered it
+    def _sync_viewport(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            #not mapped yet, fall back to the requested size
+            width = int(self.canvas.cget("width"))
+            height = int(self.canvas.cget("height"))
+
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        first_col = max(0, int(x0 // TILE_SIZE))
+        first_row = max(0, int(y0 // TILE_SIZE))
+        last_col = min(self.board.cols, int((x0 + width) // TILE_SIZE) + 1)
+        last_row = min(self.board.rows, int((y0 + height) // TILE_SIZE) + 1)
+
+        wanted = {
+            (r, c)
+            for r in range(first_row, last_row)
+            for c in range(first_col, last_col)
+        }
+
+        for cell in [cell for cell in self._visible if cell not in wanted]:
+            self._free.append(self._visible.pop(cell))
+
+        for cell in wanted:
+            if cell in self._visible:
+                continue
+            if self._free:
+                items = self._free.pop()
+            else:
+                items = (
+                    self.canvas.create_rectangle(0, 0, 0, 0, outline=BG_MAIN),
+                    self.canvas.create_text(0, 0, font=TILE_FONT),
+                    self.canvas.create_image(0, 0),
+                )
+            r, c = cell
+            x, y = c * TILE_SIZE, r * TILE_SIZE
+            self.canvas.coords(items[0], x, y, x + TILE_SIZE - 1, y + TILE_SIZE - 1)
+            self.canvas.coords(items[1], x + TILE_SIZE // 2, y + TILE_SIZE // 2)
+            self.canvas.coords(items[2], x + TILE_SIZE // 2, y + TILE_SIZE // 2)
+            self._visible[cell] = items
+            self._paint(cell, items)
+
+        #hide leftovers so they don't show stale cells
+        for items in self._free:
+            for item in items:
+                self.canvas.itemconfigure(item, state="hidden")
+
+    def _paint(self, cell, items):
+        rect, text, image = items
+        r, c = cell
+        tile = self.board.grid[r][c]
+
+        graphic = None
+        if tile.is_flagged():
+            fill, label, color, graphic = BTN_BG, "🚩", "yellow", "flag"
+        elif tile.is_revealed():
+            if tile.is_mine:
+                fill, label, color, graphic = "white", "💣", "red", "mine"
+            elif tile.adjacent_mines > 0:
+                fill, label, color = "white", str(tile.adjacent_mines), NUMBER_COLORS[tile.adjacent_mines]
+            else:
+                fill, label, color = "white", "", FG_TEXT
+        else:
+            fill, label, color = BTN_BG, "", FG_TEXT
+
+        #shared atlas image when available, emoji otherwise
+        photo = self.tile_atlas.get(graphic, TILE_IMAGE_SIZE) if graphic else None
+        if photo is not None:
+            label = ""
+
+        self.canvas.itemconfigure(rect, fill=fill, state="normal")
+        self.canvas.itemconfigure(text, text=label, fill=color, state="normal")
+        self.canvas.itemconfigure(
+            image,
+            image=photo if photo is not None else "",
+            state="normal" if photo is not None else "hidden",
+        )
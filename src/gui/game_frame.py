@@ -1,8 +1,16 @@
+import os
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from src import metrics
 from src.game.game_state import GameStatus
-from src.gui.styles import BG_MAIN, BG_PANEL, FG_TEXT
+from src.gui.styles import BG_MAIN, BG_PANEL, FG_TEXT, TILE_IMAGE_SIZE
+from src.gui.board_canvas import BoardCanvas
+from src.gui.latency import InputLatencyTracker, OVERLAY_ENV_VAR
+
+#boards larger than this (in either direction) use the scrollable canvas view
+MAX_BUTTON_GRID = 30
 
 #The Game
 class GameFrame(tk.Frame):
@@ -13,6 +21,15 @@ class GameFrame(tk.Frame):
 
         self.board = game_state.board
         self.buttons: dict[tuple[int, int], ttk.Button] = {} #Buttons dict
+        self.board_view: BoardCanvas | None = None #virtualized view for large boards
+
+        #pending after_idle redraw, see schedule_redraw
+        self._redraw_id: str | None = None
+        self._full_redraw = False
+
+        #click-to-paint timing, shown in the debug overlay
+        self.latency = InputLatencyTracker()
+        self.latency_label = None
 
         #Bars containing buttons/information
         self.top_bar = None
@@ -20,7 +37,6 @@ class GameFrame(tk.Frame):
         self.board_frame = None
 
         self._build_ui()
-        self.after(100, self._update_timer)
 
     #Game Frame UI
     def _build_ui(self):
@@ -28,13 +44,14 @@ class GameFrame(tk.Frame):
         self.top_bar.pack(side="top", fill="x", pady=5)
 
         #Labels for difficulty, Timer, Mines, Flags, Hints
-        tk.Label(
+        self.top_bar.difficulty_label = tk.Label(
             self.top_bar,
             text=f'Difficulty: {self.board.difficulty_name}',
             font=("Helvetica", 11, "bold"),
             bg=BG_PANEL,
             fg=FG_TEXT,
-        ).pack(side="left", padx=10)
+        )
+        self.top_bar.difficulty_label.pack(side="left", padx=10)
 
         self.top_bar.timer_label = tk.Label(self.top_bar, text="Time: 0.0 s", bg=BG_PANEL, fg=FG_TEXT)
         self.top_bar.timer_label.pack(side="left", padx=15)
@@ -60,6 +77,45 @@ class GameFrame(tk.Frame):
         )
 
         #GAME BOARD
+        if self.board.rows > MAX_BUTTON_GRID or self.board.cols > MAX_BUTTON_GRID:
+            self.board_view = BoardCanvas(
+                self,
+                self.board,
+                tile_atlas=self.controller.tile_atlas,
+                on_left_click=self._on_left_click,
+                on_right_click=self._on_right_click,
+                on_chord=self._on_chord,
+            )
+            self.board_view.pack(padx=10, pady=10)
+        else:
+            self._build_button_grid()
+
+        #Bottom Bar
+        self.bottom_bar = tk.Frame(self, bg=BG_MAIN)
+        self.bottom_bar.pack(side="bottom", fill="x", pady=5)
+
+        ttk.Button(
+            self.bottom_bar,
+            text="Main Menu",
+            command=self._on_main_menu,
+            style="Menu.TButton",
+        ).pack(side="left", padx=10)
+
+        ttk.Button(
+            self.bottom_bar,
+            text="Restart",
+            command=self._on_restart,
+            style="Menu.TButton",
+        ).pack(side="right", padx=10)
+
+        #debug overlay with the rolling latency summary (F3)
+        self.latency_label = tk.Label(self.bottom_bar, text="", bg=BG_MAIN, fg="#888888", font=("Courier", 9))
+        if os.environ.get(OVERLAY_ENV_VAR):
+            self.latency_label.pack(side="left", padx=10)
+
+        self._refresh_board(full=True)
+
+    def _build_button_grid(self):
         self.board_frame = tk.Frame(self)
         self.board_frame.pack(padx=10, pady=10)
 
@@ -69,66 +125,122 @@ class GameFrame(tk.Frame):
                     self.board_frame,
                     width=4,
                     style="Tile.TButton",
+                    compound="center", #keep the size fixed when a graphic is shown
                 )
                 btn.grid(row=r, column=c, ipady=6)
 
-                btn.bind("<Button-1>", lambda e, row=r, col=c: self._on_left_click(row, col))
-                btn.bind("<Button-3>", lambda e, row=r, col=c: self._on_right_click(row, col))
+                btn.bind("<Button-1>", lambda e, row=r, col=c: self._on_left_click(row, col, e))
+                btn.bind("<Button-3>", lambda e, row=r, col=c: self._on_right_click(row, col, e))
 
                 #MacOS registers right click as Button-2 on trackpad
                 #Include for cross OS support
-                btn.bind("<Button-2>", lambda e, row=r, col=c: self._on_right_click(row, col))
+                btn.bind("<Button-2>", lambda e, row=r, col=c: self._on_right_click(row, col, e))
+
+                #Chord on double click (middle click is taken by the Mac binding above)
+                btn.bind("<Double-Button-1>", lambda e, row=r, col=c: self._on_chord(row, col, e))
                 self.buttons[(r, c)] = btn
 
-        #Bottom Bar
-        self.bottom_bar = tk.Frame(self, bg=BG_MAIN)
-        self.bottom_bar.pack(side="bottom", fill="x", pady=5)
+    #Reuse the existing buttons for a new game with the same dimensions
+    def fits(self, game_state) -> bool:
+        board = game_state.board
+        return board.rows == self.board.rows and board.cols == self.board.cols
 
-        ttk.Button(
-            self.bottom_bar,
-            text="Main Menu",
-            command=self._on_main_menu,
-            style="Menu.TButton",
-        ).pack(side="left", padx=10)
+    def reset(self, game_state):
+        self.game_state = game_state
+        self.board = game_state.board
+        self.top_bar.difficulty_label.config(text=f'Difficulty: {self.board.difficulty_name}')
+        if self.board_view is not None:
+            self.board_view.reset(self.board)
+        self.schedule_redraw(full=True)
 
-        ttk.Button(
-            self.bottom_bar,
-            text="Restart",
-            command=self._on_restart,
-            style="Menu.TButton",
-        ).pack(side="right", padx=10)
+    #the controller owns the timer callback, stop it with the frame
+    def destroy(self):
+        self.controller.cancel_timer()
+        if self._redraw_id is not None:
+            self.after_cancel(self._redraw_id)
+            self._redraw_id = None
+        self.latency.close()
+        super().destroy()
 
-        self._refresh_board()
+    #Mark the view stale and paint once when Tk goes idle, so a burst of
+    #clicks, hints and timer ticks is merged into a single redraw
+    def schedule_redraw(self, full: bool = False):
+        self._full_redraw = self._full_redraw or full
+        if self._redraw_id is None:
+            self._redraw_id = self.after_idle(self._flush_redraw)
+
+    def _flush_redraw(self):
+        full = self._full_redraw
+        self._redraw_id = None
+        self._full_redraw = False
+        render_start = time.perf_counter()
+        self._refresh_board(full=full)
+        self.update_timer()
+
+        #input-driven redraw: let Tk paint now so the timing covers it
+        if self.latency.has_pending:
+            self.update_idletasks()
+            self.latency.paint_done(render_start)
+            if self.latency_label.winfo_manager():
+                self.latency_label.config(text=self.latency.summary())
+
+    def toggle_latency_overlay(self):
+        if self.latency_label.winfo_manager():
+            self.latency_label.pack_forget()
+        else:
+            self.latency_label.config(text=self.latency.summary())
+            self.latency_label.pack(side="left", padx=10)
 
     # Event Handlers
-    def _on_left_click(self, row: int, col: int):
+    def _on_left_click(self, row: int, col: int, event=None):
         if self.game_state.status not in (GameStatus.NOT_STARTED, GameStatus.PLAYING):
             return
 
+        sample = self.latency.begin(event, "reveal")
         self.game_state.click_cell(row, col)
-        self._refresh_board()
+        self.latency.engine_done(sample)
 
         if self.game_state.status in (GameStatus.WON, GameStatus.LOST):
-            self._refresh_board()
+            self.schedule_redraw(full=True)
             self.controller.on_game_finished()
+        else:
+            self.schedule_redraw()
 
-    def _on_right_click(self, row: int, col: int):
+    def _on_right_click(self, row: int, col: int, event=None):
         if self.game_state.status != GameStatus.PLAYING:
             return
+        sample = self.latency.begin(event, "flag")
         self.game_state.flag_cell(row, col)
-        self._refresh_board()
+        self.latency.engine_done(sample)
+        self.schedule_redraw()
+
+    def _on_chord(self, row: int, col: int, event=None):
+        if self.game_state.status != GameStatus.PLAYING:
+            return
+        sample = self.latency.begin(event, "chord")
+        self.game_state.chord_cell(row, col)
+        self.latency.engine_done(sample)
+
+        if self.game_state.status in (GameStatus.WON, GameStatus.LOST):
+            self.schedule_redraw(full=True)
+            self.controller.on_game_finished()
+        else:
+            self.schedule_redraw()
 
     def _on_hint(self):
         if self.game_state.status != GameStatus.PLAYING:
             return
+        sample = self.latency.begin(None, "hint")
         used = self.game_state.use_hint()
+        self.latency.engine_done(sample)
         if not used:
             messagebox.showinfo("Hint", "No hints available.")
-        self._refresh_board()
 
         if self.game_state.status is GameStatus.WON:
-            self._refresh_board()
+            self.schedule_redraw(full=True)
             self.controller.on_game_finished()
+        else:
+            self.schedule_redraw()
 
     def _on_main_menu(self):
         if self.game_state.status == GameStatus.PLAYING:
@@ -143,8 +255,10 @@ class GameFrame(tk.Frame):
     def _on_restart(self):
         self.controller.start_new_game(self.game_state.difficulty)
 
-    #Fully refresh board on every event
-    def _refresh_board(self):
+    #Redraw only the cells the board marked dirty
+    #full=True redraws every cell (initial build and game over)
+    @metrics.timed("gui.refresh_board")
+    def _refresh_board(self, full: bool = False):
         if self.top_bar.mines_label is not None:
             self.top_bar.mines_label.config(
                 text=f"Mines: {self.board.num_mines}   Flags: {self.board.flags_placed}"
@@ -154,31 +268,51 @@ class GameFrame(tk.Frame):
                 text=f"Hints: {self.game_state.hints_used}/{self.game_state.max_hints}"
             )
 
-        for (r, c), btn in self.buttons.items():
-            cell = self.board.grid[r][c]
+        dirty = self.board.pop_dirty_cells()
+        if self.board_view is not None:
+            self.board_view.refresh(None if full else dirty)
+            return
+
+        cells = self.buttons.keys() if full else dirty
+        for r, c in cells:
+            self._draw_cell(r, c)
 
-            if cell.is_flagged():
-                btn.configure(text="🚩", style="TileFlagged.TButton")
-            elif cell.is_revealed():
-                btn.state(["disabled"]) #disable button on reveal
-                if cell.is_mine:
-                    btn.configure(text="💣", style="TileMine.TButton")
-                #logic for cells with adjacent mines
-                else:
-                    if cell.adjacent_mines > 0:
-                        btn.configure(
-                            text=str(cell.adjacent_mines),
-                            style=f"TileNum{cell.adjacent_mines}.TButton",
-                        )
-                    else:
-                        btn.configure(text="", style="TileRevealed.TButton")
-            #Regular tiles remain blank
+    def _draw_cell(self, r: int, c: int):
+        btn = self.buttons[(r, c)]
+        cell = self.board.grid[r][c]
+
+        if cell.is_flagged():
+            btn.state(["!disabled"])
+            self._set_tile_graphic(btn, "flag", "🚩", "TileFlagged.TButton")
+        elif cell.is_revealed():
+            btn.state(["disabled"]) #disable button on reveal
+            if cell.is_mine:
+                self._set_tile_graphic(btn, "mine", "💣", "TileMine.TButton")
+            #logic for cells with adjacent mines
             else:
-                btn.configure(text="", style="Tile.TButton")
+                if cell.adjacent_mines > 0:
+                    btn.configure(
+                        text=str(cell.adjacent_mines),
+                        image="",
+                        style=f"TileNum{cell.adjacent_mines}.TButton",
+                    )
+                else:
+                    btn.configure(text="", image="", style="TileRevealed.TButton")
+        #Regular tiles remain blank
+        else:
+            btn.state(["!disabled"]) #buttons are reused across restarts
+            btn.configure(text="", image="", style="Tile.TButton")
+
+    #Shared image from the app's tile atlas, or the emoji if it isn't available
+    def _set_tile_graphic(self, btn, name: str, emoji: str, style: str):
+        image = self.controller.tile_atlas.get(name, TILE_IMAGE_SIZE)
+        if image is None:
+            btn.configure(text=emoji, image="", style=style)
+        else:
+            btn.configure(text="", image=image, style=style)
 
-    # Auto Timer update logic
-    def _update_timer(self):
+    # Timer label, painted with each redraw
+    def update_timer(self):
         if self.top_bar.timer_label is not None:
             elapsed = self.game_state.get_elapsed_time()
             self.top_bar.timer_label.config(text=f"Time: {elapsed:.1f} s")
-        self.after(200, self._update_timer)
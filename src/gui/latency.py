@@ -0,0 +1,109 @@
+import os
+import time
+from collections import deque
+
+from src import metrics
+
+#set to a file path to append one CSV line per input event
+LOG_ENV_VAR = "MINESWEEPER_LATENCY_LOG"
+#set to show the overlay from the start (F3 toggles it in game)
+OVERLAY_ENV_VAR = "MINESWEEPER_LATENCY_OVERLAY"
+
+LOG_HEADER = "kind,queue_ms,engine_ms,render_ms,total_ms\n"
+
+#One input event on its way to the screen
+class LatencySample:
+    __slots__ = ("kind", "queue_ms", "handler_start", "engine_ms", "render_ms", "total_ms")
+
+    def __init__(self, kind: str, queue_ms: float, handler_start: float):
+        self.kind = kind
+        self.queue_ms = queue_ms #Tk event timestamp -> handler start
+        self.handler_start = handler_start
+        self.engine_ms = 0.0 #GameState call
+        self.render_ms = 0.0 #redraw that showed the result
+        self.total_ms = 0.0 #event timestamp -> redraw finished
+
+#Measures each input from its Tk event timestamp to the end of the redraw
+#that shows it, split into queueing, engine and render time
+#
+#Tk event times are in ms on the windowing system's clock, so they are
+#compared to ours through an offset: the smallest (now - event.time) seen
+#is taken as zero delay, and later events are measured against it
+class InputLatencyTracker:
+    def __init__(self, window: int = 200, log_path: str | None = None):
+        self.recent: deque[LatencySample] = deque(maxlen=window)
+        self._pending: list[LatencySample] = [] #waiting for the next redraw
+        self._clock_offset: float | None = None
+        self._log_path = log_path if log_path is not None else os.environ.get(LOG_ENV_VAR)
+        self._log = None
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    #call first thing in an input handler (event is None for button commands)
+    def begin(self, event, kind: str) -> LatencySample:
+        now = time.perf_counter()
+        queue_ms = 0.0
+        event_time = getattr(event, "time", None)
+        if isinstance(event_time, int) and event_time > 0:
+            offset = now * 1000 - event_time
+            if self._clock_offset is None or offset < self._clock_offset:
+                self._clock_offset = offset
+            queue_ms = offset - self._clock_offset
+        sample = LatencySample(kind, queue_ms, now)
+        self._pending.append(sample)
+        return sample
+
+    #call right after the GameState call returns
+    def engine_done(self, sample: LatencySample):
+        sample.engine_ms = (time.perf_counter() - sample.handler_start) * 1000
+
+    #call once the redraw finished; completes every sample it covered
+    def paint_done(self, render_start: float):
+        now = time.perf_counter()
+        render_ms = (now - render_start) * 1000
+        for sample in self._pending:
+            sample.render_ms = render_ms
+            sample.total_ms = sample.queue_ms + (now - sample.handler_start) * 1000
+            self.recent.append(sample)
+            self._write(sample)
+            if metrics.ENABLED:
+                metrics.observe("gui.input_to_paint", sample.total_ms)
+        self._pending.clear()
+
+    #rolling p50/p95 over the last `window` events
+    def summary(self) -> str:
+        if not self.recent:
+            return "input->paint: no samples yet"
+
+        def pct(values, p):
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+        total = [s.total_ms for s in self.recent]
+        engine = [s.engine_ms for s in self.recent]
+        render = [s.render_ms for s in self.recent]
+        queue = [s.queue_ms for s in self.recent]
+        return (
+            f"input->paint p50 {pct(total, 50):.1f} / p95 {pct(total, 95):.1f} ms | "
+            f"queue {pct(queue, 50):.1f}  engine {pct(engine, 50):.1f}  render {pct(render, 50):.1f} ms (p50)"
+        )
+
+    def _write(self, sample: LatencySample):
+        if not self._log_path:
+            return
+        if self._log is None:
+            is_new = not os.path.exists(self._log_path)
+            self._log = open(self._log_path, "a", encoding="utf-8", buffering=1)
+            if is_new:
+                self._log.write(LOG_HEADER)
+        self._log.write(
+            f"{sample.kind},{sample.queue_ms:.3f},{sample.engine_ms:.3f},"
+            f"{sample.render_ms:.3f},{sample.total_ms:.3f}\n"
+        )
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
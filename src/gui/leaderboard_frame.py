@@ -0,0 +1,109 @@
+import tkinter as tk
+from tkinter import ttk
+
+from src.game.board import Difficulty
+from src.gui.styles import BG_MAIN, FG_TEXT
+from src import leaderboard
+
+PAGE_SIZE = 10
+
+#Top players across all users, one page at a time
+class LeaderboardFrame(tk.Frame):
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg=BG_MAIN)
+        self.controller = controller
+
+        #cursor that starts each page we've visited, for the Prev button
+        self._cursors: list = [None]
+        self._next_cursor = None
+
+        tk.Label(self, text="Leaderboard", font=("Helvetica", 18, "bold")).pack(pady=15)
+
+        options = tk.Frame(self, bg=BG_MAIN)
+        options.pack(pady=5)
+
+        self.difficulty_var = tk.StringVar(value=Difficulty.BEGINNER["name"])
+        ttk.Combobox(
+            options,
+            textvariable=self.difficulty_var,
+            values=[diff["name"] for diff in Difficulty.get_all()],
+            state="readonly",
+            width=14,
+        ).pack(side="left", padx=10)
+        self.difficulty_var.trace_add("write", lambda *args: self.refresh())
+
+        #rank by best time or best score
+        self.metric_var = tk.StringVar(value="time")
+        for text, value in (("Best time", "time"), ("Best score", "score")):
+            tk.Radiobutton(
+                options,
+                text=text,
+                variable=self.metric_var,
+                value=value,
+                command=self.refresh,
+                bg=BG_MAIN,
+                fg=FG_TEXT,
+                activebackground=BG_MAIN,
+                activeforeground=FG_TEXT,
+                selectcolor=BG_MAIN,
+            ).pack(side="left", padx=5)
+
+        self.table_label = tk.Label(self, text="", justify="left", font=("Courier", 10))
+        self.table_label.pack(padx=20, pady=10)
+
+        button_bar = tk.Frame(self, bg=BG_MAIN)
+        button_bar.pack(pady=10)
+
+        ttk.Button(
+            button_bar,
+            text="Back to Main Menu",
+            command=lambda: self.controller.show_frame("menu"),
+            style="Menu.TButton",
+        ).pack(side="left", padx=10)
+
+        self.prev_button = ttk.Button(button_bar, text="Prev", command=self._prev_page, style="Menu.TButton")
+        self.prev_button.pack(side="left", padx=10)
+
+        self.next_button = ttk.Button(button_bar, text="Next", command=self._next_page, style="Menu.TButton")
+        self.next_button.pack(side="left", padx=10)
+
+    #start over at the first page
+    def refresh(self):
+        self._cursors = [None]
+        self._load_page()
+
+    def _next_page(self):
+        if self._next_cursor is None:
+            return
+        self._cursors.append(self._next_cursor)
+        self._load_page()
+
+    def _prev_page(self):
+        if len(self._cursors) <= 1:
+            return
+        self._cursors.pop()
+        self._load_page()
+
+    def _load_page(self):
+        metric = self.metric_var.get()
+        page = leaderboard.top_users(
+            self.controller.db,
+            self.difficulty_var.get(),
+            metric=metric,
+            limit=PAGE_SIZE,
+            after=self._cursors[-1],
+        )
+        self._next_cursor = page.next_cursor
+
+        first_rank = (len(self._cursors) - 1) * PAGE_SIZE + 1
+        lines = [f"{'#':>4}  {'Player':<16} {'Time':>8} {'Score':>7}"]
+        for rank, entry in enumerate(page.entries, start=first_rank):
+            time_text = f"{entry.best_time:.1f} s" if entry.best_time is not None else "-"
+            score_text = str(entry.best_score) if entry.best_score is not None else "-"
+            lines.append(f"{rank:>4}  {entry.name[:16]:<16} {time_text:>8} {score_text:>7}")
+        if not page.entries:
+            lines.append("  No recorded wins yet.")
+
+        self.table_label.config(text="\n".join(lines))
+        self.prev_button.state(["!disabled"] if len(self._cursors) > 1 else ["disabled"])
+        self.next_button.state(["!disabled"] if page.next_cursor is not None else ["disabled"])
@@ -1,9 +1,14 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog, simpledialog
 
 from src.game.board import Difficulty
+from src.game.puzzle_pack import PUZZLE_DIFFICULTY_NAME
 from src.gui.styles import BG_MAIN, BG_PANEL, FG_TEXT
 
+#custom board size limits, boards above 30 cells use the scrollable view
+MIN_CUSTOM_SIZE = 5
+MAX_CUSTOM_SIZE = 1000
+
 
 class MainMenuFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -45,6 +50,21 @@ class MainMenuFrame(tk.Frame):
                 selectcolor=BG_PANEL,
             ).pack(fill="x", padx=40, pady=2)
 
+        #fixed layouts loaded from a puzzle pack file
+        tk.Radiobutton(
+            self,
+            text=f"{PUZZLE_DIFFICULTY_NAME} (fixed boards from a file)",
+            variable=self.difficulty_var,
+            value=PUZZLE_DIFFICULTY_NAME,
+            anchor="w",
+            justify="left",
+            bg=BG_MAIN,
+            fg=FG_TEXT,
+            activebackground=BG_MAIN,
+            activeforeground=FG_TEXT,
+            selectcolor=BG_PANEL,
+        ).pack(fill="x", padx=40, pady=2)
+
         #Main Menu Buttons
         ttk.Button(
             self,
@@ -62,6 +82,14 @@ class MainMenuFrame(tk.Frame):
             style="Menu.TButton",
         ).pack(pady=5)
 
+        ttk.Button(
+            self,
+            text="Leaderboard",
+            width=18,
+            command=controller.show_leaderboard,
+            style="Menu.TButton",
+        ).pack(pady=5)
+
         ttk.Button(
             self,
             text="Quit",
@@ -73,6 +101,12 @@ class MainMenuFrame(tk.Frame):
     def _on_start(self):
         #Get Var from RadioButton
         selected_name = self.difficulty_var.get()
+
+        if selected_name == PUZZLE_DIFFICULTY_NAME:
+            puzzle = self._choose_puzzle()
+            if puzzle is not None:
+                self.controller.start_new_game(puzzle.difficulty)
+            return
         
         #Ensure that a difficulty is selected
         selected_diff = None
@@ -92,6 +126,47 @@ class MainMenuFrame(tk.Frame):
         else:
             self.controller.start_new_game(selected_diff)
 
+    #Pick a pack file, then a puzzle number (blank for a random one)
+    def _choose_puzzle(self):
+        path = filedialog.askopenfilename(
+            parent=self.controller,
+            title="Open puzzle pack",
+            filetypes=[("Puzzle packs", "*.mspk"), ("All files", "*")],
+        )
+        if not path:
+            return None
+        try:
+            pack = self.controller.open_puzzle_pack(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Puzzle pack", f"Could not open puzzle pack:\n\n{e}")
+            return None
+        if len(pack) == 0:
+            messagebox.showerror("Puzzle pack", "This puzzle pack is empty.")
+            return None
+
+        answer = simpledialog.askstring(
+            "Puzzle pack",
+            f"Puzzle number (1-{len(pack)}), or leave blank for a random one:",
+            parent=self.controller,
+        )
+        if answer is None:
+            return None
+        number = None
+        if answer.strip():
+            try:
+                number = int(answer)
+            except ValueError:
+                number = 0
+            if not 1 <= number <= len(pack):
+                messagebox.showerror("Puzzle pack", f"Please enter a number between 1 and {len(pack)}.")
+                return None
+        #a damaged pack can open fine and still have bad records
+        try:
+            return pack.random() if number is None else pack[number - 1]
+        except ValueError as e:
+            messagebox.showerror("Puzzle pack", f"Could not load the puzzle:\n\n{e}")
+            return None
+
     def _show_custom_dialog(self):
         dialog = tk.Toplevel(self.controller)
         dialog.title("Custom Difficulty")
@@ -110,14 +185,14 @@ class MainMenuFrame(tk.Frame):
             fg=FG_TEXT,
         ).grid(row=0, column=0, columnspan=2, pady=(15, 10), padx=20)
 
-        tk.Label(dialog, text="Rows (5-30):", bg=BG_PANEL, fg=FG_TEXT).grid(
+        tk.Label(dialog, text=f"Rows ({MIN_CUSTOM_SIZE}-{MAX_CUSTOM_SIZE}):", bg=BG_PANEL, fg=FG_TEXT).grid(
             row=1, column=0, sticky="e", padx=(20, 5), pady=5
         )
         rows_entry = tk.Entry(dialog, width=10)
         rows_entry.insert(0, "10")
         rows_entry.grid(row=1, column=1, sticky="w", padx=(5, 20), pady=5)
 
-        tk.Label(dialog, text="Columns (5-30):", bg=BG_PANEL, fg=FG_TEXT).grid(
+        tk.Label(dialog, text=f"Columns ({MIN_CUSTOM_SIZE}-{MAX_CUSTOM_SIZE}):", bg=BG_PANEL, fg=FG_TEXT).grid(
             row=2, column=0, sticky="e", padx=(20, 5), pady=5
         )
         cols_entry = tk.Entry(dialog, width=10)
@@ -140,11 +215,11 @@ class MainMenuFrame(tk.Frame):
                 cols = int(cols_entry.get())
                 mines = int(mines_entry.get())
 
-                if not (5 <= rows <= 30):
-                    error_label.config(text="Rows must be between 5 and 30")
+                if not (MIN_CUSTOM_SIZE <= rows <= MAX_CUSTOM_SIZE):
+                    error_label.config(text=f"Rows must be between {MIN_CUSTOM_SIZE} and {MAX_CUSTOM_SIZE}")
                     return
-                if not (5 <= cols <= 30):
-                    error_label.config(text="Columns must be between 5 and 30")
+                if not (MIN_CUSTOM_SIZE <= cols <= MAX_CUSTOM_SIZE):
+                    error_label.config(text=f"Columns must be between {MIN_CUSTOM_SIZE} and {MAX_CUSTOM_SIZE}")
                     return
                 if mines < 1:
                     error_label.config(text="Must have at least 1 mine")
@@ -2,7 +2,6 @@ import tkinter as tk
 from tkinter import ttk
 
 from src.gui.styles import BG_MAIN
-from src.db import UserDifficultyStat
 
 class StatsFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -64,21 +63,33 @@ class StatsFrame(tk.Frame):
         else:
             lines.append("No games played yet this session.")
         
-        # --- Overall best (all sessions for this user) ---
+        # --- All sessions for this user ---
         user = self.controller.current_user
         if user is not None:
-            # refresh relationship from DB in case it changed
-            self.controller.db.refresh(user)
+            # one query on the (user_id, difficulty) index; the aggregate rows
+            # are kept current by the stats writer, so no history scan
+            UserDifficultyStat = self.controller.database.module().UserDifficultyStat
+            all_stats = (
+                self.controller.db.query(UserDifficultyStat)
+                .filter_by(user_id=user.id)
+                .order_by(UserDifficultyStat.difficulty)
+                .populate_existing()
+                .all()
+            )
 
             # per difficulty and overall
             lines.append("")
-            lines.append(f"Overall best times for '{user.name}' (all sessions):")
+            lines.append(f"All sessions for '{user.name}':")
             overall_best = None
 
-            for stat in user.stats:
+            for stat in all_stats:
+                lines.append(f"  {stat.difficulty}:")
+                lines.append(f"    Played: {stat.games_played}, Won: {stat.games_won}")
+                if stat.games_played > 0:
+                    lines.append(f"    Avg time  : {stat.total_time / stat.games_played:.1f} s")
                 if stat.best_time is not None:
                     lines.append(
-                        f"  {stat.difficulty}: {stat.best_time:.1f} s (best score: {stat.best_score})"
+                        f"    Best time : {stat.best_time:.1f} s (best score: {stat.best_score})"
                     )
                     if overall_best is None or stat.best_time < overall_best:
                         overall_best = stat.best_time
@@ -21,6 +21,7 @@ NUMBER_COLORS = {
 }
 
 TILE_FONT = ('Arial', 11, 'bold')
+TILE_IMAGE_SIZE = 18 # pixels, flag/mine graphics on tile buttons
 
 #streamline styles
 class style:
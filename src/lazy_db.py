@@ -0,0 +1,61 @@
+"""Imports the ORM layer and checks the schema off the Tk thread."""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from src.startup import StartupTimer
+
+
+class DeferredDatabase:
+    """
+    Loads src.db (SQLAlchemy, engine, create_all) on a background thread so
+    the window can be shown first. Callers block in module() only when they
+    actually need the database.
+
+    loader replaces the import + schema check (tests use it to stay off the
+    real database file).
+    """
+
+    def __init__(self, timer: Optional[StartupTimer] = None, loader: Optional[Callable] = None):
+        self.timer = timer if timer is not None else StartupTimer()
+        self._loader = loader if loader is not None else self._load_db
+        self._future: Future = Future()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Starts loading in the background (no-op if already started)."""
+        # module() may be called from several threads at once
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name="db-init", daemon=True)
+                self._thread.start()
+
+    def _load_db(self):
+        with self.timer.phase("import sqlalchemy/db"):
+            import src.db as db
+        with self.timer.phase("schema check"):
+            db.init_db()
+        return db
+
+    def _load(self):
+        try:
+            db = self._loader()
+        except BaseException as e:
+            self._future.set_exception(e)
+        else:
+            self._future.set_result(db)
+
+    def module(self):
+        """Returns the loaded src.db module, waiting for it if needed."""
+        self.start()
+        # the startup report is about the Tk thread; background users such
+        # as the stats writer waiting here don't delay the window
+        if not self._future.done() and threading.current_thread() is threading.main_thread():
+            with self.timer.phase("waiting for db"):
+                return self._future.result()
+        return self._future.result()
+
+    def session(self):
+        """Creates a new ORM session."""
+        return self.module().SessionLocal()
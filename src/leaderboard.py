@@ -0,0 +1,114 @@
+"""Cross-user leaderboard queries with keyset pagination and a small cache."""
+import threading
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+# metric -> sort direction; time ranks low-to-high, score high-to-low
+METRICS = ("time", "score")
+
+# (metric value, user_id) of the last row on a page
+Cursor = Tuple[float, int]
+
+
+class LeaderboardEntry(NamedTuple):
+    user_id: int
+    name: str
+    best_time: Optional[float]
+    best_score: Optional[int]
+
+
+class LeaderboardPage(NamedTuple):
+    entries: List[LeaderboardEntry]
+    next_cursor: Optional[Cursor]  # None on the last page
+
+
+class LeaderboardCache:
+    """Small LRU of leaderboard pages, invalidated per difficulty on writes."""
+
+    def __init__(self, max_pages: int = 128):
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[tuple, LeaderboardPage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[LeaderboardPage]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            return page
+
+    def put(self, key: tuple, page: LeaderboardPage):
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def invalidate(self, difficulty: Optional[str] = None):
+        """Drops cached pages for one difficulty, or all of them."""
+        with self._lock:
+            if difficulty is None:
+                self._pages.clear()
+                return
+            for key in [k for k in self._pages if k[0] == difficulty]:
+                del self._pages[key]
+
+
+# shared by the GUI (reads) and the stats writer (invalidation)
+cache = LeaderboardCache()
+
+
+def top_users(session, difficulty: str, metric: str = "time", limit: int = 10,
+              after: Optional[Cursor] = None, use_cache: bool = True) -> LeaderboardPage:
+    """
+    Returns one page of the top users for a difficulty, ranked by best time
+    (ascending) or best score (descending). Pass the previous page's
+    next_cursor as `after` to get the following page.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+
+    key = (difficulty, metric, limit, after)
+    if use_cache:
+        page = cache.get(key)
+        if page is not None:
+            return page
+
+    from src.db import User, UserDifficultyStat
+
+    stat = UserDifficultyStat
+    query = session.query(stat.user_id, User.name, stat.best_time, stat.best_score).join(
+        User, User.id == stat.user_id
+    ).filter(stat.difficulty == difficulty)
+
+    # keyset pagination: seek past the last row instead of OFFSET, so every
+    # page is a short range scan of the leaderboard index
+    if metric == "time":
+        query = query.filter(stat.best_time.isnot(None))
+        if after is not None:
+            value, user_id = after
+            query = query.filter(
+                (stat.best_time > value) | ((stat.best_time == value) & (stat.user_id > user_id))
+            )
+        query = query.order_by(stat.best_time, stat.user_id)
+    else:
+        query = query.filter(stat.best_score.isnot(None))
+        if after is not None:
+            value, user_id = after
+            query = query.filter(
+                (stat.best_score < value) | ((stat.best_score == value) & (stat.user_id < user_id))
+            )
+        query = query.order_by(stat.best_score.desc(), stat.user_id.desc())
+
+    rows = query.limit(limit + 1).all()
+    entries = [LeaderboardEntry(*row) for row in rows[:limit]]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = entries[-1]
+        next_cursor = (last.best_time if metric == "time" else last.best_score, last.user_id)
+
+    page = LeaderboardPage(entries, next_cursor)
+    if use_cache:
+        cache.put(key, page)
+    return page
@@ -0,0 +1,151 @@
+"""
+Lightweight counters, timers and latency histograms for hot paths.
+
+Off unless MINESWEEPER_METRICS is set. Its value is the file the summary
+(count, p50/p95/p99, max per timer) is written to on exit; "1" means
+metrics.txt in the working directory. When off, `timed` hands back the
+undecorated function and inline hooks are guarded by `ENABLED`, so the
+cost is a global lookup.
+"""
+import atexit
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+ENV_VAR = "MINESWEEPER_METRICS"
+DEFAULT_PATH = "metrics.txt"
+
+ENABLED = bool(os.environ.get(ENV_VAR))
+
+
+class Histogram:
+    """Keeps count/total/min/max plus a bounded random sample for percentiles."""
+
+    def __init__(self, max_samples: int = 10_000):
+        self.max_samples = max_samples
+        self.samples: List[float] = []
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        # reservoir sampling keeps memory bounded on long sessions
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            i = random.randrange(self.count)
+            if i < self.max_samples:
+                self.samples[i] = value
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        # nearest-rank percentile
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class Registry:
+    """Named counters and histograms, safe to update from several threads."""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Records the duration of a with-block in milliseconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def summary(self) -> str:
+        with self._lock:
+            lines = [f"{'name':<32} {'count':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}"]
+            for name in sorted(self.histograms):
+                h = self.histograms[name]
+                lines.append(
+                    f"{name:<32} {h.count:>8} {h.percentile(50):>10.3f} {h.percentile(95):>10.3f} "
+                    f"{h.percentile(99):>10.3f} {h.max:>10.3f}"
+                )
+            if self.counters:
+                lines.append("")
+                for name in sorted(self.counters):
+                    lines.append(f"{name:<32} {self.counters[name]:>8}")
+        return "\n".join(lines)
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.summary() + "\n")
+
+
+registry = Registry()
+
+
+def incr(name: str, amount: int = 1):
+    if ENABLED:
+        registry.incr(name, amount)
+
+
+def observe(name: str, value: float):
+    if ENABLED:
+        registry.observe(name, value)
+
+
+def timer(name: str):
+    """Context manager timing a block (ms); a no-op when metrics are off."""
+    return registry.timer(name) if ENABLED else nullcontext()
+
+
+def timed(name: str):
+    """Decorator timing every call (ms); returns the function untouched when off."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(name, (time.perf_counter() - start) * 1000)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+    return decorate
+
+
+def _dump_on_exit():
+    value = os.environ.get(ENV_VAR, "")
+    registry.dump(DEFAULT_PATH if value == "1" else value)
+
+
+if ENABLED:
+    atexit.register(_dump_on_exit)
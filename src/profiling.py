@@ -0,0 +1,92 @@
+"""
+On-demand profile capture for a running game.
+
+Toggling on starts cProfile on the calling (Tk) thread and a sampling thread
+that records that thread's stack every few milliseconds. Toggling off writes
+a timestamped .pstats file (for pstats/snakeviz) and a .folded file of
+collapsed stacks ("outer;inner;leaf count", for flamegraph tools).
+"""
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.path.join(PROJECT_ROOT, "profiles")
+
+
+class ProfileCapture:
+    """Start/stop profiler for one thread (the one that calls start())."""
+
+    def __init__(self, output_dir: str = PROFILE_DIR, interval: float = 0.005):
+        self.output_dir = output_dir
+        self.interval = interval
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        self._stacks: Counter = Counter()
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def toggle(self) -> Optional[Tuple[str, str]]:
+        """Starts a capture, or stops it and returns the written file paths."""
+        if self.active:
+            return self.stop()
+        self.start()
+        return None
+
+    def start(self):
+        if self.active:
+            return
+        self._stacks = Counter()
+        self._stop_sampling.clear()
+        target = threading.get_ident()
+        self._sampler = threading.Thread(
+            target=self._sample, args=(target,), name="profile-sampler", daemon=True
+        )
+        self._sampler.start()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> Tuple[str, str]:
+        """Stops the capture and writes <stamp>.pstats and <stamp>.folded."""
+        if not self.active:
+            raise RuntimeError("No profile capture is running")
+        self._profile.disable()
+        self._stop_sampling.set()
+        self._sampler.join()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        # milliseconds and the pid keep quick or concurrent captures apart
+        now = datetime.now()
+        stamp = f"{now:%Y%m%d-%H%M%S}-{now.microsecond // 1000:03d}-{os.getpid()}"
+        base = os.path.join(self.output_dir, f"profile-{stamp}")
+        pstats_path = base + ".pstats"
+        folded_path = base + ".folded"
+
+        self._profile.dump_stats(pstats_path)
+        with open(folded_path, "w", encoding="utf-8") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self._profile = None
+        self._sampler = None
+        return pstats_path, folded_path
+
+    def _sample(self, thread_id: int):
+        while not self._stop_sampling.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}")
+                frame = frame.f_back
+            # collapsed stacks list the outermost frame first
+            self._stacks[";".join(reversed(names))] += 1
@@ -0,0 +1,405 @@
+"""
+Local asyncio game server hosting many GameState sessions.
+
+Protocol: newline-delimited JSON over TCP (localhost by default). Each
+request is one object with an "op" and an optional "id" that is echoed back;
+requests on one connection may be pipelined.
+
+    {"op": "new", "difficulty": "Beginner"}            -> {"session": "...", "rows": 9, ...}
+    {"op": "new", "difficulty": {"rows": 50, "cols": 50, "mines": 400}, "seed": 7}
+    {"op": "new", "difficulty": {...}, "board": "packed"}  # bitmap board for huge games
+    {"op": "new", "difficulty": {...}, "adjacency": "eager"}  # count every cell at placement
+    {"op": "click", "session": "...", "row": 3, "col": 4}
+    {"op": "flag",  "session": "...", "row": 0, "col": 0}
+    {"op": "chord", "session": "...", "row": 3, "col": 4}
+    {"op": "hint",  "session": "..."}
+    {"op": "actions", "session": "...", "actions": [["reveal", 3, 4], ["flag", 0, 0]]}
+    {"op": "state", "session": "..."}                   -> full visible grid
+    {"op": "analyze", "session": "..."}                 -> {"safe": [[r, c], ...], "mines": [...]}
+    {"op": "watch", "session": "..."}                   -> compressed snapshot, then pushed updates
+    {"op": "unwatch", "session": "..."}
+    {"op": "close", "session": "..."}
+
+Actions answer with the game status and only the cells that changed, as
+[row, col, char] where char is "." hidden, "F" flag, "*" mine or "0"-"8".
+
+Idle games spill to SQLite past the memory budget (see src.session_store).
+Watching connections get each action's changes as they happen (see
+src.spectate).
+
+    python -m src.server --port 8765 [--memory-mb 256] [--spill-db sessions.db]
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import sys
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+
+from src.game import analysis
+from src.game.board import Board, Difficulty
+from src.game.game_state import GameState, GameStatus
+from src.game.packed_board import PackedBoard
+from src.session_store import DEFAULT_BUDGET_BYTES, SessionStore, pack_game
+from src.spectate import SpectatorHub, encode_line, encode_snapshot
+
+# boards at least this large generate/flood-fill on the executor so one big
+# action can't stall every other session on the event loop
+HEAVY_BOARD_CELLS = 10_000
+
+MAX_LINE_BYTES = 1 << 20
+
+# "board" option of the new op
+BOARD_CLASSES = {"cells": Board, "packed": PackedBoard}
+# "adjacency" option of the new op (cells boards only): Board's lazy_adjacency.
+# Eager boards of adjacency.PARALLEL_MIN_CELLS or more count on the process pool
+ADJACENCY_MODES = {"lazy": True, "eager": False}
+
+
+class ProtocolError(Exception):
+    """A request the server can't act on; reported back to the client."""
+
+
+def cell_char(cell) -> str:
+    if cell.is_flagged():
+        return "F"
+    if not cell.is_revealed():
+        return "."
+    if cell.is_mine:
+        return "*"
+    return str(cell.adjacent_mines)
+
+
+def request_int(value, field: str) -> int:
+    """A JSON integer field; floats, strings and booleans are rejected, not coerced."""
+    if type(value) is not int:
+        raise ProtocolError(f"{field} must be an integer")
+    return value
+
+
+def is_heavy(game: GameState) -> bool:
+    return game.board.rows * game.board.cols >= HEAVY_BOARD_CELLS
+
+
+def response_cells(response: dict) -> int:
+    """Cells a response lists, to decide whether encoding it is heavy."""
+    return len(response.get("changes", ())) + sum(len(row) for row in response.get("grid", ()))
+
+
+class GameServer:
+    """
+    Serves the JSON protocol for any number of concurrent sessions.
+
+    Games live in a SessionStore, so idle ones spill to SQLite once the
+    memory budget is used up. Each session's lock serializes its actions,
+    and every action's changes are also published to its spectators.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, workers: Optional[int] = None,
+                 spill_path: str = ":memory:", memory_budget: int = DEFAULT_BUDGET_BYTES):
+        self.host = host
+        self.port = port
+        self.sessions = SessionStore(spill_path, memory_budget, heavy_cells=HEAVY_BOARD_CELLS)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.spectators = SpectatorHub()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="game-worker")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._spill_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_LINE_BYTES
+        )
+        # port 0 picks a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._spill_task is not None:
+            self._spill_task.cancel()
+        self.executor.shutdown(wait=False)
+        self.sessions.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self._handle_line(line, writer)
+                if response_cells(response) >= HEAVY_BOARD_CELLS:
+                    data = await asyncio.get_running_loop().run_in_executor(self.executor, encode_line, response)
+                else:
+                    data = encode_line(response)
+                writer.write(data)
+                # only wait on the socket when the client is falling behind
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # request line over MAX_LINE_BYTES; the stream can't be resynced
+            pass
+        finally:
+            self.spectators.drop_connection(writer)
+            writer.close()
+
+    async def _handle_line(self, line: bytes, writer: Optional[asyncio.StreamWriter] = None) -> dict:
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ProtocolError("Request must be a JSON object")
+            request_id = request.get("id")
+            response = await self.handle_request(request, writer)
+            response["ok"] = True
+        except ProtocolError as e:
+            response = {"ok": False, "error": str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"ok": False, "error": f"Bad request: {e}"}
+        except Exception as e:
+            # a bug in one session mustn't drop this connection or anyone else's
+            print(f"Error handling request {line[:200]!r}: {e!r}", file=sys.stderr)
+            response = {"ok": False, "error": "Internal server error"}
+        if request_id is not None:
+            response["id"] = request_id
+        self._spill_heavy_later()
+        return response
+
+    async def handle_request(self, request: dict, writer: Optional[asyncio.StreamWriter] = None) -> dict:
+        op = request.get("op")
+        if op == "new":
+            return await self._new_game(request)
+
+        session_id = request.get("session")
+        lock = self._locks.get(session_id)
+        if lock is None:
+            raise ProtocolError("Unknown session")
+
+        if op == "close":
+            async with lock:
+                self._locks.pop(session_id, None)
+                self.sessions.discard(session_id)
+                self.spectators.close_session(session_id)
+            return {}
+
+        if op == "unwatch":
+            if writer is not None:
+                self.spectators.unsubscribe(session_id, writer)
+            return {}
+
+        async with lock, self._checkout(session_id) as game:
+            if op == "state":
+                return await self._run(game, self._state, game)
+            if op == "analyze":
+                return await self._analyze(game)
+            if op == "watch":
+                if writer is None:
+                    raise ProtocolError("Watching needs a connection")
+                # under the lock, so no update can slip between snapshot and subscription
+                response = await self._run(game, self._snapshot, game)
+                response["seq"] = self.spectators.subscribe(session_id, writer)
+                return response
+
+            if op == "click":
+                row, col = request_int(request["row"], "row"), request_int(request["col"], "col")
+                action = lambda: game.click_cell(row, col)
+            elif op == "flag":
+                row, col = request_int(request["row"], "row"), request_int(request["col"], "col")
+                action = lambda: game.flag_cell(row, col)
+            elif op == "chord":
+                row, col = request_int(request["row"], "row"), request_int(request["col"], "col")
+                action = lambda: game.chord_cell(row, col)
+            elif op == "actions":
+                # apply_actions rejects the whole batch before applying any of it
+                actions = [(kind, request_int(row, "row"), request_int(col, "col"))
+                           for kind, row, col in request["actions"]]
+                action = lambda: game.apply_actions(actions)
+            elif op == "hint":
+                # same rule as the GUI: hints only once the game has started
+                if game.status != GameStatus.PLAYING:
+                    raise ProtocolError("Hints are only available while playing")
+                action = game.use_hint
+            else:
+                raise ProtocolError(f"Unknown op: {op}")
+
+            response = await self._run(game, self._act, game, action)
+            message = self.spectators.message(session_id, response)
+            line = None
+            if self.spectators.viewers(session_id) and response_cells(response) >= HEAVY_BOARD_CELLS:
+                line = await asyncio.get_running_loop().run_in_executor(self.executor, encode_line, message)
+            self.spectators.deliver(session_id, message, line)
+            return response
+
+    async def _run(self, game: GameState, func, *args):
+        # heavy boards run on the executor so they can't stall other sessions
+        if is_heavy(game):
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        return func(*args)
+
+    def _spill_heavy_later(self):
+        if self._spill_task is None and self.sessions.heavy_victims():
+            self._spill_task = asyncio.ensure_future(self._spill_heavy())
+
+    async def _spill_heavy(self):
+        # big Cell boards pack with a per-cell loop, so the store leaves them
+        # to us; the session lock keeps actions off the game while it packs
+        try:
+            for session_id in self.sessions.heavy_victims():
+                lock = self._locks.get(session_id)
+                if lock is None or lock.locked():
+                    continue
+                async with lock:
+                    game = self.sessions.peek(session_id)
+                    if game is None:
+                        continue
+                    try:
+                        data = await asyncio.get_running_loop().run_in_executor(self.executor, pack_game, game)
+                    except Exception as e:
+                        self.sessions.mark_unspillable(session_id, e)
+                        continue
+                    self.sessions.spill(session_id, data)
+        finally:
+            self._spill_task = None
+
+    def _act(self, game: GameState, action) -> dict:
+        action()
+        return self._changes(game)
+
+    async def _analyze(self, game: GameState) -> dict:
+        # cached by the board's state hash, so repeated positions are free
+        result = await self._run(game, analysis.analyze, game.board)
+        return {
+            "safe": sorted([r, c] for r, c in result.safe),
+            "mines": sorted([r, c] for r, c in result.mines),
+        }
+
+    @asynccontextmanager
+    async def _checkout(self, session_id: str):
+        # pinned while in use so the store can't spill it mid-action
+        with self.sessions.checkout(session_id) as game:
+            if game is None:
+                raise ProtocolError("Unknown session")
+            yield game
+
+    async def _new_game(self, request: dict) -> dict:
+        difficulty = request.get("difficulty", Difficulty.BEGINNER["name"])
+        if isinstance(difficulty, str):
+            matches = [d for d in Difficulty.get_all() if d["name"] == difficulty]
+            if not matches:
+                raise ProtocolError(f"Unknown difficulty: {difficulty}")
+            difficulty = matches[0]
+        else:
+            difficulty = {
+                "rows": request_int(difficulty["rows"], "rows"),
+                "cols": request_int(difficulty["cols"], "cols"),
+                "mines": request_int(difficulty["mines"], "mines"),
+                "name": difficulty.get("name", "Custom"),
+            }
+            # stored with scores and packed into spilled sessions as text
+            if not isinstance(difficulty["name"], str):
+                raise ProtocolError("Difficulty name must be a string")
+            if difficulty["rows"] < 1 or difficulty["cols"] < 1:
+                raise ProtocolError("Board must have at least one row and column")
+            if not 0 < difficulty["mines"] < difficulty["rows"] * difficulty["cols"]:
+                raise ProtocolError("Mines must be between 1 and the number of cells - 1")
+
+        board_class = BOARD_CLASSES.get(request.get("board", "cells"))
+        if board_class is None:
+            raise ProtocolError(f"Unknown board type: {request['board']}")
+        if "adjacency" in request:
+            lazy = ADJACENCY_MODES.get(request["adjacency"])
+            if lazy is None:
+                raise ProtocolError(f"Unknown adjacency mode: {request['adjacency']}")
+            if board_class is not Board:
+                raise ProtocolError("The adjacency option only applies to cells boards")
+            board_class = partial(Board, lazy_adjacency=lazy)
+        seed = request.get("seed")
+        # sessions pack the seed as a uint64 when they spill
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or not 0 <= seed < 2 ** 64):
+            raise ProtocolError("Seed must be an integer from 0 to 2**64 - 1")
+        make_game = lambda: GameState(difficulty, seed, board_class)
+        if difficulty["rows"] * difficulty["cols"] >= HEAVY_BOARD_CELLS:
+            game = await asyncio.get_running_loop().run_in_executor(self.executor, make_game)
+        else:
+            game = make_game()
+
+        session_id = secrets.token_hex(8)
+        self._locks[session_id] = asyncio.Lock()
+        self.sessions.put(session_id, game)
+        board = game.board
+        return {
+            "session": session_id,
+            "rows": board.rows,
+            "cols": board.cols,
+            "mines": board.num_mines,
+            "seed": board.seed,
+        }
+
+    def _summary(self, game: GameState) -> dict:
+        return {
+            "status": game.status.name,
+            "flags": game.board.flags_placed,
+            "hints_used": game.hints_used,
+            "elapsed": round(game.get_elapsed_time(), 3),
+            "score": game.score,
+        }
+
+    def _changes(self, game: GameState) -> dict:
+        grid = game.board.grid
+        changes = [[r, c, cell_char(grid[r][c])] for r, c in game.board.pop_dirty_cells()]
+        response = self._summary(game)
+        response["changes"] = changes
+        return response
+
+    def _state(self, game: GameState) -> dict:
+        response = self._summary(game)
+        response["grid"] = ["".join(cell_char(cell) for cell in row) for row in game.board.grid]
+        return response
+
+    def _snapshot(self, game: GameState) -> dict:
+        response = self._summary(game)
+        response["rows"], response["cols"] = game.board.rows, game.board.cols
+        response["snapshot"] = encode_snapshot(self._state(game)["grid"])
+        return response
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.server", description="Local Minesweeper game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="executor threads for heavy actions")
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_BUDGET_BYTES // (1024 * 1024),
+                        help="memory budget for live games before idle ones spill to SQLite")
+    parser.add_argument("--spill-db", default=":memory:", help="SQLite file for spilled games")
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = GameServer(args.host, args.port, args.workers,
+                            spill_path=args.spill_db, memory_budget=args.memory_mb * 1024 * 1024)
+        await server.start()
+        print(f"Minesweeper server listening on {server.host}:{server.port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
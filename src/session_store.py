@@ -0,0 +1,315 @@
+"""
+Bounded store of live GameState objects with LRU spill to SQLite.
+
+Hot games stay in memory up to a byte budget; the least recently used ones
+are packed (a small struct header plus one zlib-compressed byte per cell, or
+the raw bitmaps of a PackedBoard) into a SQLite table and rebuilt on their
+next access. The header carries the timer and hint fields verbatim, so a
+resumed game's clock keeps running from the original start time.
+"""
+import math
+import sqlite3
+import struct
+import sys
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+
+from src.game.board import Board
+from src.game.cell import CellState
+from src.game.game_state import GameState, GameStatus
+from src.game.packed_board import PackedBoard
+
+FORMAT_VERSION = 2
+
+# version, board kind, rows, cols, mines, seed, first_click, flags_placed,
+# status, hints_used, max_hints, score, start_time, end_time, elapsed_time,
+# name length
+_HEADER = struct.Struct("<BBIIIQ?IBBBqdddH")
+
+# header board kind -> class; the body layout depends on it
+_BOARD_KINDS = (Board, PackedBoard)
+
+# per-cell byte: bits 0-1 CellState, bit 2 mine, bits 3-6 adjacent mines
+_STATE_BITS = 0x03
+_MINE_BIT = 0x04
+_ADJ_SHIFT = 3
+_CELL_STATES = {state.value: state for state in CellState}
+
+# resident cost of one Cell including its grid slot, measured with tracemalloc
+# on CPython 3.11 (about 120 bytes; the object's attributes are inline)
+CELL_BYTES = 120
+GAME_OVERHEAD_BYTES = 2048
+PACKED_PLANES = 8
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+
+
+def _time_or_nan(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _nan_or_time(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def pack_game(game: GameState) -> bytes:
+    """Serializes a game to a compact byte string (see unpack_game)."""
+    board = game.board
+    kind = _BOARD_KINDS.index(type(board))
+    if isinstance(board, PackedBoard):
+        body = board.dump_planes()
+    else:
+        # adjacent_count, since a lazy board hasn't filled in every Cell yet
+        cells = bytearray(board.rows * board.cols)
+        i = 0
+        for r, row in enumerate(board.grid):
+            for c, cell in enumerate(row):
+                cells[i] = (cell.state.value
+                            | (_MINE_BIT if cell.is_mine else 0)
+                            | (board.adjacent_count(r, c) << _ADJ_SHIFT))
+                i += 1
+        body = bytes(cells)
+
+    name = game.difficulty["name"].encode("utf-8")
+    header = _HEADER.pack(
+        FORMAT_VERSION, kind, board.rows, board.cols, board.num_mines, board.seed,
+        board.first_click, board.flags_placed, game.status.value,
+        game.hints_used, game.max_hints, game.score,
+        _time_or_nan(game.start_time), _time_or_nan(game.end_time), float(game.elapsed_time),
+        len(name),
+    )
+    return header + name + zlib.compress(body, 6)
+
+
+def unpack_game(data: bytes) -> GameState:
+    """Rebuilds a game packed by pack_game."""
+    (version, kind, rows, cols, mines, seed, first_click, flags_placed, status,
+     hints_used, max_hints, score, start_time, end_time, elapsed_time,
+     name_len) = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported session format version {version}")
+    offset = _HEADER.size
+    name = data[offset:offset + name_len].decode("utf-8")
+    body = zlib.decompress(data[offset + name_len:])
+
+    difficulty = {"rows": rows, "cols": cols, "mines": mines, "name": name}
+    game = GameState(difficulty, seed, board_class=_BOARD_KINDS[kind])
+    board = game.board
+    # the board's rng only matters before mine placement, where Random(seed)
+    # is already the state it would have had
+    board.first_click = first_click
+    board.flags_placed = flags_placed
+
+    if isinstance(board, PackedBoard):
+        board.load_planes(body)
+        board.recompute_hash()
+    else:
+        if len(body) != rows * cols:
+            raise ValueError("Corrupt session data")
+        mines_positions = set()
+        i = 0
+        for r, row in enumerate(board.grid):
+            for c, cell in enumerate(row):
+                packed = body[i]
+                i += 1
+                cell.state = _CELL_STATES[packed & _STATE_BITS]
+                cell.adjacent_mines = packed >> _ADJ_SHIFT
+                if packed & _MINE_BIT:
+                    cell.is_mine = True
+                    mines_positions.add((r, c))
+        board.mines_positions = mines_positions
+        board.recount_flagged_neighbors()
+        board.recompute_hash()
+
+    game.status = GameStatus(status)
+    game.hints_used = hints_used
+    game.max_hints = max_hints
+    game.score = score
+    game.start_time = _nan_or_time(start_time)
+    game.end_time = _nan_or_time(end_time)
+    game.elapsed_time = elapsed_time
+    return game
+
+
+def estimate_game_bytes(game: GameState) -> int:
+    """Approximate memory held by a live game, dominated by its board."""
+    board: Board = game.board
+    if isinstance(board, PackedBoard):
+        return GAME_OVERHEAD_BYTES + PACKED_PLANES * board.plane_bytes
+    return GAME_OVERHEAD_BYTES + board.rows * board.cols * CELL_BYTES
+
+
+class SessionStore:
+    """
+    Maps session ids to games, keeping at most max_bytes of them in memory.
+
+    Not thread-safe: use it from one thread (the server's event loop). Games
+    being worked on elsewhere should be held through checkout(), which pins
+    them so they are never spilled mid-action.
+
+    Cell boards of at least heavy_cells cells take a per-cell loop to pack,
+    so eviction leaves them alone; the owner lists them with heavy_victims(),
+    packs them wherever it likes and hands the bytes back to spill().
+    """
+
+    def __init__(self, path: str = ":memory:", max_bytes: int = DEFAULT_BUDGET_BYTES,
+                 heavy_cells: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.heavy_cells = heavy_cells
+        self.memory_bytes = 0
+        self._hot: "OrderedDict[str, GameState]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._pinned: Dict[str, int] = {}
+        # games pack_game failed on; they stay in memory rather than break eviction
+        self._unspillable: Set[str] = set()
+        self.spills = 0
+        self.loads = 0
+
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=OFF")  # scratch data, rebuilt per run
+        self._conn.execute("DROP TABLE IF EXISTS spilled_sessions")
+        self._conn.execute("CREATE TABLE spilled_sessions (id TEXT PRIMARY KEY, data BLOB NOT NULL)")
+
+    def __len__(self) -> int:
+        spilled = self._conn.execute("SELECT COUNT(*) FROM spilled_sessions").fetchone()[0]
+        return len(self._hot) + spilled
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._hot or self._spilled_data(session_id) is not None
+
+    def put(self, session_id: str, game: GameState):
+        """Adds or replaces a game; it becomes the most recently used."""
+        self.discard(session_id)
+        self._hot[session_id] = game
+        size = estimate_game_bytes(game)
+        self._sizes[session_id] = size
+        self.memory_bytes += size
+        self._enforce_budget()
+
+    def get(self, session_id: str) -> Optional[GameState]:
+        """Returns the game (loading it back if it was spilled), or None."""
+        game = self._hot.get(session_id)
+        if game is not None:
+            self._hot.move_to_end(session_id)
+            return game
+
+        data = self._spilled_data(session_id)
+        if data is None:
+            return None
+        game = unpack_game(data)
+        self._conn.execute("DELETE FROM spilled_sessions WHERE id = ?", (session_id,))
+        self.loads += 1
+        self.put(session_id, game)
+        return game
+
+    def peek(self, session_id: str) -> Optional[GameState]:
+        """The game if it's in memory, without marking it used."""
+        return self._hot.get(session_id)
+
+    def heavy_victims(self) -> List[str]:
+        """Heavy games, oldest first, whose spilling would bring memory back under budget."""
+        excess = self.memory_bytes - self.max_bytes
+        if excess <= 0:
+            return []
+        newest = next(reversed(self._hot))
+        victims = []
+        for session_id, game in self._hot.items():
+            if excess <= 0 or session_id == newest:
+                break
+            if self._spillable(session_id) and self._is_heavy(game):
+                victims.append(session_id)
+                excess -= self._sizes[session_id]
+        return victims
+
+    def spill(self, session_id: str, data: bytes) -> bool:
+        """Moves a game packed elsewhere to SQLite, unless it's been put back into use."""
+        if session_id not in self._hot or not self._spillable(session_id):
+            return False
+        self._store([session_id], [(session_id, data)])
+        return True
+
+    def mark_unspillable(self, session_id: str, error: Exception):
+        """Keeps a game that failed to pack in memory from now on."""
+        self._unspillable.add(session_id)
+        print(f"Could not spill session {session_id}: {error!r}", file=sys.stderr)
+
+    def discard(self, session_id: str):
+        """Forgets a game wherever it lives."""
+        self._unspillable.discard(session_id)
+        if session_id in self._hot:
+            del self._hot[session_id]
+            self.memory_bytes -= self._sizes.pop(session_id)
+        else:
+            self._conn.execute("DELETE FROM spilled_sessions WHERE id = ?", (session_id,))
+
+    @contextmanager
+    def checkout(self, session_id: str) -> Iterator[Optional[GameState]]:
+        """get() that keeps the game in memory until the block exits."""
+        game = self.get(session_id)
+        if game is None:
+            yield None
+            return
+        self._pinned[session_id] = self._pinned.get(session_id, 0) + 1
+        try:
+            yield game
+        finally:
+            count = self._pinned.pop(session_id) - 1
+            if count:
+                self._pinned[session_id] = count
+            self._enforce_budget()
+
+    def close(self):
+        self._conn.close()
+
+    def _spilled_data(self, session_id: str) -> Optional[bytes]:
+        row = self._conn.execute(
+            "SELECT data FROM spilled_sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def _spillable(self, session_id: str) -> bool:
+        return session_id not in self._pinned and session_id not in self._unspillable
+
+    def _is_heavy(self, game: GameState) -> bool:
+        board = game.board
+        return (self.heavy_cells is not None and not isinstance(board, PackedBoard)
+                and board.rows * board.cols >= self.heavy_cells)
+
+    def _enforce_budget(self):
+        if self.memory_bytes <= self.max_bytes:
+            return
+        # oldest first; pinned games and the one just used are skipped, so
+        # the budget can be exceeded briefly while they are busy
+        newest = next(reversed(self._hot))
+        victims, rows = [], []
+        excess = self.memory_bytes - self.max_bytes
+        for session_id in self._hot:
+            if excess <= 0 or session_id == newest:
+                break
+            game = self._hot[session_id]
+            if not self._spillable(session_id) or self._is_heavy(game):
+                continue
+            try:
+                data = pack_game(game)
+            except Exception as e:
+                # whatever is wrong with this game, the others can still spill
+                self.mark_unspillable(session_id, e)
+                continue
+            victims.append(session_id)
+            rows.append((session_id, data))
+            excess -= self._sizes[session_id]
+        if victims:
+            self._store(victims, rows)
+
+    def _store(self, victims: List[str], rows: list):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO spilled_sessions (id, data) VALUES (?, ?)", rows
+            )
+        for session_id in victims:
+            del self._hot[session_id]
+            self.memory_bytes -= self._sizes.pop(session_id)
+        self.spills += len(victims)
@@ -0,0 +1,144 @@
+"""
+Live spectator fan-out for server sessions.
+
+A viewer sends {"op": "watch", "session": "..."} and gets one compressed
+snapshot of the visible grid. From then on the connection receives an
+"update" event per action with just the cells that changed:
+
+    {"event": "update", "session": "...", "seq": 12, "status": "PLAYING", ..., "changes": [[r, c, ch], ...]}
+    {"event": "closed", "session": "..."}
+
+Each update is encoded once and written to every viewer that is keeping
+up. A viewer whose socket buffer is past HIGH_WATER_BYTES stops getting
+individual updates; its changes are merged per cell until the socket
+drains, then sent as one update carrying the latest seq. The game never
+waits on a viewer, and a gap in seq tells the viewer updates were merged.
+"""
+
+import asyncio
+import base64
+import json
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+# a viewer with more than this unsent gets coalesced updates
+HIGH_WATER_BYTES = 1 << 16
+
+
+def encode_snapshot(grid: List[str]) -> str:
+    """Rows of cell chars -> zlib + base64 text for the watch reply."""
+    return base64.b64encode(zlib.compress("\n".join(grid).encode("ascii"))).decode("ascii")
+
+
+def decode_snapshot(snapshot: str) -> List[str]:
+    return zlib.decompress(base64.b64decode(snapshot)).decode("ascii").split("\n")
+
+
+def encode_line(message: dict) -> bytes:
+    """One JSON line, as the server writes them."""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class _Viewer:
+    __slots__ = ("writer", "pending", "update", "flusher")
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        # (row, col) -> char, only while the viewer is behind
+        self.pending: Optional[Dict[Tuple[int, int], str]] = None
+        self.update: dict = {}
+        self.flusher: Optional[asyncio.Task] = None
+
+
+class SpectatorHub:
+    """Viewers of each session; GameServer publishes every action's changes here."""
+
+    def __init__(self, high_water: int = HIGH_WATER_BYTES):
+        self.high_water = high_water
+        self._viewers: Dict[str, Dict[asyncio.StreamWriter, _Viewer]] = {}
+        self._seq: Dict[str, int] = {}
+        self.coalesced = 0
+
+    def subscribe(self, session_id: str, writer: asyncio.StreamWriter) -> int:
+        """Adds a viewer; returns the seq its snapshot corresponds to."""
+        self._viewers.setdefault(session_id, {}).setdefault(writer, _Viewer(writer))
+        return self._seq.get(session_id, 0)
+
+    def unsubscribe(self, session_id: str, writer: asyncio.StreamWriter):
+        viewers = self._viewers.get(session_id)
+        if viewers is None:
+            return
+        viewer = viewers.pop(writer, None)
+        if viewer is not None and viewer.flusher is not None:
+            viewer.flusher.cancel()
+        if not viewers:
+            del self._viewers[session_id]
+
+    def drop_connection(self, writer: asyncio.StreamWriter):
+        """Removes a closed connection from every session it watched."""
+        for session_id in [s for s, viewers in self._viewers.items() if writer in viewers]:
+            self.unsubscribe(session_id, writer)
+
+    def viewers(self, session_id: str) -> int:
+        return len(self._viewers.get(session_id, ()))
+
+    def publish(self, session_id: str, update: dict):
+        """Sends one action's summary and changes to the session's viewers."""
+        self.deliver(session_id, self.message(session_id, update))
+
+    def message(self, session_id: str, update: dict) -> dict:
+        """The next update event for a session (publish() in two steps, see deliver)."""
+        seq = self._seq.get(session_id, 0) + 1
+        self._seq[session_id] = seq
+        return dict(update, event="update", session=session_id, seq=seq)
+
+    def deliver(self, session_id: str, message: dict, line: Optional[bytes] = None):
+        """
+        Sends an update from message(). line, if given, is that message
+        already run through encode_line, so big updates can be encoded off
+        the event loop.
+        """
+        viewers = self._viewers.get(session_id)
+        if not viewers:
+            return
+
+        for viewer in viewers.values():
+            transport = viewer.writer.transport
+            if transport.is_closing():
+                continue
+            if viewer.pending is None and transport.get_write_buffer_size() <= self.high_water:
+                if line is None:
+                    line = encode_line(message)
+                viewer.writer.write(line)
+                continue
+
+            # behind: fold into the pending update, latest char per cell wins
+            if viewer.pending is None:
+                viewer.pending = {}
+                viewer.flusher = asyncio.ensure_future(self._flush(viewer))
+            for r, c, ch in message["changes"]:
+                viewer.pending[(r, c)] = ch
+            viewer.update = message
+            self.coalesced += 1
+
+    def close_session(self, session_id: str):
+        """Tells the session's viewers it ended and forgets them."""
+        self._seq.pop(session_id, None)
+        viewers = self._viewers.pop(session_id, {})
+        line = encode_line({"event": "closed", "session": session_id})
+        for viewer in viewers.values():
+            if viewer.flusher is not None:
+                viewer.flusher.cancel()
+            if not viewer.writer.transport.is_closing():
+                viewer.writer.write(line)
+
+    async def _flush(self, viewer: _Viewer):
+        try:
+            await viewer.writer.drain()
+        except ConnectionError:
+            return
+        message = dict(viewer.update, changes=[[r, c, ch] for (r, c), ch in viewer.pending.items()])
+        viewer.pending = None
+        viewer.flusher = None
+        if not viewer.writer.transport.is_closing():
+            viewer.writer.write(encode_line(message))
@@ -0,0 +1,56 @@
+"""Startup phase timing, printed to stderr when MINESWEEPER_STARTUP_REPORT is set."""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+def report_enabled() -> bool:
+    return bool(os.environ.get("MINESWEEPER_STARTUP_REPORT"))
+
+
+class StartupTimer:
+    """Records named startup phases, including ones run on background threads."""
+
+    def __init__(self, origin: Optional[float] = None):
+        # perf_counter() value treated as "launch"
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: List[Tuple[str, float, float, str]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Times the body of a with-block as one phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def mark(self, name: str):
+        """Records a milestone such as the first window being shown."""
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def record(self, name: str, start: float, end: float):
+        with self._lock:
+            self.phases.append((name, start, end, threading.current_thread().name))
+
+    def report(self) -> str:
+        """Returns the phases in start order, in ms since launch."""
+        lines = ["Startup timing (ms since launch):"]
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+        for name, start, end, thread in phases:
+            lines.append(
+                f"  {name:<24} {(start - self.origin) * 1000:8.1f} -> "
+                f"{(end - self.origin) * 1000:8.1f}  "
+                f"({(end - start) * 1000:7.1f} ms, {thread})"
+            )
+        return "\n".join(lines)
+
+    def print_report(self):
+        if report_enabled():
+            print(self.report(), file=sys.stderr)
@@ -0,0 +1,178 @@
+"""
+Streaming export/import of users, stats and game history.
+
+    python -m src.transfer export backup.jsonl
+    python -m src.transfer export backup_dir --format csv
+    python -m src.transfer import backup.jsonl --db other.db
+
+Rows are streamed from the database in chunks (server-side cursor with
+yield_per) and written as they arrive; imports use executemany inserts with
+one commit per batch. Memory use doesn't grow with the size of the database.
+
+JSONL writes one file with a {"table": ..., "row": {...}} object per line.
+CSV writes a directory with one <table>.csv file per table.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, insert, select
+
+from src import db
+
+# parents before children, so foreign keys resolve on import
+TABLES = [db.User.__table__, db.UserDifficultyStat.__table__, db.GameRecord.__table__]
+TABLES_BY_NAME = {table.name: table for table in TABLES}
+
+FORMATS = ("jsonl", "csv")
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def _stream_rows(engine, table, chunk_size: int) -> Iterator[List[dict]]:
+    """Yields chunks of rows (as dicts) from a server-side cursor."""
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(
+            select(table).order_by(*table.primary_key.columns)
+        )
+        for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+
+def _to_text(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _from_text(column, value):
+    """Converts a JSON/CSV value back to the column's Python type."""
+    if value is None or (value == "" and column.nullable):
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Boolean):
+        return value in (True, 1, "1", "True", "true")
+    if isinstance(column.type, Integer):
+        return int(value)
+    if isinstance(column.type, Float):
+        return float(value)
+    return value
+
+
+def export_database(engine, path: str, fmt: str = "jsonl", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """Writes every table to path; returns the row count per table."""
+    counts = {}
+    if fmt == "jsonl":
+        with open(path, "w", encoding="utf-8") as out:
+            for table in TABLES:
+                counts[table.name] = 0
+                for chunk in _stream_rows(engine, table, chunk_size):
+                    out.writelines(
+                        json.dumps({"table": table.name, "row": {k: _to_text(v) for k, v in row.items()}}) + "\n"
+                        for row in chunk
+                    )
+                    counts[table.name] += len(chunk)
+    elif fmt == "csv":
+        os.makedirs(path, exist_ok=True)
+        for table in TABLES:
+            counts[table.name] = 0
+            with open(os.path.join(path, f"{table.name}.csv"), "w", encoding="utf-8", newline="") as out:
+                writer = csv.writer(out)
+                writer.writerow(table.columns.keys())
+                for chunk in _stream_rows(engine, table, chunk_size):
+                    writer.writerows([_to_text(row[name]) for name in table.columns.keys()] for row in chunk)
+                    counts[table.name] += len(chunk)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return counts
+
+
+def _read_jsonl(path: str) -> Iterator[Tuple[str, dict]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["table"], record["row"]
+
+
+def _read_csv(path: str) -> Iterator[Tuple[str, dict]]:
+    for table in TABLES:
+        file_path = os.path.join(path, f"{table.name}.csv")
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                yield table.name, row
+
+
+def _batches(records: Iterable[Tuple[str, dict]], batch_size: int) -> Iterator[Tuple[str, List[dict]]]:
+    """Groups consecutive rows of the same table into batches."""
+    current, batch = None, []
+    for table_name, row in records:
+        if table_name != current or len(batch) >= batch_size:
+            if batch:
+                yield current, batch
+            current, batch = table_name, []
+        batch.append(row)
+    if batch:
+        yield current, batch
+
+
+def import_database(engine, path: str, fmt: str = "jsonl", batch_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """Bulk-inserts an export into the database; returns the row count per table."""
+    if fmt == "jsonl":
+        records = _read_jsonl(path)
+    elif fmt == "csv":
+        records = _read_csv(path)
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+    # the app's own migration, so older databases get the new columns and indexes
+    db.init_db(engine)
+    counts = {table.name: 0 for table in TABLES}
+    with engine.connect() as conn:
+        for table_name, batch in _batches(records, batch_size):
+            table = TABLES_BY_NAME[table_name]
+            rows = [
+                {name: _from_text(table.columns[name], value) for name, value in row.items()}
+                for row in batch
+            ]
+            conn.execute(insert(table), rows)
+            conn.commit()
+            counts[table_name] += len(rows)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.transfer",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="JSONL file, or directory for CSV")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="defaults to csv for directories, jsonl otherwise")
+    parser.add_argument("--db", default=db.DB_PATH, help="SQLite database file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per read chunk / insert batch")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if os.path.isdir(args.path) or not os.path.splitext(args.path)[1] else "jsonl"
+
+    engine = db.create_configured_engine(args.db)
+    if args.command == "export":
+        counts = export_database(engine, args.path, fmt, args.chunk_size)
+    else:
+        counts = import_database(engine, args.path, fmt, args.chunk_size)
+
+    summary = ", ".join(f"{name}: {count}" for name, count in counts.items())
+    print(f"{args.command}ed {summary}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import random
+import unittest
+from unittest import mock
+
+from src.game import adjacency
+from src.game.board import Board
+
+
+def naive_counts(mines, rows, cols):
+    """Adjacent counts the way the original per-cell loop computed them."""
+    counts = bytearray(rows * cols)
+    for row in range(rows):
+        for col in range(cols):
+            if mines[row * cols + col]:
+                continue
+            counts[row * cols + col] = sum(
+                mines[r * cols + c]
+                for r in range(max(0, row - 1), min(rows, row + 2))
+                for c in range(max(0, col - 1), min(cols, col + 2))
+            )
+    return bytes(counts)
+
+
+class TestAdjacency(unittest.TestCase):
+    """Tests for whole-board adjacency counts."""
+
+    def random_mines(self, rng, rows, cols):
+        return [index for index in range(rows * cols) if rng.random() < 0.3]
+
+    def test_kernel_matches_neighbor_loop(self):
+        """Test the lane-sum kernel against a direct neighbor count."""
+        rng = random.Random(1)
+        for rows, cols in [(1, 1), (1, 7), (7, 1), (2, 2), (9, 9), (13, 31), (40, 17)]:
+            indices = self.random_mines(rng, rows, cols)
+            mines = bytearray(rows * cols)
+            for index in indices:
+                mines[index] = 1
+            self.assertEqual(adjacency.count_adjacent(bytes(mines), rows, cols),
+                             naive_counts(mines, rows, cols), (rows, cols))
+
+    def test_stripes_match_serial(self):
+        """Test the process pool path is byte-for-byte the serial one."""
+        rng = random.Random(2)
+        for rows, cols, workers in [(50, 37, 3), (5, 20, 4), (2, 9, 3)]:
+            indices = self.random_mines(rng, rows, cols)
+            serial = adjacency.adjacent_counts(indices, rows, cols, workers=1)
+            self.assertEqual(adjacency.stripe_adjacency(indices, rows, cols, workers), serial)
+
+    def test_eager_board_uses_stripes(self):
+        """Test a board past PARALLEL_MIN_CELLS with lazy mode off counts through the stripes."""
+        difficulty = {"rows": 30, "cols": 40, "mines": 300, "name": "Custom"}
+        with mock.patch.object(adjacency, "PARALLEL_MIN_CELLS", 1000), \
+                mock.patch("os.cpu_count", return_value=2), \
+                mock.patch.object(adjacency, "stripe_adjacency", wraps=adjacency.stripe_adjacency) as stripes:
+            eager = Board(difficulty, seed=8, lazy_adjacency=False)
+            eager.place_mines(15, 20)
+            self.assertEqual(stripes.call_count, 1)
+
+            lazy = Board(difficulty, seed=8, lazy_adjacency=True)
+            lazy.place_mines(15, 20)
+            self.assertEqual(stripes.call_count, 1)
+        self.assertEqual([[eager.adjacent_count(r, c) for c in range(40)] for r in range(30)],
+                         [[lazy.adjacent_count(r, c) for c in range(40)] for r in range(30)])
+
+    def test_placement_unchanged(self):
+        """Test a seed places the same mines as sampling the position list."""
+        difficulty = {"rows": 12, "cols": 15, "mines": 40, "name": "Custom"}
+        for seed in range(20):
+            board = Board(difficulty, seed)
+            board.place_mines(5, 6)
+            positions = [(r, c) for r in range(12) for c in range(15) if (r, c) != (5, 6)]
+            expected = set(random.Random(seed).sample(positions, 40))
+            self.assertEqual(board.mines_positions, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
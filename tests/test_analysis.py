@@ -0,0 +1,85 @@
+import random
+import unittest
+
+from src.game import analysis
+from src.game.board import Board, Difficulty
+from src.game.packed_board import PackedBoard
+
+
+def play_randomly(board, rng, moves):
+    for _ in range(moves):
+        row, col = rng.randrange(board.rows), rng.randrange(board.cols)
+        if rng.random() < 0.3:
+            board.toggle_flag(row, col)
+        else:
+            board.reveal_cell(row, col)
+
+
+class TestStateHash(unittest.TestCase):
+    """Tests for the incremental Zobrist hash of the visible state."""
+
+    def test_incremental_matches_recompute(self):
+        """Test the hash kept up by reveals and flags equals one built from scratch."""
+        rng = random.Random(3)
+        for board_class in (Board, PackedBoard):
+            for seed in range(20):
+                board = board_class(Difficulty.INTERMEDIATE, seed=seed)
+                play_randomly(board, rng, 40)
+                if seed % 2:
+                    board.reveal_all_mines()
+                expected = board.state_hash
+                board.recompute_hash()
+                self.assertEqual(board.state_hash, expected)
+
+    def test_flag_round_trip(self):
+        """Test flagging and unflagging restores the hash, and layouts don't leak into it."""
+        board = Board(Difficulty.BEGINNER, seed=1)
+        other = Board(Difficulty.BEGINNER, seed=2)
+        self.assertEqual(board.state_hash, other.state_hash)
+        start = board.state_hash
+        board.toggle_flag(4, 4)
+        self.assertNotEqual(board.state_hash, start)
+        board.toggle_flag(4, 4)
+        self.assertEqual(board.state_hash, start)
+        self.assertNotEqual(start, Board(Difficulty.INTERMEDIATE, seed=1).state_hash)
+
+
+class TestAnalysis(unittest.TestCase):
+    """Tests for the deduction solver and its cache."""
+
+    def test_deductions_are_sound(self):
+        """Test every deduced cell really is safe or a mine."""
+        for seed in range(30):
+            board = Board(Difficulty.INTERMEDIATE, seed=seed)
+            board.reveal_cell(8, 8)
+            result = analysis.deduce(board)
+            for row, col in result.safe:
+                self.assertFalse(board.grid[row][col].is_mine)
+            for row, col in result.mines:
+                self.assertTrue(board.grid[row][col].is_mine)
+
+    def test_repeated_position_hits_cache(self):
+        """Test the same visible state on a second board is served from the cache."""
+        cache = analysis.AnalysisCache(max_entries=2)
+        analysis.cache, saved = cache, analysis.cache
+        try:
+            board = Board(Difficulty.BEGINNER, seed=5)
+            board.reveal_cell(0, 0)
+            first = analysis.analyze(board)
+            replay = Board(Difficulty.BEGINNER, seed=5)
+            replay.reveal_cell(0, 0)
+            self.assertIs(analysis.analyze(replay), first)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+            # oldest position is evicted past max_entries
+            for row, col in ((8, 8), (8, 0)):
+                board.toggle_flag(row, col)
+                analysis.analyze(board)
+            self.assertEqual(len(cache), 2)
+            self.assertIsNone(cache.get(replay.state_hash))
+        finally:
+            analysis.cache = saved
+
+
+if __name__ == '__main__':
+    unittest.main()
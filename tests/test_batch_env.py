@@ -0,0 +1,83 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.game.board import Board, Difficulty
+
+if np is not None:
+    from src.game.batch_env import BatchMinesweeperEnv, REWARD_LOSS, REWARD_NO_OP
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestBatchMinesweeperEnv(unittest.TestCase):
+    """Tests for the batched environment."""
+
+    def test_first_reveal_is_safe(self):
+        """Test the first reveal never hits a mine and mine counts are exact."""
+        env = BatchMinesweeperEnv(256, Difficulty.BEGINNER, seed=1)
+        env.reset()
+        actions = np.random.default_rng(2).integers(0, env.area, env.batch_size)
+        obs, rewards, dones, info = env.step(actions)
+
+        self.assertEqual(obs["numbers"].shape, (256, 9, 9))
+        self.assertFalse(env.mines.reshape(256, -1)[np.arange(256), actions].any())
+        self.assertTrue((env.mines.sum(axis=(1, 2)) == 10).all())
+        self.assertTrue((rewards > 0).all())
+        self.assertFalse(obs["hidden"].reshape(256, -1)[np.arange(256), actions].any())
+
+    def test_flood_matches_board(self):
+        """Test a reveal uncovers exactly what Board.reveal_cell would."""
+        env = BatchMinesweeperEnv(32, Difficulty.INTERMEDIATE, seed=3)
+        env.reset()
+        actions = np.full(32, 8 * 16 + 8)
+        env.step(actions)
+
+        for i in range(32):
+            board = Board(Difficulty.INTERMEDIATE)
+            board.first_click = False
+            for r in range(16):
+                for c in range(16):
+                    board.grid[r][c].is_mine = bool(env.mines[i, r, c])
+                    board.grid[r][c].adjacent_mines = int(env.counts[i, r, c])
+            board.reveal_cell(8, 8)
+            expected = [[cell.is_revealed() for cell in row] for row in board.grid]
+            self.assertEqual(env.revealed[i].tolist(), expected)
+
+    def test_flags_loss_and_reset(self):
+        """Test flags block reveals, mines end the game and reset starts over."""
+        env = BatchMinesweeperEnv(1, Difficulty.BEGINNER, seed=4)
+        env.reset()
+        env.step([env.area + 0])  # flag cell 0
+        _, rewards, _, _ = env.step([0])
+        self.assertEqual(rewards[0], REWARD_NO_OP)
+        self.assertFalse(env.placed[0])
+
+        env.step([env.area + 0])  # unflag, then reveal to place mines
+        env.step([0])
+        mine = int(np.flatnonzero(env.mines[0])[0])
+        obs, rewards, dones, info = env.step([mine])
+        self.assertEqual(rewards[0], REWARD_LOSS)
+        self.assertTrue(dones[0])
+        self.assertFalse(info["won"][0])
+        self.assertTrue((obs["numbers"][0][env.mines[0]] == -1).all())
+
+        obs = env.reset(dones)
+        self.assertTrue(obs["hidden"].all())
+        self.assertFalse(env.done.any())
+
+    def test_win_by_revealing(self):
+        """Test revealing every safe cell wins."""
+        env = BatchMinesweeperEnv(1, Difficulty.BEGINNER, seed=5)
+        env.reset()
+        env.step([40])
+        for cell in np.flatnonzero(~env.mines[0] & ~env.revealed[0]):
+            _, rewards, dones, info = env.step([cell])
+        self.assertTrue(dones[0])
+        self.assertTrue(info["won"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
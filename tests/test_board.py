@@ -29,6 +29,14 @@ class TestBoard(unittest.TestCase):
         # First click position should be safe
         self.assertFalse(self.board.grid[0][0].is_mine)
     
+    def test_seed_reproduces_layout(self):
+        """Test the same seed and first click give the same mines."""
+        first = Board(Difficulty.INTERMEDIATE, seed=1234)
+        second = Board(Difficulty.INTERMEDIATE, seed=1234)
+        first.place_mines(3, 3)
+        second.place_mines(3, 3)
+        self.assertEqual(first.mines_positions, second.mines_positions)
+    
     def test_adjacent_mine_calculation(self):
         """Test adjacent mine counts are correct."""
         self.board.place_mines(0, 0)
@@ -73,6 +81,19 @@ class TestBoard(unittest.TestCase):
         self.assertGreater(revealed_count, 1, 
                       "Revealing empty cell should trigger recursive reveal")
     
+    def test_large_flood_fill(self):
+        """Test flood fill on a board larger than the recursion limit."""
+        large_board = Board({"rows": 200, "cols": 200, "mines": 1, "name": "Large"})
+        large_board.grid[0][0].is_mine = True
+        large_board.mines_positions.add((0, 0))
+        large_board._calculate_adjacent_mines()
+        large_board.first_click = False
+        
+        self.assertFalse(large_board.reveal_cell(199, 199))
+        revealed_count = sum(1 for row in large_board.grid
+                             for cell in row if cell.is_revealed())
+        self.assertEqual(revealed_count, 200 * 200 - 1)
+    
     def test_flag_toggle(self):
         """Test flag toggling."""
         cell = self.board.grid[0][0]
@@ -87,6 +108,22 @@ class TestBoard(unittest.TestCase):
         self.assertFalse(cell.is_flagged())
         self.assertEqual(self.board.flags_placed, 0)
     
+    def test_dirty_cells(self):
+        """Test only changed cells are reported for redraw."""
+        self.board.toggle_flag(0, 0)
+        self.assertEqual(self.board.pop_dirty_cells(), {(0, 0)})
+        self.assertEqual(self.board.pop_dirty_cells(), set())
+        
+        self.board.toggle_flag(0, 0)
+        self.board.reveal_cell(4, 4)
+        dirty = self.board.pop_dirty_cells()
+        self.assertIn((0, 0), dirty)
+        self.assertIn((4, 4), dirty)
+        revealed = {(r, c) for r in range(self.board.rows)
+                    for c in range(self.board.cols)
+                    if self.board.grid[r][c].is_revealed()}
+        self.assertTrue(revealed <= dirty)
+    
     def test_win_condition(self):
         """Test win detection."""
         # Create a minimal board for testing
@@ -100,6 +137,60 @@ class TestBoard(unittest.TestCase):
                     self.board.grid[row][col].reveal()
         
         self.assertTrue(self.board.check_win())
+    
+    def test_lazy_adjacency(self):
+        """Test lazy counts match eager ones and are only computed where needed."""
+        difficulty = {"rows": 30, "cols": 30, "mines": 60, "name": "Lazy"}
+        for seed in range(10):
+            eager = Board(difficulty, seed, lazy_adjacency=False)
+            lazy = Board(difficulty, seed, lazy_adjacency=True)
+            for row, col in [(15, 15), (0, 0), (29, 3), (7, 22)]:
+                self.assertEqual(eager.reveal_cell(row, col), lazy.reveal_cell(row, col))
+                self.assertEqual(eager.pop_dirty_cells(), lazy.pop_dirty_cells())
+            
+            computed = sum(count != 255 for count in lazy._adjacent)
+            revealed = sum(cell.is_revealed() for row in lazy.grid for cell in row)
+            self.assertLessEqual(computed, revealed)
+            for row in range(30):
+                for col in range(30):
+                    if lazy.grid[row][col].is_revealed():
+                        self.assertEqual(lazy.grid[row][col].adjacent_mines,
+                                         eager.grid[row][col].adjacent_mines)
+                    self.assertEqual(lazy.adjacent_count(row, col), eager.grid[row][col].adjacent_mines)
+    
+    def test_chord(self):
+        """Test chording reveals neighbors once the flags match the number."""
+        board = Board({"rows": 5, "cols": 5, "mines": 2, "name": "Chord"})
+        for row, col in [(0, 0), (0, 2)]:
+            board.grid[row][col].is_mine = True
+            board.mines_positions.add((row, col))
+        board._calculate_adjacent_mines()
+        board.first_click = False
+        
+        board.reveal_cell(1, 1)  # a 2
+        self.assertFalse(board.chord_cell(1, 1))
+        self.assertFalse(board.grid[1][0].is_revealed())  # one flag short
+        
+        board.toggle_flag(0, 0)
+        board.toggle_flag(0, 2)
+        board.toggle_flag(2, 2)
+        board.toggle_flag(2, 2)
+        self.assertEqual(board.flagged_neighbor_count(1, 1), 2)
+        self.assertEqual(board.flagged_neighbor_count(4, 4), 0)
+        self.assertFalse(board.chord_cell(1, 1))
+        for row, col in [(0, 1), (1, 0), (1, 2), (2, 0), (2, 1), (2, 2)]:
+            self.assertTrue(board.grid[row][col].is_revealed())
+        self.assertTrue(board.check_win())
+        
+        # a misplaced flag makes the chord hit a mine
+        board = Board({"rows": 3, "cols": 3, "mines": 1, "name": "Chord"})
+        board.grid[0][0].is_mine = True
+        board.mines_positions.add((0, 0))
+        board._calculate_adjacent_mines()
+        board.first_click = False
+        board.reveal_cell(1, 1)
+        board.toggle_flag(0, 1)
+        self.assertTrue(board.chord_cell(1, 1))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,188 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src import db
+from src.db_writer import StatUpdate, StatWriter
+
+
+def locked_error(message="database is locked"):
+    return OperationalError("UPDATE user_difficulty_stats", {}, sqlite3.OperationalError(message))
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class TempDatabaseTest(unittest.TestCase):
+    """A configured engine on a scratch SQLite file."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = db.create_configured_engine(self.path)
+
+    def tearDown(self):
+        self.engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+
+class TestEngine(TempDatabaseTest):
+    """Tests for the shared SQLite settings."""
+
+    def test_pragmas_applied(self):
+        """Test every connection comes up in WAL mode with a busy timeout."""
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)  # NORMAL
+
+
+class TestRunWithRetry(unittest.TestCase):
+    """Tests for retrying writes while another process holds the lock."""
+
+    def test_retries_until_lock_clears(self):
+        """Test locked attempts are rolled back and retried until one commits."""
+        session, attempts = FakeSession(), []
+
+        def work(s):
+            attempts.append(1)
+            if len(attempts) <= 3:
+                raise locked_error()
+            return "saved"
+
+        self.assertEqual(db.run_with_retry(session, work, attempts=6, backoff=0), "saved")
+        self.assertEqual(len(attempts), 4)
+        self.assertEqual((session.rollbacks, session.commits), (3, 1))
+
+    def test_reraises_when_retries_run_out(self):
+        """Test the lock error is raised after the last attempt."""
+        session, attempts = FakeSession(), []
+
+        def work(s):
+            attempts.append(1)
+            raise locked_error()
+
+        with self.assertRaises(OperationalError):
+            db.run_with_retry(session, work, attempts=3, backoff=0)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(session.commits, 0)
+
+    def test_other_errors_not_retried(self):
+        """Test errors other than a busy database are raised right away."""
+        session, attempts = FakeSession(), []
+
+        def work(s):
+            attempts.append(1)
+            raise locked_error("no such table: users")
+
+        with self.assertRaises(OperationalError):
+            db.run_with_retry(session, work, attempts=5, backoff=0)
+        self.assertEqual(len(attempts), 1)
+
+
+class TestGameHistory(TempDatabaseTest):
+    """Tests for the history rows and the aggregates updated with them."""
+
+    def setUp(self):
+        super().setUp()
+        db.init_db(self.engine)
+        self.session = sessionmaker(bind=self.engine, autoflush=False)()
+        self.session.add(db.User(id=1, name="a", normalized_name="a", pin="1234"))
+        self.session.commit()
+
+    def tearDown(self):
+        self.session.close()
+        super().tearDown()
+
+    def save(self, *games):
+        updates = [StatUpdate(user_id=1, difficulty="Beginner", time=time, score=score, won=won,
+                              hints_used=0, seed=3, finished_at=datetime(2024, 1, 1))
+                   for time, score, won in games]
+        db.run_with_retry(self.session, lambda s: StatWriter(None)._apply(s, db, updates))
+
+    def stat(self):
+        return self.session.query(db.UserDifficultyStat).filter_by(user_id=1, difficulty="Beginner").one()
+
+    def test_history_and_aggregates(self):
+        """Test each game adds a history row; losses count as played but not toward bests."""
+        self.save((30.0, 500, True), (5.0, 0, False))
+        self.save((20.0, 400, True), (25.0, 900, True))
+        self.assertEqual(self.session.query(db.GameRecord).count(), 4)
+        stat = self.stat()
+        self.assertEqual((stat.games_played, stat.games_won), (4, 3))
+        self.assertEqual(stat.total_time, 80.0)
+        self.assertEqual((stat.best_time, stat.best_score), (20.0, 900))
+
+        # a worse game leaves the bests alone
+        self.save((60.0, 10, True))
+        self.session.expire_all()
+        self.assertEqual((self.stat().best_time, self.stat().best_score), (20.0, 900))
+
+    def test_failed_write_rolls_back_both(self):
+        """Test a failure after the history insert leaves neither table changed."""
+        updates = [StatUpdate(user_id=1, difficulty="Beginner", time=1.0, score=1, won=True,
+                              hints_used=0, seed=None, finished_at=datetime(2024, 1, 1))]
+
+        def work(session):
+            StatWriter(None)._apply(session, db, updates)
+            session.flush()
+            raise OperationalError("INSERT", {}, sqlite3.OperationalError("disk I/O error"))
+
+        with self.assertRaises(OperationalError):
+            db.run_with_retry(self.session, work, backoff=0)
+        self.assertEqual(self.session.query(db.GameRecord).count(), 0)
+        self.assertEqual(self.session.query(db.UserDifficultyStat).count(), 0)
+
+
+class TestMigration(TempDatabaseTest):
+    """Tests for upgrading a database created by the first release."""
+
+    def test_old_schema_upgraded(self):
+        """Test init_db adds the new columns, table and indexes and backfills old rows."""
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+                              "normalized_name VARCHAR NOT NULL UNIQUE, pin VARCHAR NOT NULL)"))
+            conn.execute(text("CREATE TABLE user_difficulty_stats (id INTEGER PRIMARY KEY, "
+                              "user_id INTEGER NOT NULL REFERENCES users (id), difficulty VARCHAR NOT NULL, "
+                              "best_time FLOAT, best_score INTEGER, "
+                              "CONSTRAINT uix_user_diff UNIQUE (user_id, difficulty))"))
+            conn.execute(text("INSERT INTO users VALUES (1, 'a', 'a', '1234')"))
+            conn.execute(text("INSERT INTO user_difficulty_stats VALUES (1, 1, 'Beginner', 12.5, 700)"))
+            conn.execute(text("INSERT INTO user_difficulty_stats VALUES (2, 1, 'Advanced', NULL, NULL)"))
+
+        db.init_db(self.engine)
+        db.init_db(self.engine)  # a second run finds nothing to do
+
+        inspector = inspect(self.engine)
+        columns = {c["name"] for c in inspector.get_columns("user_difficulty_stats")}
+        self.assertTrue({"games_played", "games_won", "total_time"} <= columns)
+        self.assertIn("game_history", inspector.get_table_names())
+        indexes = {i["name"] for i in inspector.get_indexes("user_difficulty_stats")}
+        self.assertTrue({"ix_uds_leader_time", "ix_uds_leader_score"} <= indexes)
+
+        # rows with a best time are backfilled as one win at that time
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("SELECT best_time, best_score, games_played, games_won, total_time "
+                                     "FROM user_difficulty_stats ORDER BY id")).all()
+        self.assertEqual([tuple(row) for row in rows], [(12.5, 700, 1, 1, 12.5), (None, None, 0, 0, 0.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import types
+import unittest
+from datetime import datetime
+
+from sqlalchemy.orm import sessionmaker
+
+from src import db
+from src.db_writer import StatUpdate, StatWriter, StatWriterError
+from src.lazy_db import DeferredDatabase
+
+
+def temp_db_module(path):
+    """What StatWriter uses from src.db, bound to a scratch database file."""
+    engine = db.create_configured_engine(path)
+    db.Base.metadata.create_all(engine)
+    return types.SimpleNamespace(
+        GameRecord=db.GameRecord,
+        UserDifficultyStat=db.UserDifficultyStat,
+        run_with_retry=db.run_with_retry,
+        SessionLocal=sessionmaker(bind=engine, autoflush=False, autocommit=False),
+        engine=engine,
+    )
+
+
+def update(user_id, time, won=True, score=100, difficulty="Beginner"):
+    return StatUpdate(user_id=user_id, difficulty=difficulty, time=time, score=score, won=won,
+                      hints_used=0, seed=7, finished_at=datetime(2024, 1, 1))
+
+
+class TestStatWriter(unittest.TestCase):
+    """Tests for the background stats writer."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.module = temp_db_module(self.path)
+        with self.module.SessionLocal() as session:
+            session.add(db.User(id=1, name="a", normalized_name="a", pin="1234"))
+            session.commit()
+
+    def tearDown(self):
+        self.module.engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_flush_writes_queued_updates(self):
+        """Test submitted updates are in the database once flush() returns."""
+        writer = StatWriter(DeferredDatabase(loader=lambda: self.module), batch_size=3)
+        for i in range(7):
+            writer.submit(update(1, 10.0 + i))
+        writer.flush(timeout=10)
+        with self.module.SessionLocal() as session:
+            self.assertEqual(session.query(db.GameRecord).count(), 7)
+            stat = session.query(db.UserDifficultyStat).one()
+            self.assertEqual((stat.games_played, stat.best_time), (7, 10.0))
+        writer.close(timeout=10)
+
+    def test_close_drains_queue(self):
+        """Test close() saves what is still queued before the thread stops."""
+        writer = StatWriter(DeferredDatabase(loader=lambda: self.module))
+        for i in range(5):
+            writer.submit(update(1, 20.0 + i))
+        writer.close(timeout=10)
+        with self.module.SessionLocal() as session:
+            self.assertEqual(session.query(db.GameRecord).count(), 5)
+
+    def test_failed_batch_keeps_writer_running(self):
+        """Test a batch that can't be saved is dropped and later ones still land."""
+        writer = StatWriter(DeferredDatabase(loader=lambda: self.module), batch_size=1)
+        writer.submit(update(1, 5.0, difficulty=None))  # NOT NULL violation
+        writer.flush(timeout=10)
+        writer.submit(update(1, 6.0))
+        writer.flush(timeout=10)
+        with self.module.SessionLocal() as session:
+            self.assertEqual([r.time for r in session.query(db.GameRecord)], [6.0])
+        writer.close(timeout=10)
+
+    def test_dead_writer_raises_on_flush(self):
+        """Test flush() reports a writer that couldn't open the database instead of hanging."""
+        def loader():
+            raise OSError("disk on fire")
+
+        writer = StatWriter(DeferredDatabase(loader=loader))
+        writer.submit(update(1, 5.0))
+        with self.assertRaises(StatWriterError) as caught:
+            writer.flush(timeout=10)
+        self.assertIsInstance(caught.exception.__cause__, OSError)
+
+
+if __name__ == "__main__":
+    unittest.main()
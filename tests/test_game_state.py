@@ -0,0 +1,107 @@
+import random
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from src.game.board import Difficulty
+from src.game.game_state import ACTION_FLAG, ACTION_REVEAL, GameState, GameStatus
+
+
+def visible(game):
+    """Cell states plus the status, for comparing two games."""
+    return [[cell.state for cell in row] for row in game.board.grid], game.status, game.board.flags_placed
+
+
+class TestApplyActions(unittest.TestCase):
+    """Tests for GameState.apply_actions."""
+
+    def test_matches_single_calls(self):
+        """Test a batch ends in the same state as one call per action."""
+        rng = random.Random(4)
+        for seed in range(30):
+            actions = [(rng.choice(["reveal", "flag", "chord"]), rng.randrange(9), rng.randrange(9))
+                       for _ in range(15)]
+            batch, single = GameState(Difficulty.BEGINNER, seed), GameState(Difficulty.BEGINNER, seed)
+            result = batch.apply_actions(actions)
+
+            for kind, row, col in actions[:result.applied]:
+                if kind == "reveal":
+                    single.click_cell(row, col)
+                elif kind == "flag":
+                    single.flag_cell(row, col)
+                else:
+                    single.chord_cell(row, col)
+
+            self.assertEqual(visible(batch), visible(single))
+            self.assertEqual(result.status, batch.status)
+            self.assertEqual(result.changed, single.board.pop_dirty_cells())
+
+    def test_stops_at_first_mine(self):
+        """Test actions after a mine hit are not applied."""
+        game = GameState(Difficulty.BEGINNER, 1)
+        game.click_cell(4, 4)
+        game.board.pop_dirty_cells()
+        mine = next(iter(game.board.mines_positions))
+        safe = next((r, c) for r, c in game.board.get_safe_unrevealed_cells())
+
+        result = game.apply_actions([("reveal", *mine), ("reveal", *safe)])
+        self.assertTrue(result.hit_mine)
+        self.assertEqual(result.applied, 1)
+        self.assertEqual(result.status, GameStatus.LOST)
+        self.assertFalse(game.board.grid[safe[0]][safe[1]].is_revealed())
+        self.assertEqual(result.changed, game.board.mines_positions)
+        # nothing applies once the game is over
+        self.assertEqual(game.apply_actions([("flag", *safe)]).applied, 0)
+
+    def test_win_ends_batch(self):
+        """Test revealing every safe cell wins, even with a mine reveal queued after."""
+        game = GameState(Difficulty.BEGINNER, 6)
+        game.click_cell(4, 4)
+        safe = game.board.get_safe_unrevealed_cells()
+        mine = next(iter(game.board.mines_positions))
+
+        result = game.apply_actions([("reveal", r, c) for r, c in safe] + [("reveal", *mine)])
+        self.assertEqual(result.status, GameStatus.WON)
+        self.assertFalse(result.hit_mine)
+        # floods can finish the board early; the mine reveal never runs
+        self.assertLessEqual(result.applied, len(safe))
+        self.assertFalse(game.board.grid[mine[0]][mine[1]].is_revealed())
+
+    def test_rejects_bad_batch(self):
+        """Test a bad action anywhere in the batch rejects it before anything applies."""
+        game = GameState(Difficulty.BEGINNER, 5)
+        for bad in (("jump", 0, 0), ("flag", 9, 0), ("flag", 0, -1), ("flag", 0.5, 0),
+                    (True, 0, 0), (False, 0, 0)):
+            with self.assertRaises(ValueError):
+                game.apply_actions([("reveal", 4, 4), ("flag", 0, 0), bad])
+            self.assertEqual(game.status, GameStatus.NOT_STARTED)
+            self.assertFalse(game.board.grid[4][4].is_revealed())
+            self.assertEqual(game.board.flags_placed, 0)
+            self.assertEqual(game.board.dirty_cells, set())
+
+    def test_keeps_pending_redraws(self):
+        """Test cells the GUI hasn't redrawn yet stay dirty after a batch."""
+        game = GameState(Difficulty.BEGINNER, 2)
+        game.click_cell(0, 0)
+        pending = set(game.board.dirty_cells)
+        hidden = game.board.get_safe_unrevealed_cells()[0]
+        result = game.apply_actions([(ACTION_FLAG, *hidden)])
+        self.assertEqual(result.changed, {hidden})
+        self.assertEqual(game.board.pop_dirty_cells(), pending | {hidden})
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_numpy_actions(self):
+        """Test an (N, 3) integer array is accepted."""
+        game = GameState(Difficulty.INTERMEDIATE, 3)
+        actions = np.array([[ACTION_REVEAL, 8, 8], [ACTION_FLAG, 0, 0], [ACTION_FLAG, 0, 0]])
+        result = game.apply_actions(actions)
+        self.assertEqual(result.applied, 3)
+        self.assertIn((8, 8), result.changed)
+        self.assertEqual(game.board.flags_placed, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+from src.gui.latency import InputLatencyTracker
+
+
+class TestInputLatencyTracker(unittest.TestCase):
+    """Tests for click-to-paint latency tracking."""
+
+    def test_queue_delay_uses_event_clock(self):
+        """Test queueing delay is measured against the fastest event seen."""
+        tracker = InputLatencyTracker()
+        now_ms = int(time.perf_counter() * 1000)
+        first = tracker.begin(SimpleNamespace(time=now_ms), "reveal")
+        # an event stamped 50 ms earlier than the first one, relative to now
+        second = tracker.begin(SimpleNamespace(time=now_ms - 50), "reveal")
+        self.assertEqual(first.queue_ms, 0.0)
+        self.assertGreaterEqual(second.queue_ms, 45.0)
+
+    def test_paint_completes_pending_samples(self):
+        """Test one redraw completes every event it covered and logs them."""
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "latency.csv")
+            tracker = InputLatencyTracker(log_path=log_path)
+            for kind in ("reveal", "flag"):
+                sample = tracker.begin(None, kind)
+                tracker.engine_done(sample)
+            self.assertTrue(tracker.has_pending)
+
+            tracker.paint_done(time.perf_counter())
+            tracker.close()
+            self.assertFalse(tracker.has_pending)
+            self.assertEqual(len(tracker.recent), 2)
+            self.assertIn("input->paint", tracker.summary())
+            with open(log_path) as f:
+                self.assertEqual(len(f.readlines()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from sqlalchemy.orm import sessionmaker
+
+from src import db, leaderboard
+
+
+class TestLeaderboard(unittest.TestCase):
+    """Tests for leaderboard queries."""
+
+    def setUp(self):
+        """Set up an in-memory database with a few players."""
+        engine = db.create_configured_engine(":memory:")
+        db.Base.metadata.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+        leaderboard.cache.invalidate()
+
+        # (name, best time, best score); equal times break ties on user id
+        players = [("a", 30.0, 900), ("b", 10.0, 700), ("c", 20.0, 800),
+                   ("d", 10.0, 950), ("e", None, None)]
+        for name, best_time, best_score in players:
+            user = db.User(name=name, normalized_name=name, pin="1234")
+            self.session.add(user)
+            self.session.flush()
+            self.session.add(db.UserDifficultyStat(
+                user_id=user.id, difficulty="Beginner",
+                best_time=best_time, best_score=best_score,
+                games_played=1, games_won=0 if best_time is None else 1,
+                total_time=best_time or 5.0,
+            ))
+        self.session.commit()
+
+    def _all_pages(self, metric):
+        names, cursor = [], None
+        while True:
+            page = leaderboard.top_users(self.session, "Beginner", metric, limit=2, after=cursor)
+            names.extend(entry.name for entry in page.entries)
+            if page.next_cursor is None:
+                return names
+            cursor = page.next_cursor
+
+    def test_rank_by_time(self):
+        """Test pages walk the players fastest first."""
+        self.assertEqual(self._all_pages("time"), ["b", "d", "c", "a"])
+
+    def test_rank_by_score(self):
+        """Test pages walk the players highest score first."""
+        self.assertEqual(self._all_pages("score"), ["d", "a", "c", "b"])
+
+    def test_cache_invalidation(self):
+        """Test cached pages are dropped after a write."""
+        first = leaderboard.top_users(self.session, "Beginner", "time", limit=1)
+        self.assertEqual(first.entries[0].name, "b")
+
+        stat = self.session.query(db.UserDifficultyStat).filter_by(best_time=30.0).one()
+        stat.best_time = 1.0
+        self.session.commit()
+        self.assertEqual(leaderboard.top_users(self.session, "Beginner", "time", limit=1), first)
+
+        leaderboard.cache.invalidate("Beginner")
+        self.assertEqual(leaderboard.top_users(self.session, "Beginner", "time", limit=1).entries[0].name, "a")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from src import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for the metrics registry."""
+
+    def test_histogram_percentiles(self):
+        """Test percentiles over a known distribution."""
+        histogram = metrics.Histogram()
+        for value in range(1, 101):
+            histogram.observe(float(value))
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(50), 50.0)
+        self.assertEqual(histogram.percentile(99), 99.0)
+        self.assertEqual(histogram.max, 100.0)
+
+    def test_histogram_is_bounded(self):
+        """Test the sample stays within its size limit."""
+        histogram = metrics.Histogram(max_samples=10)
+        for value in range(1000):
+            histogram.observe(value)
+        self.assertEqual(len(histogram.samples), 10)
+        self.assertEqual(histogram.count, 1000)
+
+    def test_registry_summary(self):
+        """Test counters and timers show up in the summary."""
+        registry = metrics.Registry()
+        registry.incr("games", 3)
+        with registry.timer("work"):
+            pass
+        summary = registry.summary()
+        self.assertIn("games", summary)
+        self.assertIn("work", summary)
+
+    def test_disabled_timed_is_passthrough(self):
+        """Test decorating is free when metrics are off."""
+        def func():
+            return 1
+        if not metrics.ENABLED:
+            self.assertIs(metrics.timed("func")(func), func)
+
+
+if __name__ == '__main__':
+    unittest.main()
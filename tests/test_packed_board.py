@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from src.game.board import Board, Difficulty
+from src.game.cell import CellState
+from src.game.game_state import GameState
+from src.game.packed_board import PackedBoard, sum_planes
+
+
+def cells(board):
+    """Every cell's mine flag, adjacent count and state, through board.grid."""
+    return [[(cell.is_mine, cell.adjacent_mines, cell.state) for cell in row] for row in board.grid]
+
+
+class TestPackedBoard(unittest.TestCase):
+    """Tests for the bit-packed board."""
+
+    def test_adder_tree(self):
+        """Test the bit-sliced adder counts every combination of 8 bits."""
+        planes = [sum((n >> bit & 1) << n for n in range(256)) for bit in range(8)]
+        bits = sum_planes(planes)
+        for n in range(256):
+            count = sum((plane >> n & 1) << i for i, plane in enumerate(bits))
+            self.assertEqual(count, bin(n).count("1"))
+
+    def test_matches_board(self):
+        """Test random play gives the same layout, reveals, flags and wins as Board."""
+        rng = random.Random(7)
+        for _ in range(60):
+            rows, cols = rng.randint(1, 20), rng.randint(2, 20)
+            difficulty = {"rows": rows, "cols": cols, "mines": rng.randint(1, rows * cols - 1), "name": "Custom"}
+            seed = rng.randrange(1000)
+            board, packed = Board(difficulty, seed), PackedBoard(difficulty, seed)
+            for _ in range(30):
+                row, col = rng.randrange(rows), rng.randrange(cols)
+                roll = rng.random()
+                if roll < 0.3:
+                    self.assertEqual(board.toggle_flag(row, col), packed.toggle_flag(row, col))
+                elif roll < 0.5:
+                    self.assertEqual(board.flagged_neighbor_count(row, col),
+                                     packed.flagged_neighbor_count(row, col))
+                    self.assertEqual(board.chord_cell(row, col), packed.chord_cell(row, col))
+                else:
+                    self.assertEqual(board.reveal_cell(row, col), packed.reveal_cell(row, col))
+                self.assertEqual(board.pop_dirty_cells(), packed.pop_dirty_cells())
+                self.assertEqual(board.check_win(), packed.check_win())
+                self.assertEqual(board.flags_placed, packed.flags_placed)
+                self.assertEqual(board.state_hash, packed.state_hash)
+            self.assertEqual(cells(board), cells(packed))
+            self.assertEqual(board.mines_positions, packed.mines_positions)
+            self.assertEqual(board.get_safe_unrevealed_cells(), packed.get_safe_unrevealed_cells())
+
+    def test_grid_view(self):
+        """Test the grid proxy reads and writes like Cell objects."""
+        board = PackedBoard(Difficulty.BEGINNER, seed=1)
+        cell = board.grid[2][3]
+        self.assertEqual((len(board.grid), len(board.grid[0])), (9, 9))
+        self.assertTrue(cell.toggle_flag())
+        self.assertTrue(board.grid[2][3].is_flagged())
+        self.assertFalse(cell.reveal())
+        cell.state = CellState.REVEALED
+        self.assertTrue(cell.is_revealed())
+        cell.adjacent_mines = 5
+        self.assertEqual(board.grid[2][3].adjacent_mines, 5)
+        with self.assertRaises(IndexError):
+            board.grid[9]
+
+    def test_large_board_is_compact(self):
+        """Test a 1000x1000 game fits in about a megabyte and plays normally."""
+        difficulty = {"rows": 1000, "cols": 1000, "mines": 100000, "name": "Custom"}
+        game = GameState(difficulty, seed=3, board_class=PackedBoard)
+        game.click_cell(500, 500)
+        board = game.board
+        self.assertLess(8 * board.plane_bytes, 1_100_000)
+        self.assertFalse(board.grid[500][500].is_mine)
+        self.assertEqual(len(board.mines_positions), 100000)
+
+        game.reset()
+        self.assertIsInstance(game.board, PackedBoard)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from src.profiling import ProfileCapture
+
+
+def _busy_work(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+class TestProfileCapture(unittest.TestCase):
+    """Tests for on-demand profile capture."""
+
+    def test_toggle_writes_profiles(self):
+        """Test a start/stop cycle writes both output files."""
+        with tempfile.TemporaryDirectory() as tmp:
+            capture = ProfileCapture(output_dir=tmp, interval=0.001)
+            self.assertIsNone(capture.toggle())
+            self.assertTrue(capture.active)
+            _busy_work(0.1)
+            pstats_path, folded_path = capture.toggle()
+            self.assertFalse(capture.active)
+
+            stats = pstats.Stats(pstats_path)
+            self.assertTrue(any(func[2] == "_busy_work" for func in stats.stats))
+            with open(folded_path) as f:
+                folded = f.read()
+            self.assertIn("_busy_work", folded)
+
+    def test_quick_captures_keep_both(self):
+        """Test two captures within the same second write separate files."""
+        with tempfile.TemporaryDirectory() as tmp:
+            capture = ProfileCapture(output_dir=tmp, interval=0.001)
+            paths = []
+            for _ in range(2):
+                capture.start()
+                time.sleep(0.002)
+                paths.extend(capture.stop())
+            self.assertEqual(len(set(paths)), 4)
+            self.assertEqual(len(os.listdir(tmp)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from src.game.board import Board, Difficulty
+from src.game.packed_board import PackedBoard
+from src.game.puzzle_pack import PUZZLE_DIFFICULTY_NAME, PuzzlePack, PuzzleWriter, build_pack
+
+
+class TestPuzzlePack(unittest.TestCase):
+    """Tests for memory-mapped puzzle packs."""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".mspk")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_round_trip(self):
+        """Test seed and layout puzzles come back as the same boards."""
+        layout = {(0, 1), (2, 2), (4, 0)}
+        with PuzzleWriter(self.path) as writer:
+            self.assertEqual(writer.add_seed(Difficulty.BEGINNER, 42, (4, 4)), 0)
+            self.assertEqual(writer.add_layout(5, 6, layout, (0, 5)), 1)
+
+        with PuzzlePack(self.path) as pack:
+            self.assertEqual(len(pack), 2)
+            seeded = pack[0].new_game()
+            expected = Board(Difficulty.BEGINNER, seed=42)
+            expected.place_mines(4, 4)
+            self.assertEqual(seeded.board.mines_positions, expected.mines_positions)
+            self.assertFalse(seeded.board.first_click)
+
+            puzzle = pack[-1]
+            self.assertEqual((puzzle.rows, puzzle.cols, puzzle.mines, puzzle.first_click), (5, 6, 3, (0, 5)))
+            self.assertEqual(puzzle.difficulty["name"], f"{PUZZLE_DIFFICULTY_NAME} 5x6")
+            for board_class in (Board, PackedBoard):
+                game = puzzle.new_game(board_class)
+                self.assertEqual(game.board.mines_positions, layout)
+                self.assertEqual(game.board.adjacent_count(1, 1), 2)
+                game.click_cell(*puzzle.first_click)
+                self.assertFalse(game.board.grid[0][5].is_mine)
+            with self.assertRaises(IndexError):
+                pack[2]
+
+    def test_bad_input(self):
+        """Test invalid puzzles and files are rejected."""
+        with PuzzleWriter(self.path) as writer:
+            with self.assertRaises(ValueError):
+                writer.add_layout(3, 3, {(1, 1)}, (1, 1))
+            with self.assertRaises(ValueError):
+                writer.add_seed(Difficulty.BEGINNER, 1, (9, 0))
+        with open(self.path, "r+b") as f:
+            f.write(b"NOPE")
+        with self.assertRaises(ValueError):
+            PuzzlePack(self.path)
+
+    def test_corrupt_records(self):
+        """Test records pointing or reaching outside the pack raise ValueError."""
+        with PuzzleWriter(self.path) as writer:
+            writer.add_seed(Difficulty.BEGINNER, 1, (0, 0))
+            writer.add_layout(5, 6, {(0, 1)}, (0, 5))
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+        index_offset = struct.unpack_from("<Q", data, 16)[0]
+        layout_offset = struct.unpack_from("<Q", data, index_offset + 8)[0]
+
+        corruptions = [
+            (0, lambda d: struct.pack_into("<Q", d, index_offset, 2 ** 40)),       # offset past the end
+            (0, lambda d: struct.pack_into("<Q", d, index_offset, index_offset)),  # offset into the index
+            (1, lambda d: struct.pack_into("<H", d, layout_offset + 1, 500)),      # layout runs past its record
+            (1, lambda d: struct.pack_into("<H", d, layout_offset + 11, 9)),       # first click off the board
+        ]
+        for number, corrupt in corruptions:
+            damaged = bytearray(data)
+            corrupt(damaged)
+            with open(self.path, "wb") as f:
+                f.write(damaged)
+            with PuzzlePack(self.path) as pack:
+                with self.assertRaises(ValueError):
+                    pack[number]
+
+    def test_large_pack(self):
+        """Test any puzzle of a large pack loads straight from the index."""
+        build_pack(self.path, 20_000, Difficulty.INTERMEDIATE, seed=3)
+        with PuzzlePack(self.path) as pack:
+            self.assertEqual(len(pack), 20_000)
+            puzzle = pack[12_345]
+            self.assertEqual(puzzle.number, 12_345)
+            game = puzzle.new_game()
+            self.assertEqual(len(game.board.mines_positions), 40)
+            self.assertNotIn(puzzle.first_click, game.board.mines_positions)
+
+
+if __name__ == '__main__':
+    unittest.main()
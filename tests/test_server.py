@@ -0,0 +1,231 @@
+import asyncio
+import contextlib
+import io
+import json
+import threading
+import unittest
+from unittest import mock
+
+from src.game import adjacency
+from src.server import GameServer
+from src.session_store import pack_game
+
+# responses list every changed cell, so a big flood fill is a long line
+CLIENT_LIMIT = 1 << 24
+
+
+class TestGameServer(unittest.TestCase):
+    """Tests for the local JSON-lines game server."""
+
+    def run_with_server(self, client, **server_args):
+        """Run client(server, send) against a server on a free port."""
+        async def main():
+            server = GameServer(port=0, **server_args)
+            await server.start()
+            reader, writer = await asyncio.open_connection(server.host, server.port, limit=CLIENT_LIMIT)
+
+            async def send(request):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                return json.loads(await reader.readline())
+
+            try:
+                return await client(server, send)
+            finally:
+                writer.close()
+                await server.close()
+
+        return asyncio.run(main())
+
+    def test_play_session(self):
+        """Test a new game can be clicked, flagged and queried."""
+        async def client(server, send):
+            created = await send({"id": 1, "op": "new", "difficulty": "Beginner", "seed": 5})
+            self.assertTrue(created["ok"])
+            self.assertEqual(created["id"], 1)
+            self.assertEqual((created["rows"], created["cols"]), (9, 9))
+            session = created["session"]
+
+            clicked = await send({"op": "click", "session": session, "row": 4, "col": 4})
+            self.assertEqual(clicked["status"], "PLAYING")
+            self.assertIn([4, 4, clicked["changes"][0][2]], clicked["changes"])
+            self.assertTrue(all(ch not in ".F*" for _, _, ch in clicked["changes"]))
+
+            state = await send({"op": "state", "session": session})
+            revealed = sum(ch != "." for row in state["grid"] for ch in row)
+            self.assertEqual(revealed, len(clicked["changes"]))
+
+            hidden = [(r, c) for r, row in enumerate(state["grid"]) for c, ch in enumerate(row) if ch == "."]
+            flagged = await send({"op": "flag", "session": session, "row": hidden[0][0], "col": hidden[0][1]})
+            self.assertEqual(flagged["flags"], 1)
+            self.assertEqual(flagged["changes"], [[hidden[0][0], hidden[0][1], "F"]])
+
+            batch = await send({"op": "actions", "session": session,
+                                "actions": [["flag", hidden[0][0], hidden[0][1]], ["flag", hidden[1][0], hidden[1][1]]]})
+            # the first flag toggles the earlier one back off
+            self.assertEqual(batch["flags"], 1)
+            self.assertEqual(sorted(batch["changes"]), sorted([[hidden[0][0], hidden[0][1], "."],
+                                                               [hidden[1][0], hidden[1][1], "F"]]))
+
+            analyzed = await send({"op": "analyze", "session": session})
+            for row, col in analyzed["safe"] + analyzed["mines"]:
+                self.assertEqual(state["grid"][row][col], ".")
+
+            closed = await send({"op": "close", "session": session})
+            self.assertTrue(closed["ok"])
+            self.assertEqual(len(server.sessions), 0)
+
+        self.run_with_server(client)
+
+    def test_errors(self):
+        """Test bad requests are answered instead of dropping the connection."""
+        async def client(server, send):
+            self.assertFalse((await send({"op": "click", "session": "nope", "row": 0, "col": 0}))["ok"])
+            self.assertFalse((await send({"op": "new", "difficulty": "Impossible"}))["ok"])
+            self.assertFalse((await send({"op": "new", "board": "hex"}))["ok"])
+            for seed in (-1, 2 ** 64, 1.5, "7", True):
+                self.assertFalse((await send({"op": "new", "seed": seed}))["ok"])
+            for name in (5, ["Custom"], {"x": 1}):
+                bad_name = {"rows": 5, "cols": 5, "mines": 3, "name": name}
+                self.assertFalse((await send({"op": "new", "difficulty": bad_name}))["ok"])
+            self.assertFalse((await send({"op": "new", "difficulty": {"rows": 5.5, "cols": 5, "mines": 3}}))["ok"])
+            created = await send({"op": "new", "difficulty": {"rows": 5, "cols": 5, "mines": 3}})
+            session = created["session"]
+            self.assertFalse((await send({"op": "hint", "session": session}))["ok"])
+            self.assertFalse((await send({"op": "jump", "session": session}))["ok"])
+            for row in (2.9, "2", True):
+                self.assertFalse((await send({"op": "click", "session": session, "row": row, "col": 0}))["ok"])
+                batch = await send({"op": "actions", "session": session, "actions": [["reveal", row, 0]]})
+                self.assertFalse(batch["ok"])
+            state = await send({"op": "state", "session": session})
+            self.assertEqual(state["status"], "NOT_STARTED")
+
+        self.run_with_server(client)
+
+    def test_unexpected_error_keeps_connection(self):
+        """Test an unexpected exception is answered and the connection keeps working."""
+        async def client(server, send):
+            created = await send({"op": "new", "difficulty": "Beginner", "seed": 1})
+
+            async def broken(game):
+                raise RuntimeError("boom")
+            server._analyze = broken
+            failed = await send({"id": 3, "op": "analyze", "session": created["session"]})
+            self.assertEqual((failed["ok"], failed["id"]), (False, 3))
+            clicked = await send({"op": "click", "session": created["session"], "row": 4, "col": 4})
+            self.assertTrue(clicked["ok"])
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.run_with_server(client)
+
+    def test_concurrent_sessions(self):
+        """Test large boards on the executor don't interfere with each other."""
+        async def client(server, send):
+            async def play(seed):
+                reader, writer = await asyncio.open_connection(server.host, server.port, limit=CLIENT_LIMIT)
+
+                async def own_send(request):
+                    writer.write(json.dumps(request).encode() + b"\n")
+                    await writer.drain()
+                    return json.loads(await reader.readline())
+
+                created = await own_send({"op": "new", "difficulty": {"rows": 120, "cols": 120, "mines": 500},
+                                          "seed": seed, "board": "packed" if seed % 2 else "cells"})
+                clicked = await own_send({"op": "click", "session": created["session"], "row": 60, "col": 60})
+                writer.close()
+                return clicked
+
+            results = await asyncio.gather(*(play(seed) for seed in range(4)))
+            for result in results:
+                self.assertEqual(result["status"], "PLAYING")
+                self.assertGreater(len(result["changes"]), 0)
+            self.assertEqual(len(server.sessions), 4)
+
+        self.run_with_server(client)
+
+    def test_heavy_state_runs_off_loop(self):
+        """Test a full-grid request on a huge board doesn't hold up a small session."""
+        async def client(server, send):
+            big = await send({"op": "new", "difficulty": {"rows": 400, "cols": 400, "mines": 100}, "seed": 1})
+            await send({"op": "click", "session": big["session"], "row": 200, "col": 200})
+            small = await send({"op": "new", "difficulty": "Beginner", "seed": 1})
+
+            reader, writer = await asyncio.open_connection(server.host, server.port, limit=CLIENT_LIMIT)
+            finished = []
+
+            async def state():
+                reply = await send({"op": "state", "session": big["session"]})
+                finished.append("state")
+                return reply
+
+            async def click():
+                await asyncio.sleep(0.02)  # let the state request get going
+                writer.write(json.dumps({"op": "click", "session": small["session"], "row": 4, "col": 4}).encode() + b"\n")
+                await writer.drain()
+                reply = json.loads(await reader.readline())
+                finished.append("click")
+                return reply
+
+            state_reply, click_reply = await asyncio.gather(state(), click())
+            writer.close()
+            self.assertEqual(len(state_reply["grid"]), 400)
+            self.assertTrue(click_reply["ok"])
+            self.assertEqual(finished, ["click", "state"])
+
+        self.run_with_server(client)
+
+    def test_heavy_games_spill_off_loop(self):
+        """Test big boards over the memory budget are packed on the executor and resume."""
+        async def client(server, send):
+            big = await send({"op": "new", "difficulty": {"rows": 120, "cols": 120, "mines": 500}, "seed": 2})
+            clicked = await send({"op": "click", "session": big["session"], "row": 60, "col": 60})
+            before = await send({"op": "state", "session": big["session"]})
+            await send({"op": "new", "difficulty": "Beginner", "seed": 1})
+            for _ in range(100):
+                if server.sessions.spills:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(server.sessions.spills, 1)
+            self.assertIsNone(server.sessions.peek(big["session"]))
+            self.assertEqual(len(packed_on), 1)
+            self.assertTrue(packed_on[0].startswith("game-worker"))
+
+            after = await send({"op": "state", "session": big["session"]})
+            self.assertEqual(after["grid"], before["grid"])
+            self.assertEqual(after["status"], clicked["status"])
+
+        packed_on = []
+
+        def recording_pack(game):
+            packed_on.append(threading.current_thread().name)
+            return pack_game(game)
+
+        with mock.patch("src.server.pack_game", recording_pack):
+            self.run_with_server(client, memory_budget=10_000)
+
+    def test_eager_adjacency_uses_stripes(self):
+        """Test "adjacency": "eager" counts a big cells board on the process pool."""
+        difficulty = {"rows": 30, "cols": 40, "mines": 300}
+
+        async def client(server, send):
+            self.assertFalse((await send({"op": "new", "adjacency": "sometimes"}))["ok"])
+            self.assertFalse((await send({"op": "new", "adjacency": "eager", "board": "packed"}))["ok"])
+            grids = []
+            for mode in ("eager", "lazy"):
+                created = await send({"op": "new", "difficulty": difficulty, "seed": 8, "adjacency": mode})
+                self.assertEqual(server.sessions.peek(created["session"]).board.lazy_adjacency, mode == "lazy")
+                await send({"op": "click", "session": created["session"], "row": 15, "col": 20})
+                await send({"op": "state", "session": created["session"]})
+                game = server.sessions.peek(created["session"])
+                grids.append([[game.board.adjacent_count(r, c) for c in range(40)] for r in range(30)])
+            self.assertEqual(grids[0], grids[1])
+
+        with mock.patch.object(adjacency, "PARALLEL_MIN_CELLS", 1000), \
+                mock.patch("os.cpu_count", return_value=2), \
+                mock.patch.object(adjacency, "stripe_adjacency", wraps=adjacency.stripe_adjacency) as stripes:
+            self.run_with_server(client)
+        self.assertEqual(stripes.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
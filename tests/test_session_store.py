@@ -0,0 +1,140 @@
+import contextlib
+import io
+import random
+import unittest
+
+from src.game.board import Difficulty
+from src.game.game_state import GameState, GameStatus
+from src.game.packed_board import PackedBoard
+from src.session_store import SessionStore, estimate_game_bytes, pack_game, unpack_game
+
+
+def snapshot(game):
+    """Everything a resumed game must reproduce."""
+    board = game.board
+    cells = [(c.state, c.is_mine, c.adjacent_mines) for row in board.grid for c in row]
+    return (cells, board.mines_positions, board.first_click, board.flags_placed, board.seed,
+            game.status, game.hints_used, game.max_hints, game.score,
+            game.start_time, game.end_time, game.elapsed_time, game.difficulty)
+
+
+class TestSessionStore(unittest.TestCase):
+    """Tests for the bounded session store."""
+
+    def played_game(self, seed):
+        """A game in progress with a reveal, a flag and a hint."""
+        game = GameState(Difficulty.INTERMEDIATE, seed)
+        game.click_cell(8, 8)
+        hidden = next((r, c) for r in range(16) for c in range(16)
+                      if not game.board.grid[r][c].is_revealed())
+        game.flag_cell(*hidden)
+        random.seed(seed)  # use_hint picks its cell with the global random
+        game.use_hint()
+        return game
+
+    def test_pack_round_trip(self):
+        """Test packing keeps the board, timer and hints intact."""
+        game = self.played_game(3)
+        restored = unpack_game(pack_game(game))
+        self.assertEqual(snapshot(restored), snapshot(game))
+        self.assertEqual(restored.status, GameStatus.PLAYING)
+        self.assertLess(len(pack_game(game)), 200)
+
+        unstarted = GameState(Difficulty.BEGINNER, 9)
+        self.assertEqual(snapshot(unpack_game(pack_game(unstarted))), snapshot(unstarted))
+
+        packed = GameState(Difficulty.ADVANCED, 4, board_class=PackedBoard)
+        packed.click_cell(12, 12)
+        restored = unpack_game(pack_game(packed))
+        self.assertIsInstance(restored.board, PackedBoard)
+        self.assertEqual(snapshot(restored), snapshot(packed))
+
+    def test_spill_and_resume(self):
+        """Test least recently used games spill and come back unchanged."""
+        games = {f"g{i}": self.played_game(i) for i in range(10)}
+        budget = estimate_game_bytes(games["g0"]) * 3
+        store = SessionStore(max_bytes=budget)
+        for session_id, game in games.items():
+            store.put(session_id, game)
+        expected = {session_id: snapshot(game) for session_id, game in games.items()}
+
+        self.assertEqual(len(store), 10)
+        self.assertLessEqual(store.memory_bytes, budget)
+        self.assertEqual(store.spills, 7)
+
+        # g0 was the oldest, so it was spilled and is rebuilt on access
+        resumed = store.get("g0")
+        self.assertIsNot(resumed, games["g0"])
+        self.assertEqual(snapshot(resumed), expected["g0"])
+        self.assertGreater(resumed.get_elapsed_time(), 0)
+        for session_id in games:
+            self.assertEqual(snapshot(store.get(session_id)), expected[session_id])
+
+        store.discard("g0")
+        self.assertNotIn("g0", store)
+        self.assertIsNone(store.get("g0"))
+        store.close()
+
+    def test_checkout_pins_game(self):
+        """Test a checked out game isn't spilled while in use."""
+        store = SessionStore(max_bytes=1)
+        store.put("a", self.played_game(1))
+        with store.checkout("a") as game:
+            store.put("b", self.played_game(2))
+            self.assertIs(store.get("a"), game)
+            game.use_hint()
+        # released: spilled with the change included
+        self.assertEqual(store.get("a").hints_used, 2)
+        store.close()
+
+    def test_unpackable_game_stays_in_memory(self):
+        """Test a game pack_game rejects is kept hot instead of breaking eviction."""
+        store = SessionStore(max_bytes=1)
+        bad = GameState(Difficulty.BEGINNER, -1)  # seed doesn't fit the header
+        store.put("bad", bad)
+        games = [self.played_game(seed) for seed in range(3)]
+        for seed, game in enumerate(games):
+            store.put(str(seed), game)
+        self.assertIs(store.get("bad"), bad)
+        self.assertEqual(store.spills, 2)
+        self.assertEqual(snapshot(store.get("0")), snapshot(games[0]))
+        store.close()
+
+    def test_any_pack_error_stays_in_memory(self):
+        """Test eviction also gets past games that fail to pack with other errors."""
+        store = SessionStore(max_bytes=1)
+        bad = GameState({"rows": 5, "cols": 5, "mines": 3, "name": 5}, 1)  # name can't be encoded
+        store.put("bad", bad)
+        for seed in range(3):
+            with contextlib.redirect_stderr(io.StringIO()):
+                store.put(str(seed), self.played_game(seed))
+        self.assertIs(store.get("bad"), bad)
+        self.assertEqual(store.spills, 2)
+        store.close()
+
+    def test_heavy_games_left_to_owner(self):
+        """Test big Cell boards are only spilled through heavy_victims() and spill()."""
+        store = SessionStore(max_bytes=1, heavy_cells=200)
+        heavy = self.played_game(1)  # 256 cells
+        light = GameState(Difficulty.BEGINNER, 2)
+        store.put("heavy", heavy)
+        store.put("light", light)
+        store.put("newest", GameState(Difficulty.BEGINNER, 3))
+        self.assertIs(store.peek("heavy"), heavy)
+        self.assertIsNone(store.peek("light"))
+        self.assertEqual(store.spills, 1)
+
+        self.assertEqual(store.heavy_victims(), ["heavy"])
+        self.assertTrue(store.spill("heavy", pack_game(heavy)))
+        self.assertIsNone(store.peek("heavy"))
+        self.assertEqual(store.heavy_victims(), [])
+        self.assertEqual(snapshot(store.get("heavy")), snapshot(heavy))
+
+        # a game checked out again meanwhile isn't spilled
+        with store.checkout("heavy") as game:
+            self.assertFalse(store.spill("heavy", pack_game(game)))
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import unittest
+
+from src.server import GameServer
+from src.spectate import SpectatorHub, decode_snapshot
+
+
+class FakeTransport:
+    def __init__(self):
+        self.buffered = 0
+
+    def is_closing(self):
+        return False
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeWriter:
+    """Collects lines; drain() waits until the test lets the buffer empty."""
+
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.lines = []
+        self.drained = asyncio.Event()
+
+    def write(self, data):
+        self.lines.append(json.loads(data))
+
+    async def drain(self):
+        await self.drained.wait()
+        self.transport.buffered = 0
+
+
+class TestSpectatorHub(unittest.TestCase):
+    """Tests for live spectator fan-out."""
+
+    def test_viewers_follow_game(self):
+        """Test viewers rebuild the player's grid from the snapshot and updates."""
+        async def main():
+            server = GameServer(port=0)
+            await server.start()
+            player_reader, player = await asyncio.open_connection(server.host, server.port)
+
+            async def send(writer, reader, request):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                return json.loads(await reader.readline())
+
+            try:
+                created = await send(player, player_reader, {"op": "new", "difficulty": "Intermediate", "seed": 4})
+                session = created["session"]
+                await send(player, player_reader, {"op": "click", "session": session, "row": 8, "col": 8})
+
+                viewers = []
+                for _ in range(20):
+                    reader, writer = await asyncio.open_connection(server.host, server.port)
+                    watched = await send(writer, reader, {"op": "watch", "session": session})
+                    viewers.append((reader, writer, [list(row) for row in decode_snapshot(watched["snapshot"])]))
+                self.assertEqual(server.spectators.viewers(session), 20)
+
+                for row, col in ((0, 0), (15, 15), (0, 15)):
+                    await send(player, player_reader, {"op": "flag", "session": session, "row": row, "col": col})
+                state = await send(player, player_reader, {"op": "state", "session": session})
+
+                for reader, writer, grid in viewers:
+                    for expected_seq in (2, 3, 4):
+                        update = json.loads(await reader.readline())
+                        self.assertEqual((update["event"], update["seq"]), ("update", expected_seq))
+                        for r, c, ch in update["changes"]:
+                            grid[r][c] = ch
+                    self.assertEqual(["".join(row) for row in grid], state["grid"])
+
+                await send(player, player_reader, {"op": "close", "session": session})
+                for reader, writer, _ in viewers:
+                    self.assertEqual(json.loads(await reader.readline())["event"], "closed")
+                    writer.close()
+            finally:
+                player.close()
+                await server.close()
+
+        asyncio.run(main())
+
+    def test_slow_viewer_is_coalesced(self):
+        """Test a backed-up viewer gets one merged update once it drains."""
+        async def main():
+            hub = SpectatorHub(high_water=100)
+            fast, slow = FakeWriter(), FakeWriter()
+            hub.subscribe("s", fast)
+            hub.subscribe("s", slow)
+            slow.transport.buffered = 1000
+
+            hub.publish("s", {"status": "PLAYING", "changes": [[0, 0, "F"], [1, 1, "2"]]})
+            hub.publish("s", {"status": "PLAYING", "changes": [[0, 0, "."]]})
+            self.assertEqual([line["seq"] for line in fast.lines], [1, 2])
+            self.assertEqual(slow.lines, [])
+
+            slow.drained.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertEqual(len(slow.lines), 1)
+            self.assertEqual(slow.lines[0]["seq"], 2)
+            self.assertEqual(sorted(slow.lines[0]["changes"]), [[0, 0, "."], [1, 1, "2"]])
+
+            # caught up again: back to one line per update
+            hub.publish("s", {"status": "WON", "changes": [[2, 2, "1"]]})
+            self.assertEqual(slow.lines[-1]["seq"], 3)
+            self.assertEqual(hub.coalesced, 2)
+
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from src.lazy_db import DeferredDatabase
+from src.startup import StartupTimer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartupTimer(unittest.TestCase):
+    """Tests for startup phase timing."""
+
+    def test_phases_in_start_order(self):
+        """Test phases are reported in start order with the thread that ran them."""
+        timer = StartupTimer(origin=time.perf_counter())
+        with timer.phase("first"):
+            pass
+        thread = threading.Thread(target=lambda: timer.mark("background"), name="worker")
+        thread.start()
+        thread.join()
+        lines = timer.report().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("first", lines[1])
+        self.assertIn("MainThread", lines[1])
+        self.assertIn("background", lines[2])
+        self.assertIn("worker", lines[2])
+
+
+class TestDeferredDatabase(unittest.TestCase):
+    """Tests for loading the database layer off the Tk thread."""
+
+    def test_not_imported_until_used(self):
+        """Test src.db and sqlalchemy load on first use, not on import or construction."""
+        script = (
+            "import sys\n"
+            "from src.lazy_db import DeferredDatabase\n"
+            "from src.db_writer import StatWriter\n"
+            "import importlib\n"
+            "database = DeferredDatabase(loader=lambda: importlib.import_module('src.db'))\n"
+            "StatWriter(database)\n"
+            "print('sqlalchemy' in sys.modules, 'src.db' in sys.modules)\n"
+            "database.module()\n"
+            "print('sqlalchemy' in sys.modules, 'src.db' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.split(), ["False", "False", "True", "True"])
+
+    def test_concurrent_callers_load_once(self):
+        """Test module() from many threads at once runs the loader a single time."""
+        calls = []
+        gate = threading.Event()
+
+        def loader():
+            calls.append(1)
+            gate.wait(5)
+            return "db"
+
+        database = DeferredDatabase(loader=loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(database.module())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        gate.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["db"] * 8)
+
+    def test_wait_recorded_on_main_thread_only(self):
+        """Test only the main thread's wait shows up as a startup phase."""
+        gate = threading.Event()
+        timer = StartupTimer()
+        database = DeferredDatabase(timer, loader=lambda: gate.wait(5) and "db")
+        worker = threading.Thread(target=database.module, name="db-writer")
+        worker.start()
+        time.sleep(0.05)
+        threading.Timer(0.05, gate.set).start()
+        self.assertEqual(database.module(), "db")
+        worker.join(5)
+        waits = [thread for name, _, _, thread in timer.phases if name == "waiting for db"]
+        self.assertEqual(waits, ["MainThread"])
+
+    def test_load_error_is_raised_to_callers(self):
+        """Test a failed load surfaces in module()."""
+        def loader():
+            raise RuntimeError("no database")
+
+        with self.assertRaises(RuntimeError):
+            DeferredDatabase(loader=loader).module()
+
+
+if __name__ == "__main__":
+    unittest.main()
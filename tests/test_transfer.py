@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from sqlalchemy import inspect, select, text
+
+from src import db, transfer
+
+
+class TestTransfer(unittest.TestCase):
+    """Tests for streaming export/import."""
+
+    def setUp(self):
+        """Set up a source database with users, stats and history."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = self._engine("source.db")
+        db.Base.metadata.create_all(self.source)
+        with self.source.begin() as conn:
+            conn.execute(db.User.__table__.insert(), [
+                {"id": i, "name": f"P{i}", "normalized_name": f"p{i}", "pin": "1234"} for i in range(1, 6)
+            ])
+            conn.execute(db.UserDifficultyStat.__table__.insert(), [
+                {"user_id": i, "difficulty": "Beginner", "best_time": None if i == 5 else 10.0 + i,
+                 "best_score": None if i == 5 else 100 * i, "games_played": 3, "games_won": 1, "total_time": 42.5}
+                for i in range(1, 6)
+            ])
+            conn.execute(db.GameRecord.__table__.insert(), [
+                {"user_id": 1 + i % 5, "difficulty": "Beginner", "finished_at": datetime(2024, 1, 1, 12, i % 60),
+                 "time": float(i), "score": i, "hints_used": i % 3, "won": i % 2 == 0, "seed": 2 ** 31 + i}
+                for i in range(250)
+            ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _engine(self, name):
+        return db.create_configured_engine(os.path.join(self.tmp.name, name))
+
+    def _dump(self, engine):
+        with engine.connect() as conn:
+            return {table.name: conn.execute(select(table).order_by(*table.primary_key.columns)).all()
+                    for table in transfer.TABLES}
+
+    def _round_trip(self, fmt, path):
+        exported = transfer.export_database(self.source, path, fmt, chunk_size=32)
+        target = self._engine(f"target-{fmt}.db")
+        imported = transfer.import_database(target, path, fmt, batch_size=32)
+        self.assertEqual(exported, imported)
+        self.assertEqual(imported["game_history"], 250)
+        self.assertEqual(self._dump(self.source), self._dump(target))
+
+    def test_jsonl_round_trip(self):
+        """Test export and import through JSONL keep every row."""
+        self._round_trip("jsonl", os.path.join(self.tmp.name, "backup.jsonl"))
+
+    def test_csv_round_trip(self):
+        """Test export and import through CSV keep every row."""
+        self._round_trip("csv", os.path.join(self.tmp.name, "backup"))
+
+    def test_import_into_old_schema(self):
+        """Test importing into a database from before the stats columns runs the migration."""
+        path = os.path.join(self.tmp.name, "backup.jsonl")
+        transfer.export_database(self.source, path)
+        target = self._engine("old.db")
+        with target.begin() as conn:
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+                              "normalized_name VARCHAR NOT NULL UNIQUE, pin VARCHAR NOT NULL)"))
+            conn.execute(text("CREATE TABLE user_difficulty_stats (id INTEGER PRIMARY KEY, "
+                              "user_id INTEGER NOT NULL REFERENCES users (id), difficulty VARCHAR NOT NULL, "
+                              "best_time FLOAT, best_score INTEGER, "
+                              "CONSTRAINT uix_user_diff UNIQUE (user_id, difficulty))"))
+
+        transfer.import_database(target, path)
+        self.assertEqual(self._dump(self.source), self._dump(target))
+        indexes = {i["name"] for i in inspect(target).get_indexes("user_difficulty_stats")}
+        self.assertTrue({"ix_uds_leader_time", "ix_uds_leader_score"} <= indexes)
+
+
+if __name__ == '__main__':
+    unittest.main()